@@ -0,0 +1,130 @@
+# ---------------------------------------------------------------------------
+# artifacts.py
+# ---------------------------------------------------------------------------
+"""
+선형 모델용 경량 바이너리 아티팩트.
+
+Ridge + StandardScaler 는 결국 계수 벡터와 mean/scale 배열뿐이므로 pickle 대신
+    <stem>.json : 메타데이터 + 배열 목록(dtype, shape, offset)
+    <stem>.bin  : 배열 원본 바이트 (64B 정렬, 연속 배치)
+로 저장한다. 로드는 JSON 헤더만 읽고, 배열은 처음 접근할 때 .bin 을
+읽기 전용 memory-map 으로 연다. 수천 개 종목 모델을 열어도 시작 비용이 거의 없다.
+
+LinearArtifact 는 joblib 로 저장한 dict 와 같은 키("model", "scaler",
+"lookback", "horizon", "feats")를 제공하므로 predict 쪽 코드는 그대로 쓴다.
+비선형 모델은 model_learn.save_model 이 joblib 로 저장한다.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+FORMAT = "linear-v1"
+ALIGN = 64
+
+
+def is_linear(model) -> bool:
+    return hasattr(model, "coef_") and hasattr(model, "intercept_")
+
+
+def save_linear(stem: Path, model, scaler, meta: dict) -> Path:
+    """stem.json / stem.bin 저장 → 헤더(.json) 경로 반환"""
+    arrays = {
+        "coef": np.ravel(model.coef_),
+        "intercept": np.atleast_1d(np.asarray(model.intercept_, dtype=np.float64)),
+        "scaler_mean": np.asarray(scaler.mean_, dtype=np.float64),
+        "scaler_scale": np.asarray(scaler.scale_, dtype=np.float64),
+    }
+
+    table, offset = {}, 0
+    with open(stem.with_suffix(".bin"), "wb") as f:
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr, dtype="<f8")
+            pad = -offset % ALIGN
+            f.write(b"\0" * pad)
+            offset += pad
+            table[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+            f.write(arr.tobytes())
+            offset += arr.nbytes
+
+    header = {
+        "format": FORMAT,
+        "model": type(model).__name__,
+        "alpha": getattr(model, "alpha", None),
+        **meta,
+        "arrays": table,
+    }
+    path = stem.with_suffix(".json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False)
+    return path
+
+
+class _LinearModel:
+    """sklearn 선형 모델의 predict 인터페이스 (coef_ / intercept_ 는 memmap)"""
+
+    def __init__(self, art: "LinearArtifact"):
+        self._art = art
+
+    @property
+    def coef_(self):
+        return self._art.array("coef")
+
+    @property
+    def intercept_(self):
+        return float(self._art.array("intercept")[0])
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+
+class _Scaler:
+    """StandardScaler.transform 과 같은 변환 (mean_ / scale_ 는 memmap)"""
+
+    def __init__(self, art: "LinearArtifact"):
+        self._art = art
+
+    @property
+    def mean_(self):
+        return self._art.array("scaler_mean")
+
+    @property
+    def scale_(self):
+        return self._art.array("scaler_scale")
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class LinearArtifact:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, encoding="utf-8") as f:
+            self.header = json.load(f)
+        if self.header.get("format") != FORMAT:
+            raise ValueError(f"지원하지 않는 아티팩트 형식: {self.header.get('format')}")
+        self._mm = None
+        self._views = {"model": _LinearModel(self), "scaler": _Scaler(self)}
+
+    def array(self, name: str) -> np.ndarray:
+        if self._mm is None:                        # 첫 접근 시에만 파일을 연다
+            self._mm = np.memmap(self.path.with_suffix(".bin"), dtype=np.uint8, mode="r")
+        spec = self.header["arrays"][name]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        return np.frombuffer(self._mm, dtype=dtype, count=count, offset=spec["offset"]).reshape(spec["shape"])
+
+    def __getitem__(self, key):
+        if key in self._views:
+            return self._views[key]
+        return self.header[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def load_artifact(path: Path) -> LinearArtifact:
+    return LinearArtifact(path)
@@ -0,0 +1,134 @@
+# ---------------------------------------------------------------------------
+# batch_train.py
+# ---------------------------------------------------------------------------
+"""
+여러 종목 × (lookback, horizon) 그리드를 한 프로세스 풀에서 학습.
+
+1) load_windows 로 전체 종목 구간을 한 번에 로드 (django.setup / DB 왕복 1회)
+2) 종목 단위로 ProcessPoolExecutor 에 분배 → 정규화는 종목당 1회
+3) 설정별 MAE/RMSE 를 saved_models/batch_<stamp>.csv 한 장으로 저장
+
+    python batch_train.py --universe universe.txt --lookbacks 60 252 --horizons 5 22
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+
+import pandas as pd
+from django.db import connections
+from threadpoolctl import threadpool_limits
+
+from model_learn import MODELS_DIR, fit_and_evaluate, save_model
+from model_registry import get_registry
+from normalization import load_windows, normalize  # (django.setup, BASE_DIR)
+from core.universe import read_universe
+
+
+COLUMNS = ["symbol", "lookback", "horizon", "samples", "mae", "rmse", "path", "error"]
+
+
+# ---------------------------------------------------------------------------
+# worker
+# ---------------------------------------------------------------------------
+def _init_worker():
+    # 프로세스 수만큼 이미 병렬이므로 BLAS 스레드는 1개로 제한 (oversubscription 방지)
+    threadpool_limits(1)
+
+
+def train_symbol(symbol: str, raw_df: pd.DataFrame, grid, models_dir: Path = MODELS_DIR):
+    """한 종목의 (lookback, horizon) 그리드 전체를 학습하고 결과 행 리스트를 반환"""
+    norm_df, scaler = normalize(raw_df)
+    norm_df.set_index("date", inplace=True)
+
+    rows = []
+    for lookback, horizon in grid:
+        row = {"symbol": symbol, "lookback": lookback, "horizon": horizon}
+        if len(raw_df) < lookback + horizon:
+            rows.append({**row, "error": "영업일 부족"})
+            continue
+        try:
+            model, metrics = fit_and_evaluate(norm_df, lookback, horizon)
+            path = save_model(symbol, model, scaler, lookback, horizon, models_dir, register=False)
+        except Exception as e:              # 한 설정 실패가 같은 종목의 다른 설정 결과를 버리지 않게
+            rows.append({**row, "error": repr(e)})
+            continue
+        rows.append({**row, **metrics, "path": str(path)})
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# driver
+# ---------------------------------------------------------------------------
+def run_batch(symbols, lookbacks, horizons, workers: int | None = None,
+              models_dir: Path = MODELS_DIR, price_cache: bool = False) -> pd.DataFrame:
+    grid = list(product(lookbacks, horizons))
+    if price_cache:
+        # 로컬 Arrow 캐시를 증분 갱신한 뒤 memory-map 으로 읽음 (ORM dict 변환 없음)
+        import price_cache as pc
+        frames = pc.load_windows(symbols)
+    else:
+        frames = load_windows(symbols)
+    missing = [s for s in symbols if s not in frames]
+
+    # fork 된 자식이 부모의 DB 소켓을 물려받지 않도록 정리
+    connections.close_all()
+
+    rows = [{"symbol": s, "error": "DB 데이터 없음"} for s in missing]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(train_symbol, sym, df, grid, models_dir): sym
+            for sym, df in frames.items()
+        }
+        for fut in as_completed(futures):
+            sym = futures[fut]
+            try:
+                rows.extend(fut.result())
+            except Exception as e:          # 한 종목 실패가 배치 전체를 멈추지 않게
+                rows.append({"symbol": sym, "error": repr(e)})
+            print(f"[{len(rows)}] {sym} done")
+
+    result = (
+        pd.DataFrame(rows, columns=COLUMNS)
+        .astype({"lookback": "Int64", "horizon": "Int64", "samples": "Int64"})
+        .sort_values(["symbol", "lookback", "horizon"], ignore_index=True)
+    )
+
+    # 레지스트리 등록은 부모 프로세스에서 한 번에 (manifest 쓰기 1회)
+    registry = get_registry(models_dir)
+    registry.register([
+        registry.entry_for(r["path"], {k: r[k] for k in ("samples", "mae", "rmse")})
+        for r in rows if r.get("path")
+    ])
+
+    models_dir.mkdir(exist_ok=True)
+    out = models_dir / f"batch_{datetime.now():%Y%m%d_%H%M%S}.csv"
+    result.to_csv(out, index=False)
+    print(f"\nsaved: {out}\n")
+    return result
+
+
+# ---------------------------------------------------------------------------
+# script entry point
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="*", default=[])
+    p.add_argument("--universe", help="symbol list file (one per line)")
+    p.add_argument("--lookbacks", type=int, nargs="+", default=[252])
+    p.add_argument("--horizons", type=int, nargs="+", default=[22])
+    p.add_argument("--workers", type=int, default=None, help="default: os.cpu_count()")
+    p.add_argument("--price-cache", action="store_true", help="load prices via the local Arrow cache")
+    args = p.parse_args()
+
+    symbols = args.symbols + (read_universe(args.universe) if args.universe else [])
+    if not symbols:
+        p.error("--symbols 또는 --universe 가 필요합니다.")
+
+    result = run_batch(list(dict.fromkeys(symbols)), args.lookbacks, args.horizons, args.workers,
+                       price_cache=args.price_cache)
+    pd.set_option("display.max_rows", None)
+    print(result)
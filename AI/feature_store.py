@@ -0,0 +1,176 @@
+# ---------------------------------------------------------------------------
+# feature_store.py
+# ---------------------------------------------------------------------------
+"""
+normalized_DailyPrice 정규화 feature store.
+
+학습/예측이 매번 DailyPrice 원본을 읽어 정규화를 다시 하는 대신,
+종목별 정규화 feature 를 normalized_DailyPrice 에 미리 써 두고
+(symbol, version, date) 인덱스 range scan 한 번으로 읽는다.
+
+- version  : 정규화 설정(config) 해시. 설정이 바뀌면 새 version 으로 따로 쌓인다.
+- 학습 구간: load_window 와 같은 구간(window_range)으로 scaler 를 맞추고,
+             그 이전/구간 내 행은 이 통계로 변환 → normalize(load_window) 결과와 같다.
+- 이후 행  : scaler="fixed"     → 학습 구간 통계로 고정 변환
+             scaler="expanding" → 행마다 그 날까지의 누적 통계로 변환 (look-ahead 없음)
+- 진행 상태(통계, 마지막 날짜)는 FeatureState 에 저장되어
+  refresh() 는 DailyPrice 에서 last_date 이후 새 봉만 읽어 이어 붙인다.
+
+원본 과거 행이 수정된 경우에는 --rebuild 로 해당 version 을 다시 만든다.
+
+    python feature_store.py --symbols QQQ SPY --scaler fixed
+"""
+import argparse
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+
+from normalization import FEATS, OnlineScaler, feature_rows, load_history, window_range
+from core.models import DailyPrice, FeatureState, normalized_DailyPrice
+
+
+# ---------------------------------------------------------------------------
+# 설정 / version
+# ---------------------------------------------------------------------------
+def make_config(scaler: str = "fixed", years: int = 2, horizon: int = 40) -> dict:
+    if scaler not in ("fixed", "expanding"):
+        raise ValueError(f"알 수 없는 scaler 모드: {scaler}")
+    return {"scaler": scaler, "years": years, "horizon": horizon, "feats": FEATS, "volume": "log1p"}
+
+
+def config_version(config: dict) -> str:
+    blob = json.dumps(config, sort_keys=True).encode()
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+
+# ---------------------------------------------------------------------------
+# 쓰기
+# ---------------------------------------------------------------------------
+def _write_rows(symbol: str, version: str, dates, values: np.ndarray):
+    normalized_DailyPrice.objects.bulk_create(
+        [
+            normalized_DailyPrice(symbol=symbol, version=version, date=d,
+                                  open=o, high=h, low=l, close=c, volume=v)
+            for d, (o, h, l, c, v) in zip(dates, values.tolist())
+        ],
+        batch_size=2000,
+    )
+
+
+def build(symbol: str, config: dict) -> int:
+    """해당 version 의 feature 를 전체 기간에 대해 새로 만든다 → 저장한 행 수"""
+    version = config_version(config)
+    raw = load_history(symbol)
+    dates = pd.DatetimeIndex(pd.to_datetime(raw.index))
+    start, end = window_range(dates[0], config["years"], config["horizon"])
+    seed = (dates >= start) & (dates <= end)
+    if not seed.any():
+        raise ValueError(f"{symbol}: 학습 구간({start.date()} ~ {end.date()})에 데이터가 없습니다.")
+
+    rows = feature_rows(raw)
+    split = int(np.flatnonzero(seed)[-1]) + 1           # 학습 구간 마지막 행 다음
+    scaler = OnlineScaler().update(rows[seed])
+    seed_state = {**scaler.state_dict(), "mode": "fixed"}
+    if config["scaler"] == "fixed":
+        scaler.freeze()
+
+    values = np.vstack([scaler.transform(rows[:split]), scaler.update_transform(rows[split:])])
+
+    with transaction.atomic():
+        normalized_DailyPrice.objects.filter(symbol=symbol, version=version).delete()
+        _write_rows(symbol, version, raw.index, values)
+        FeatureState.objects.update_or_create(
+            symbol=symbol, version=version,
+            defaults={
+                "config": config,
+                "seed": seed_state,
+                "normalizer": scaler.state_dict(),
+                "train_start": dates[np.flatnonzero(seed)[0]].date(),
+                "train_end": dates[split - 1].date(),
+                "last_date": raw.index[-1],
+            },
+        )
+    return len(values)
+
+
+def refresh(symbol: str, config: dict, rebuild: bool = False) -> int:
+    """새 봉만 정규화해 이어 붙인다 (상태가 없거나 rebuild 면 전체 재생성) → 추가한 행 수"""
+    version = config_version(config)
+    state = FeatureState.objects.filter(symbol=symbol, version=version).first()
+    if state is None or rebuild:
+        return build(symbol, config)
+
+    qs = (
+        DailyPrice.objects.filter(symbol=symbol, date__gt=state.last_date)
+        .values("date", *FEATS)
+        .order_by("date")
+    )
+    df = pd.DataFrame.from_records(qs)
+    if df.empty:
+        return 0
+    df = df.set_index("date").dropna()
+
+    scaler = OnlineScaler.from_state(state.normalizer)
+    values = scaler.update_transform(feature_rows(df))
+    with transaction.atomic():
+        _write_rows(symbol, version, df.index, values)
+        state.normalizer = scaler.state_dict()
+        state.last_date = df.index[-1]
+        state.save(update_fields=["normalizer", "last_date", "updated_at"])
+    return len(values)
+
+
+# ---------------------------------------------------------------------------
+# 읽기
+# ---------------------------------------------------------------------------
+def load_features(symbol: str, version: str, start=None, end=None, tail: int | None = None) -> pd.DataFrame:
+    """(symbol, version) 정규화 feature → date 인덱스 DataFrame. tail 이면 최근 tail 행만"""
+    qs = normalized_DailyPrice.objects.filter(symbol=symbol, version=version)
+    if start is not None:
+        qs = qs.filter(date__gte=start)
+    if end is not None:
+        qs = qs.filter(date__lte=end)
+    qs = qs.values("date", *FEATS)
+
+    if tail is not None:
+        df = pd.DataFrame.from_records(qs.order_by("-date")[:tail]).iloc[::-1]
+    else:
+        df = pd.DataFrame.from_records(qs.order_by("date"))
+    if df.empty:
+        raise ValueError(f"{symbol} feature(version={version})가 없습니다. feature_store.py 로 먼저 생성하세요.")
+    return df.set_index("date")
+
+
+def training_frame(symbol: str, config: dict):
+    """load_window + normalize 대신 쓰는 학습 입력 → (norm_df, fitted StandardScaler, version)"""
+    version = config_version(config)
+    refresh(symbol, config)
+    state = FeatureState.objects.get(symbol=symbol, version=version)
+    norm_df = load_features(symbol, version, state.train_start, state.train_end)
+    scaler = OnlineScaler.from_state(state.seed).to_scaler()
+    return norm_df, scaler, version
+
+
+# ---------------------------------------------------------------------------
+# script entry point
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="+", default=["QQQ"])
+    p.add_argument("--scaler", choices=["fixed", "expanding"], default="fixed")
+    p.add_argument("--years", type=int, default=2, help="initial training span")
+    p.add_argument("--horizon", type=int, default=40, help="load_window horizon padding")
+    p.add_argument("--rebuild", action="store_true", help="recompute all rows for this version")
+    args = p.parse_args()
+
+    config = make_config(args.scaler, args.years, args.horizon)
+    print(f"[INFO] feature version {config_version(config)} {config}")
+    for sym in args.symbols:
+        try:
+            n = refresh(sym, config, rebuild=args.rebuild)
+            print(f"  {sym:<10} +{n} rows")
+        except ValueError as e:
+            print(f"  {sym:<10} skip: {e}")
@@ -5,6 +5,7 @@ import argparse
 from pathlib import Path
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.linear_model import Ridge
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 from joblib import dump
@@ -18,89 +19,149 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
-from normalization import load_window, normalize  # helper functions
+from normalization import FEATS, OnlineScaler, load_window, normalize  # helper functions
+from model_registry import get_registry
+from artifacts import is_linear, save_linear
 
 # ---------------------------------------------------------------------------
 # dataset builder
 # ---------------------------------------------------------------------------
 
+def _feature_matrix(df: pd.DataFrame) -> np.ndarray:
+    """OHLCV 를 C-contiguous float64 (N, 5) 행렬로 한 번만 꺼낸다."""
+    return np.ascontiguousarray(df[FEATS].to_numpy(dtype=np.float64))
+
+
+def window_arrays(values: np.ndarray, lookback: int, horizon: int):
+    """(N, 5) C-contiguous 행렬 → (X, y)
+
+    X 는 행렬 위의 stride view 라 복사 없이 만들어진다 (read-only).
+    i 번째 샘플 = rows[i - lookback : i].flatten() 이므로, 평탄화된 행렬에서
+    길이 5·lookback 창을 5칸씩 미끄러뜨린 것과 정확히 같다.
+    """
+    n = len(values) - lookback - horizon
+    if n <= 0:
+        return np.empty((0, len(FEATS) * lookback)), np.empty(0)
+
+    flat = values.reshape(-1)
+    width = len(FEATS) * lookback
+    X = sliding_window_view(flat, width)[:: len(FEATS)][:n]
+
+    # 타겟: close[i + horizon] / close[i] - 1  (i = lookback … len-horizon-1)
+    close = values[:, FEATS.index("close")]
+    base = close[lookback : lookback + n]
+    y = (close[lookback + horizon : lookback + horizon + n] - base) / base
+    return X, y
+
+
 def build_dataset(df: pd.DataFrame, lookback: int, horizon: int):
     """Return X, y where:
         • X = flattened features of last `lookback` days (5 × lookback)
         • y = percentage change over next `horizon` days
     """
-    feats = ["open", "high", "low", "close", "volume"]
-    X_lst, y_lst, date_lst = [], [], []
-
-    # 전체 데이터에서 (lookback + horizon) 길이를 고려
-    for i in range(lookback, len(df) - horizon):
-        # 1) 입력 데이터 (lookback 길이)
-        window = df.iloc[i - lookback : i][feats].values.flatten()
-        
-        # 2) 타겟 데이터 (horizon 길이)
-        pct_change = (
-            df.iloc[i + horizon]["close"] - df.iloc[i]["close"]
-        ) / df.iloc[i]["close"]
-        
-        # 3) 리스트에 추가
-        X_lst.append(window)
-        y_lst.append(pct_change)
-        date_lst.append(df.index[i])  # 날짜 인덱스 유지
-
-    return np.array(X_lst), np.array(y_lst), date_lst
+    X, y = window_arrays(_feature_matrix(df), lookback, horizon)
+    dates = list(df.index[lookback : lookback + len(X)])
+    return X, y, dates
+
+
+def iter_dataset(df: pd.DataFrame, lookback: int, horizon: int,
+                 chunk_size: int = 4096, dtype=np.float32):
+    """build_dataset 와 같은 순서로 (X, y, dates) 를 chunk 단위로 생성.
+
+    stride view 에서 chunk_size 행씩만 dtype(기본 float32)으로 복사하므로
+    10년 × lookback 252 같은 큰 데이터셋도 전체를 한 번에 들고 있지 않는다.
+    """
+    X, y, dates = build_dataset(df, lookback, horizon)
+    for start in range(0, len(X), chunk_size):
+        stop = start + chunk_size
+        yield (
+            np.array(X[start:stop], dtype=dtype),
+            np.array(y[start:stop], dtype=dtype),
+            dates[start:stop],
+        )
 
 
 # ---------------------------------------------------------------------------
 # main function
 # ---------------------------------------------------------------------------
 
-def main(symbol: str, lookback: int, horizon: int):
-    # 1. 데이터 로딩 및 정규화
-    raw_df = load_window(symbol)
-    if len(raw_df) < lookback + horizon:
-        print("❗ DB 안에 영업일이 부족합니다. fetch_yfinance 로 더 끌어오거나 lookback을 줄여 주세요.")
-        return
-    
-    # 정규화 (scaler 포함)
-    norm_df, scaler = normalize(raw_df)
-    norm_df.set_index("date", inplace=True)
-    
-    # 2. 데이터셋 생성
+MODELS_DIR = Path(__file__).parent / "saved_models"
+
+
+def fit_and_evaluate(norm_df: pd.DataFrame, lookback: int, horizon: int, alpha: float = 1.0):
+    """정규화된 df → (학습된 Ridge, {"samples", "mae", "rmse"})  80/20 시계열 분할"""
     X, y, dates = build_dataset(norm_df, lookback, horizon)
     split = int(len(X) * 0.8)
     X_train, X_test = X[:split], X[split:]
     y_train, y_test = y[:split], y[split:]
-    dates_test      = dates[split:]
 
-    # 3. 모델 학습
-    model = Ridge(alpha=1.0)
+    model = Ridge(alpha=alpha)
     model.fit(X_train, y_train)
 
-    # 4. 모델 성능 평가
     preds = model.predict(X_test)
     mae  = mean_absolute_error(y_test, preds)
     rmse = (mean_squared_error(y_test, preds, multioutput='raw_values').mean()) ** 0.5
-    print(f"=== {symbol} | lookback={lookback} | horizon={horizon}d | samples={len(X)} ===")
-    print(f"MAE  : {mae:.5f}\nRMSE : {rmse:.5f}\n")
+    return model, {"samples": len(X), "mae": mae, "rmse": rmse}
 
-    # 5. 모델 저장
-    models_dir = Path(__file__).parent / "saved_models"
+
+def save_model(symbol: str, model, scaler, lookback: int, horizon: int,
+               models_dir: Path = MODELS_DIR, metrics: dict | None = None,
+               register: bool = True, feature_version: str | None = None) -> Path:
+    """모델 저장 + registry.json 등록 (register=False 면 호출 측이 모아서 등록)
+
+    선형 모델은 .json/.bin 바이너리 아티팩트로, 그 외는 joblib(.pkl)로 저장.
+    feature_version 은 feature store 에서 학습한 경우 그 version (예측도 같은 version 을 읽음).
+    """
     models_dir.mkdir(exist_ok=True)
 
     stamp   = datetime.now().strftime("%Y%m%d_%H%M%S")
-    fname   = f"{symbol}_ridge_lb{lookback}_h{horizon}_{stamp}.pkl"
-    outpath = models_dir / fname
-
-    dump(
-        {
-            "model"   : model,
-            "scaler"  : scaler,
-            "lookback": lookback,
-            "horizon" : horizon,
-            "feats"   : ["open", "high", "low", "close", "volume"],
-        },
-        outpath,
-    )
+    kind    = type(model).__name__.lower()     # Ridge → "ridge"
+    stem    = models_dir / f"{symbol}_{kind}_lb{lookback}_h{horizon}_{stamp}"
+    meta    = {
+        "lookback"  : lookback,
+        "horizon"   : horizon,
+        "feats"     : FEATS,
+        "normalizer": OnlineScaler.from_scaler(scaler).state_dict(),   # Welford 상태
+    }
+    if feature_version is not None:
+        meta["feature_version"] = feature_version
+
+    if is_linear(model):
+        outpath = save_linear(stem, model, scaler, meta)
+    else:
+        outpath = stem.with_suffix(".pkl")
+        dump({"model": model, "scaler": scaler, **meta}, outpath)
+
+    if register:
+        registry = get_registry(models_dir)
+        registry.register([registry.entry_for(outpath, metrics)])
+    return outpath
+
+
+def main(symbol: str, lookback: int, horizon: int, feature_store: str | None = None):
+    # 1. 데이터 로딩 및 정규화
+    version = None
+    if feature_store:
+        # 미리 계산된 정규화 feature (range scan 1회, 새 봉만 증분 반영)
+        from feature_store import make_config, training_frame
+        norm_df, scaler, version = training_frame(symbol, make_config(feature_store))
+    else:
+        raw_df = load_window(symbol)
+        # 정규화 (scaler 포함)
+        norm_df, scaler = normalize(raw_df)
+        norm_df.set_index("date", inplace=True)
+
+    if len(norm_df) < lookback + horizon:
+        print("❗ DB 안에 영업일이 부족합니다. fetch_yfinance 로 더 끌어오거나 lookback을 줄여 주세요.")
+        return
+    
+    # 2~4. 데이터셋 생성 → 모델 학습 → 성능 평가
+    model, metrics = fit_and_evaluate(norm_df, lookback, horizon)
+    print(f"=== {symbol} | lookback={lookback} | horizon={horizon}d | samples={metrics['samples']} ===")
+    print(f"MAE  : {metrics['mae']:.5f}\nRMSE : {metrics['rmse']:.5f}\n")
+
+    # 5. 모델 저장
+    outpath = save_model(symbol, model, scaler, lookback, horizon, metrics=metrics, feature_version=version)
     print(f"\nsaved: {outpath}\n")
 
 
@@ -112,6 +173,8 @@ if __name__ == "__main__":
     p.add_argument("--symbol", default="QQQ")
     p.add_argument("--lookback", type=int, default=252, help="days of history (≈1y)")
     p.add_argument("--horizon", type=int, default=22, help="days ahead (≈1mo)")
+    p.add_argument("--feature-store", choices=["fixed", "expanding"], default=None,
+                   help="read precomputed features (normalized_DailyPrice) with this scaler mode")
     args = p.parse_args()
 
-    main(args.symbol, args.lookback, args.horizon)
+    main(args.symbol, args.lookback, args.horizon, args.feature_store)
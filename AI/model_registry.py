@@ -0,0 +1,169 @@
+# ---------------------------------------------------------------------------
+# model_registry.py
+# ---------------------------------------------------------------------------
+"""
+saved_models 모델 레지스트리 (JSON manifest).
+
+model_learn / batch_train 이 모델을 저장할 때 saved_models/registry.json 에
+{symbol, model, lookback, horizon, timestamp, metrics, path, format} 를 기록한다.
+조회 측은 manifest 를 한 번 읽어 키별 최신/최고 모델 인덱스를 만들어 두므로
+디렉터리 glob 없이 O(1) 로 찾는다. (파일명 문자열 정렬이 아니라 학습 시각 기준)
+
+manifest 가 없으면 기존 파일명을 스캔해 한 번 재구성한다 (metrics 없음).
+"""
+import fcntl
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from joblib import load
+
+from artifacts import load_artifact
+
+MODELS_DIR = Path(__file__).parent / "saved_models"
+MANIFEST = "registry.json"
+MODEL_RE = re.compile(
+    r"^(?P<symbol>.+)_(?P<model>[a-z]+)_lb(?P<lookback>\d+)_h(?P<horizon>\d+)_(?P<stamp>\d{8}_\d{6})\.(?P<ext>pkl|json)$"
+)
+FORMATS = {"pkl": "joblib", "json": "linear"}
+
+
+class ModelRegistry:
+    def __init__(self, models_dir: Path = MODELS_DIR):
+        self.models_dir = Path(models_dir)
+        self.path = self.models_dir / MANIFEST
+        self._lock = threading.RLock()
+        self._mtime = -1                            # 아직 한 번도 읽지 않음
+        self.entries: list[dict] = []
+        self._latest: dict = {}
+        self._best: dict = {}
+
+    # ── manifest I/O ─────────────────────────────────────────────
+    @contextmanager
+    def _file_lock(self):
+        """여러 프로세스(학습 컨테이너 등)가 동시에 쓰지 않도록 flock"""
+        self.models_dir.mkdir(exist_ok=True)
+        with open(self.models_dir / f".{MANIFEST}.lock", "w") as lk:
+            fcntl.flock(lk, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lk, fcntl.LOCK_UN)
+
+    def _read(self) -> list[dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)["models"]
+        except FileNotFoundError:
+            return []
+
+    def _write(self, entries: list[dict]):
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"models": entries}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)                  # 읽는 쪽은 항상 완전한 파일만 본다
+
+    def refresh(self, force: bool = False) -> "ModelRegistry":
+        """manifest 가 바뀌었을 때만 다시 읽어 인덱스 재구성"""
+        with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if force or mtime != self._mtime:
+                if mtime is None and not self.entries:
+                    self.rebuild()
+                    return self
+                self._index(self._read())
+                self._mtime = mtime
+        return self
+
+    def _index(self, entries: list[dict]):
+        latest, best = {}, {}
+        for e in entries:
+            full = (e["symbol"], e["model"], e["lookback"], e["horizon"])
+            # 부분 키(종목만 / 종목+lookback)로도 O(1) 조회가 되도록 같이 인덱싱
+            for key in (full, full[:3], full[:2]):
+                if key not in latest or e["timestamp"] > latest[key]["timestamp"]:
+                    latest[key] = e
+                rmse = (e.get("metrics") or {}).get("rmse")
+                if rmse is not None and (key not in best or rmse < best[key]["metrics"]["rmse"]):
+                    best[key] = e
+        self.entries, self._latest, self._best = entries, latest, best
+
+    # ── 등록 ─────────────────────────────────────────────────────
+    def entry_for(self, path: Path, metrics: dict | None = None) -> dict:
+        m = MODEL_RE.match(Path(path).name)
+        if not m:
+            raise ValueError(f"모델 파일명 형식이 아닙니다: {path}")
+        return {
+            "symbol": m["symbol"],
+            "model": m["model"],
+            "lookback": int(m["lookback"]),
+            "horizon": int(m["horizon"]),
+            "timestamp": m["stamp"],
+            "metrics": {k: float(v) for k, v in (metrics or {}).items()},
+            "path": Path(path).name,
+            "format": FORMATS.get(m["ext"], m["ext"]),
+        }
+
+    def register(self, entries: list[dict]):
+        with self._lock, self._file_lock():
+            current = {e["path"]: e for e in self._read()}
+            current.update({e["path"]: e for e in entries})
+            merged = sorted(current.values(), key=lambda e: (e["symbol"], e["timestamp"]))
+            self._write(merged)
+            self._index(merged)
+            self._mtime = os.stat(self.path).st_mtime_ns
+
+    def rebuild(self):
+        """manifest 없이 저장된 기존 모델 파일들로 manifest 재구성"""
+        entries = []
+        if self.models_dir.exists():
+            for entry in os.scandir(self.models_dir):
+                if MODEL_RE.match(entry.name):
+                    entries.append(self.entry_for(entry.path))
+        self.register(entries)
+
+    # ── 조회 ─────────────────────────────────────────────────────
+    @staticmethod
+    def _key(symbol, model, lookback, horizon):
+        if lookback is None:
+            return (symbol, model)
+        if horizon is None:
+            return (symbol, model, lookback)
+        return (symbol, model, lookback, horizon)
+
+    def latest(self, symbol: str, lookback: int | None = None, horizon: int | None = None,
+               model: str = "ridge") -> dict | None:
+        self.refresh()
+        return self._latest.get(self._key(symbol, model, lookback, horizon))
+
+    def best(self, symbol: str, lookback: int | None = None, horizon: int | None = None,
+             model: str = "ridge") -> dict | None:
+        """검증 RMSE 가 가장 낮은 모델 (metrics 가 없으면 None)"""
+        self.refresh()
+        return self._best.get(self._key(symbol, model, lookback, horizon))
+
+    def file(self, entry: dict) -> Path:
+        return self.models_dir / entry["path"]
+
+    def load(self, entry: dict, mmap: bool = False):
+        """linear 형식은 항상 지연 memory-map, joblib 은 mmap=True 일 때만 (비압축 한정)"""
+        if entry.get("format") == "linear":
+            return load_artifact(self.file(entry))
+        return load(self.file(entry), mmap_mode="r" if mmap else None)
+
+
+_REGISTRIES: dict[Path, ModelRegistry] = {}
+
+
+def get_registry(models_dir: Path = MODELS_DIR) -> ModelRegistry:
+    """디렉터리별 프로세스 전역 레지스트리"""
+    key = Path(models_dir).resolve()
+    if key not in _REGISTRIES:
+        _REGISTRIES[key] = ModelRegistry(key)
+    return _REGISTRIES[key]
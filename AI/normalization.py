@@ -24,6 +24,9 @@ if str(BASE_DIR) not in sys.path:
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
 django.setup()
 
+from django.db.models import F, Min, Q, Window
+from django.db.models.functions import RowNumber
+
 from core.models import DailyPrice
 
 print("---------------------------------------------------restart")
@@ -32,6 +35,17 @@ print("---------------------------------------------------restart")
 def next_month_first(ts: pd.Timestamp) -> pd.Timestamp:
     return (ts + relativedelta(months=1)).replace(day=1)
 
+# ── 학습 구간 계산 ───────────────────────────────────────────────
+def window_range(first_date, years: int = 2, horizon: int = 40):
+    """최초 데이터 날짜 → (start_date, end_date)"""
+    # 시작일 (최초 데이터의 다음 달 1일)
+    start_date = next_month_first(pd.to_datetime(first_date))
+
+    # 종료일 (lookback + horizon = 274 영업일)
+    end_date = start_date + relativedelta(years=years) - timedelta(days=1)
+    end_date += pd.tseries.offsets.BDay(horizon + 10)
+    return start_date, end_date
+
 # ── 1년 구간 원본 데이터 로드 ────────────────────────────────────
 def load_window(symbol: str, years: int = 2, lookback: int = 252, horizon: int = 40) -> pd.DataFrame:
     # 1) 가장 오래된 날짜
@@ -44,13 +58,8 @@ def load_window(symbol: str, years: int = 2, lookback: int = 252, horizon: int =
     if not first_row:
         raise ValueError(f"{symbol} 데이터가 DB에 없습니다.")
 
-    # 2) 시작일 (최초 데이터의 다음 달 1일)
-    first_date = pd.to_datetime(first_row["date"])
-    start_date = next_month_first(first_date)
-
-    # 3) 종료일 (lookback + horizon = 274 영업일)
-    end_date = start_date + relativedelta(years=years) - timedelta(days=1) 
-    end_date += pd.tseries.offsets.BDay(horizon + 10)
+    # 2~3) 시작일 / 종료일
+    start_date, end_date = window_range(first_row["date"], years, horizon)
     print(f"날짜 : {start_date} ~ {end_date}")
     # 4) 데이터 로드
     qs = (
@@ -71,6 +80,68 @@ def load_window(symbol: str, years: int = 2, lookback: int = 252, horizon: int =
 
     return df
 
+# ── 전체 기간 원본 데이터 로드 ────────────────────────────────────
+def load_history(symbol: str) -> pd.DataFrame:
+    """load_window 와 같은 형태로 해당 종목의 전체 기간을 한 번에 로드"""
+    qs = (
+        DailyPrice.objects.filter(symbol=symbol)
+        .values("date", "open", "high", "low", "close", "volume")
+        .order_by("date")
+    )
+    df = pd.DataFrame.from_records(qs)
+    if df.empty:
+        raise ValueError(f"{symbol} 데이터가 DB에 없습니다.")
+    return df.set_index("date").dropna()
+
+# ── 여러 종목 최근 N 영업일 로드 ─────────────────────────────────
+def load_latest(symbols, rows: int) -> dict[str, pd.DataFrame]:
+    """종목별 가장 최근 rows 개 행을 단일 쿼리(ROW_NUMBER 윈도우 함수)로 로드"""
+    qs = (
+        DailyPrice.objects.filter(symbol__in=list(symbols))
+        .annotate(rn=Window(RowNumber(), partition_by=F("symbol"), order_by=F("date").desc()))
+        .filter(rn__lte=rows)
+        .values("symbol", "date", "open", "high", "low", "close", "volume")
+        .order_by("symbol", "date")
+    )
+    df = pd.DataFrame.from_records(qs)
+    if df.empty:
+        return {}
+    return {
+        sym: grp.drop(columns="symbol").set_index("date").dropna()
+        for sym, grp in df.groupby("symbol", sort=False)
+    }
+
+# ── 여러 종목 구간 일괄 로드 ──────────────────────────────────────
+def load_windows(symbols, years: int = 2, horizon: int = 40) -> dict[str, pd.DataFrame]:
+    """load_window 와 같은 구간을 여러 종목에 대해 쿼리 2번으로 로드.
+
+    1) symbol 별 최초 날짜 (GROUP BY 1회)
+    2) 종목별 구간을 OR 로 묶은 단일 range 쿼리
+    데이터가 없는 종목은 결과 dict 에서 빠진다.
+    """
+    firsts = (
+        DailyPrice.objects.filter(symbol__in=list(symbols))
+        .values("symbol")
+        .annotate(first=Min("date"))
+    )
+    cond = Q(pk__in=[])
+    for row in firsts:
+        cond |= Q(symbol=row["symbol"], date__range=window_range(row["first"], years, horizon))
+
+    qs = (
+        DailyPrice.objects.filter(cond)
+        .values("symbol", "date", "open", "high", "low", "close", "volume")
+        .order_by("symbol", "date")
+    )
+    df = pd.DataFrame.from_records(qs)
+    if df.empty:
+        return {}
+
+    return {
+        sym: grp.drop(columns="symbol").set_index("date").dropna()
+        for sym, grp in df.groupby("symbol", sort=False)
+    }
+
 
 
 # ── 정규화(Z-score) ────────────────────────────────────────────────
@@ -94,6 +165,139 @@ def normalize(df: pd.DataFrame, scaler: StandardScaler | None = None):
 
     return norm_df, scaler
 
+# ── 증분 정규화 (Welford) ─────────────────────────────────────────
+FEATS = ["open", "high", "low", "close", "volume"]
+
+
+def feature_rows(df: pd.DataFrame, tail: int | None = None) -> np.ndarray:
+    """normalize() 와 같은 전처리(volume log1p)만 한 (N, 5) 배열. tail 이면 마지막 N 행만"""
+    rows = df[FEATS].to_numpy(dtype=np.float64)
+    if tail is not None:
+        rows = rows[-tail:]
+    rows = rows.copy()
+    rows[:, -1] = np.log1p(rows[:, -1])
+    return rows
+
+
+class OnlineScaler:
+    """feature 별 누적 평균/분산(Welford)을 들고 있는 Z-score 변환기.
+
+    mode="expanding" : update() 로 새 봉이 들어올 때마다 O(1) 로 통계 갱신
+    mode="fixed"     : 학습 때 통계를 고정 (update 는 무시)
+    transform 은 넘겨받은 행만 변환하므로 예측 시 최근 lookback 행만 처리하면 된다.
+    StandardScaler 와 같은 모집단 분산을 쓰고, 분산 0 인 feature 는 scale 1.
+    """
+
+    def __init__(self, n_features: int = len(FEATS), mode: str = "expanding"):
+        if mode not in ("expanding", "fixed"):
+            raise ValueError(f"알 수 없는 mode: {mode}")
+        self.mode = mode
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+
+    # 생성 ---------------------------------------------------------
+    @classmethod
+    def from_scaler(cls, scaler: StandardScaler, mode: str = "fixed") -> "OnlineScaler":
+        obj = cls(len(scaler.mean_), mode)
+        obj.count = int(np.max(scaler.n_samples_seen_))
+        obj.mean = np.array(scaler.mean_, dtype=np.float64)
+        obj.m2 = np.array(scaler.var_, dtype=np.float64) * obj.count
+        return obj
+
+    @classmethod
+    def from_state(cls, state: dict, mode: str | None = None) -> "OnlineScaler":
+        obj = cls(len(state["mean"]), mode or state["mode"])
+        obj.count = int(state["count"])
+        obj.mean = np.array(state["mean"], dtype=np.float64)
+        obj.m2 = np.array(state["m2"], dtype=np.float64)
+        return obj
+
+    @classmethod
+    def from_model(cls, model_data, mode: str = "fixed") -> "OnlineScaler":
+        """모델과 함께 저장된 상태 → OnlineScaler (이전 pickle 은 StandardScaler 에서 복원)"""
+        state = model_data.get("normalizer")
+        if state is not None:
+            return cls.from_state(state, mode)
+        return cls.from_scaler(model_data["scaler"], mode)
+
+    def freeze(self) -> "OnlineScaler":
+        """현재 통계로 고정 (fixed 모드 전환)"""
+        self.mode = "fixed"
+        return self
+
+    def to_scaler(self) -> StandardScaler:
+        """같은 통계를 가진 fitted StandardScaler (save_model / joblib 호환용)"""
+        sc = StandardScaler()
+        sc.n_features_in_ = len(self.mean)
+        sc.n_samples_seen_ = self.count
+        sc.mean_, sc.var_, sc.scale_ = self.mean.copy(), self.var, self.scale
+        return sc
+
+    def state_dict(self) -> dict:
+        return {"mode": self.mode, "count": self.count,
+                "mean": self.mean.tolist(), "m2": self.m2.tolist()}
+
+    # 갱신 / 변환 ---------------------------------------------------
+    def update(self, rows) -> "OnlineScaler":
+        """rows: (k, n_features). 배치 병합(Chan) 이라 1행이면 Welford 한 스텝과 같다"""
+        if self.mode == "fixed":
+            return self
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        k = len(rows)
+        if k == 0:
+            return self
+        b_mean = rows.mean(axis=0)
+        b_m2 = ((rows - b_mean) ** 2).sum(axis=0)
+        n = self.count + k
+        delta = b_mean - self.mean
+        self.mean = self.mean + delta * (k / n)
+        self.m2 = self.m2 + b_m2 + delta ** 2 * (self.count * k / n)
+        self.count = n
+        return self
+
+    def update_transform(self, rows) -> np.ndarray:
+        """행마다 '그 행까지' 반영한 통계로 변환한 뒤 상태 갱신 (look-ahead 없음).
+
+        expanding 모드에서 행 단위 Welford 를 누적합으로 벡터화한 것. fixed 면 transform 과 같다.
+        """
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        if self.mode == "fixed" or len(rows) == 0:
+            return self.transform(rows)
+        n = self.count + np.arange(1, len(rows) + 1)[:, None]
+        d = rows - self.mean                        # 기존 평균 기준 편차로 누적 (수치 안정)
+        sd, sd2 = np.cumsum(d, axis=0), np.cumsum(d ** 2, axis=0)
+        mean = self.mean + sd / n
+        var = (self.m2 + sd2 - sd ** 2 / n) / n
+        scale = np.sqrt(np.maximum(var, 0.0))
+        scale[scale == 0.0] = 1.0
+        self.update(rows)
+        return (rows - mean) / scale
+
+    @property
+    def var(self) -> np.ndarray:
+        return self.m2 / self.count if self.count else np.zeros_like(self.m2)
+
+    @property
+    def scale(self) -> np.ndarray:
+        scale = np.sqrt(self.var)
+        scale[scale == 0.0] = 1.0
+        return scale
+
+    def transform(self, rows) -> np.ndarray:
+        return (np.asarray(rows, dtype=np.float64) - self.mean) / self.scale
+
+
+def transform_tail(df: pd.DataFrame, scaler, n: int) -> np.ndarray:
+    """원본 df 의 마지막 n 행만 전처리 + 정규화 → (n, 5) 배열 (DataFrame 재구성 없음)
+
+    scaler 는 학습 때 저장된 StandardScaler / OnlineScaler / 아티팩트 scaler 모두 가능.
+    """
+    rows = feature_rows(df, tail=n)
+    if isinstance(scaler, OnlineScaler):
+        return scaler.transform(rows)
+    return (rows - scaler.mean_) / scaler.scale_
+
 # ── 메인 실행부 ───────────────────────────────────────────────────
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="확장-윈도우 정규화 스크립트")
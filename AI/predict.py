@@ -1,25 +1,23 @@
 # AI/predict.py
 
 import argparse
-from pathlib import Path
 import pandas as pd
 import numpy as np
-from joblib import load
-from normalization import load_window, normalize
+from normalization import OnlineScaler, load_latest, load_window, transform_tail
+from model_registry import get_registry
 
 # ---------------------------------------------------------------------------
 # 모델 로드 함수
 # ---------------------------------------------------------------------------
-def load_model(symbol):
-    models_dir = Path(__file__).parent / "saved_models"
-    model_files = sorted(models_dir.glob(f"{symbol}_ridge_lb*.pkl"), reverse=True)
+def load_model(symbol, lookback=None, horizon=None, mmap=False):
+    registry = get_registry()
+    entry = registry.latest(symbol, lookback, horizon)  # 가장 최근에 학습된 모델 선택
 
-    if not model_files:
+    if entry is None:
         raise FileNotFoundError(f"No saved model found for {symbol}")
 
-    model_path = model_files[0]  # 가장 최신 모델 선택
-    print(f"[INFO] Loaded model: {model_path}")
-    model_data = load(model_path)
+    print(f"[INFO] Loaded model: {registry.file(entry)}")
+    model_data = registry.load(entry, mmap=mmap)
 
     return model_data
 
@@ -37,27 +35,83 @@ def prepare_features(norm_df, lookback):
     return recent_data.reshape(1, -1)
 
 
+# ---------------------------------------------------------------------------
+# 다종목 일괄 예측
+# ---------------------------------------------------------------------------
+def predict_frames(frames: dict, models: dict, lookback: int) -> pd.DataFrame:
+    """종목별 원본 df + 모델 → 예측 DataFrame (index=symbol, columns=asof, pred)
+
+    선형 모델(coef_ / intercept_)은 종목별 가중치를 한 행렬로 쌓아
+    정규화 → 내적을 한 번의 벡터 연산으로 처리하고, 그 외 모델만 개별 predict.
+    """
+    feats = ["open", "high", "low", "close", "volume"]
+    syms = [s for s in models if s in frames and len(frames[s]) >= lookback]
+    if not syms:
+        return pd.DataFrame(columns=["asof", "pred"]).rename_axis("symbol")
+
+    # (n, lookback, 5) 원본 → volume log1p (normalize() 와 동일 전처리)
+    raw = np.stack([frames[s][feats].to_numpy(dtype=np.float64)[-lookback:] for s in syms])
+    raw[:, :, feats.index("volume")] = np.log1p(raw[:, :, feats.index("volume")])
+    asof = [frames[s].index[-1] for s in syms]
+
+    linear = [i for i, s in enumerate(syms) if hasattr(models[s]["model"], "coef_")]
+    other = [i for i in range(len(syms)) if i not in set(linear)]
+    preds = np.empty(len(syms))
+
+    if linear:
+        mean = np.stack([models[syms[i]]["scaler"].mean_ for i in linear])[:, None, :]
+        scale = np.stack([models[syms[i]]["scaler"].scale_ for i in linear])[:, None, :]
+        X = ((raw[linear] - mean) / scale).reshape(len(linear), -1)
+        W = np.stack([np.ravel(models[syms[i]]["model"].coef_) for i in linear])
+        b = np.array([np.ravel(models[syms[i]]["model"].intercept_)[0] for i in linear])
+        preds[linear] = np.einsum("ij,ij->i", X, W) + b
+
+    for i in other:
+        scaler = models[syms[i]]["scaler"]
+        x = ((raw[i] - scaler.mean_) / scaler.scale_).reshape(1, -1)
+        preds[i] = models[syms[i]]["model"].predict(x)[0]
+
+    return pd.DataFrame({"asof": asof, "pred": preds}, index=pd.Index(syms, name="symbol"))
+
+
+def predict_many(symbols, lookback: int, horizon: int | None = None) -> pd.DataFrame:
+    """여러 종목의 예측 변화율을 한 번에 계산 (ORM 쿼리 1회)
+
+    main() 과 달리 가장 최근 lookback 영업일과 학습 때 저장된 scaler 를 사용한다.
+    모델/데이터가 없는 종목은 결과에서 빠진다.
+    """
+    registry = get_registry()
+    entries = {sym: registry.latest(sym, lookback, horizon) for sym in symbols}
+    models = {sym: registry.load(e) for sym, e in entries.items() if e is not None}
+    frames = load_latest(models.keys(), lookback)
+    return predict_frames(frames, models, lookback)
+
+
 # ---------------------------------------------------------------------------
 # 메인 예측 함수
 # ---------------------------------------------------------------------------
 def main(symbol: str, lookback: int):
     # 1. 모델 로드
-    model_data = load_model(symbol)
+    model_data = load_model(symbol, lookback)
     model = model_data["model"]
-    scaler = model_data["scaler"]
-    feats = model_data["feats"]
-
-    # 2. 데이터 로드 및 정규화
-    raw_df = load_window(symbol)
-    if len(raw_df) < lookback:
+    scaler = OnlineScaler.from_model(model_data)    # 학습 때 scaler 재사용 (재학습 X)
+
+    # 2. 데이터 로드 및 정규화 (최근 lookback 행만)
+    version = model_data.get("feature_version")
+    if version:
+        # feature store 에서 학습한 모델 → 같은 version 의 정규화 feature 를 그대로 읽음
+        from feature_store import load_features
+        rows = load_features(symbol, version, tail=lookback).to_numpy(dtype=np.float64)
+    else:
+        raw_df = load_window(symbol)
+        rows = transform_tail(raw_df, scaler, lookback)
+    if len(rows) < lookback:
         print("❗ DB 안에 충분한 데이터가 없습니다. fetch_yfinance 로 데이터를 확보하세요.")
         return
     
-    norm_df, _ = normalize(raw_df)
-    norm_df.set_index("date", inplace=True)
-
     # 3. 입력 데이터 준비
-    X_input = prepare_features(norm_df, lookback)
+    X_input = rows.reshape(1, -1)
+    print(f"[INFO] Input features: {X_input.shape}")
 
     # 4. 예측
     pred = model.predict(X_input)[0]
@@ -70,7 +124,13 @@ def main(symbol: str, lookback: int):
 if __name__ == "__main__":
     p = argparse.ArgumentParser()
     p.add_argument("--symbol", default="QQQ", help="Stock symbol (e.g., QQQ, AAPL)")
+    p.add_argument("--symbols", nargs="+", help="여러 종목 일괄 예측 (predict_many)")
     p.add_argument("--lookback", type=int, default=252, help="Days of history (≈1y)")
+    p.add_argument("--horizon", type=int, default=None, help="predict_many 에서 사용할 모델 horizon")
     args = p.parse_args()
 
-    main(args.symbol, args.lookback)
+    if args.symbols:
+        pd.set_option("display.max_rows", None)
+        print(predict_many(args.symbols, args.lookback, args.horizon))
+    else:
+        main(args.symbol, args.lookback)
@@ -0,0 +1,303 @@
+# ---------------------------------------------------------------------------
+# predict_server.py
+# ---------------------------------------------------------------------------
+"""
+상주형 예측 서비스.
+
+predict.py 는 호출마다 Django 초기화 → saved_models glob → joblib.load →
+DB 재조회 → scaler 재학습을 반복한다. 여기서는 한 프로세스가
+- 모델(+학습 때 저장된 scaler)을 (symbol, lookback, horizon) 키 LRU 캐시에 상주
+- 정규화는 학습 때 통계로 만든 OnlineScaler 를 재사용 (--scaler-mode expanding 이면
+  push_bar 로 들어온 봉의 날짜가 끝날 때, 즉 다음 날짜 봉이 올 때 확정 봉으로 Welford 갱신.
+  확정 봉은 종목별로 따로 들고 있어, LRU 에서 밀려났다 다시 올리거나 새 모델로 바뀐
+  scaler 에도 모델 학습일 이후 봉을 다시 반영한다)
+- 종목별 최근 N 영업일 원본 행을 링버퍼에 유지 (push_bar 로 갱신)
+- 레지스트리에 더 새로운 모델이 등록되면 다음 요청에서 자동 교체
+하여 여러 종목 예측을 한 번에 ms 단위로 응답한다.
+
+같은 프로세스의 동기 코드에서는 get_service().predict(...) 를, async 뷰(Django ASGI 등)에서는
+await get_service().apredict(...) 를 (predict/push_bar 는 처음 보는 종목이면 ORM 을 동기로 조회하므로
+이벤트 루프에서 바로 부르면 SynchronousOnlyOperation), 다른 프로세스에서는 로컬 HTTP 엔드포인트를 사용한다.
+
+    python predict_server.py --port 8765
+    curl -d '{"symbols": ["QQQ"], "lookback": 252, "horizon": 22}' localhost:8765/predict
+"""
+import argparse
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from asgiref.sync import sync_to_async
+from django.db import connection
+
+from normalization import FEATS, OnlineScaler  # (django.setup)
+from core.models import DailyPrice
+from model_registry import MODELS_DIR, get_registry
+
+VOLUME = FEATS.index("volume")
+
+
+# ---------------------------------------------------------------------------
+# 종목별 최근 행 링버퍼
+# ---------------------------------------------------------------------------
+class RollingWindow:
+    """최근 capacity 행을 유지하는 링버퍼.
+
+    각 행을 i 와 i + capacity 두 곳에 써 두어 tail(n) 이 항상 복사 없는
+    연속 slice 가 된다. volume 은 normalize() 와 같이 log1p 로 저장.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = np.zeros((2 * capacity, len(FEATS)))
+        self._dates = np.zeros(2 * capacity, dtype="datetime64[D]")
+        self._pos = 0
+        self.count = 0
+
+    def append(self, date, row) -> bool:
+        """새 날짜 행이면 True (같은 날짜 덮어쓰기 / 과거 날짜 무시는 False)"""
+        date = np.datetime64(pd.Timestamp(date).date(), "D")
+        row = np.asarray(row, dtype=np.float64).copy()
+        row[VOLUME] = np.log1p(row[VOLUME])
+
+        # 같은 날짜 재전송(장중 갱신)은 마지막 행을 덮어쓴다
+        if self.count and self._dates[self._pos - 1 + self.capacity] == date:
+            pos, new = (self._pos - 1) % self.capacity, False
+        elif self.count and self._dates[self._pos - 1 + self.capacity] > date:
+            return False
+        else:
+            pos, new = self._pos, True
+            self._pos = (self._pos + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+        self._buf[pos] = self._buf[pos + self.capacity] = row
+        self._dates[pos] = self._dates[pos + self.capacity] = date
+        return new
+
+    def extend(self, df: pd.DataFrame):
+        for date, row in zip(df.index, df[FEATS].to_numpy(dtype=np.float64)):
+            self.append(date, row)
+
+    def tail(self, n: int) -> np.ndarray:
+        end = self._pos + self.capacity
+        return self._buf[end - n : end]
+
+    @property
+    def last_date(self):
+        return self._dates[self._pos - 1 + self.capacity] if self.count else None
+
+
+# ---------------------------------------------------------------------------
+# 서비스
+# ---------------------------------------------------------------------------
+def _trained_on(entry: dict):
+    """레지스트리 항목의 저장 시각(YYYYMMDD_HHMMSS) → 학습일. 학습 데이터는 그 전날까지의 마감 봉"""
+    stamp = entry.get("timestamp") or ""
+    if len(stamp) < 8:
+        return None
+    return np.datetime64(f"{stamp[:4]}-{stamp[4:6]}-{stamp[6:8]}", "D")
+
+
+class PredictionService:
+    def __init__(self, models_dir: Path = MODELS_DIR, max_models: int = 256,
+                 window: int = 512, mmap: bool = False, scaler_mode: str = "fixed"):
+        self.registry = get_registry(models_dir)
+        self.max_models = max_models
+        self.window_size = window
+        self.mmap = mmap
+        self.scaler_mode = scaler_mode
+
+        self._lock = threading.RLock()
+        self._models: OrderedDict = OrderedDict()   # key -> (file name, model_data, OnlineScaler, 학습일)
+        self._windows: dict[str, RollingWindow] = {}
+        self._open_day: dict[str, np.datetime64] = {}   # push_bar 로 받은, 아직 scaler 에 안 넣은 날짜
+        self._closed: dict[str, list] = {}              # symbol -> [(날짜, log1p 적용된 확정 행)]
+
+    # ── 모델 조회 (registry.json 변경 시 자동 재인덱싱 → hot reload) ─
+    def _resolve(self, symbol: str, lookback: int, horizon: int | None):
+        entry = self.registry.latest(symbol, lookback, horizon)
+        if entry is None:
+            return None, None
+        return (symbol, entry["lookback"], entry["horizon"]), entry
+
+    def get_model(self, symbol: str, lookback: int, horizon: int | None = None):
+        with self._lock:
+            key, entry = self._resolve(symbol, lookback, horizon)
+            if key is None:
+                raise FileNotFoundError(f"No saved model found for {symbol} lb{lookback} h{horizon}")
+
+            cached = self._models.get(key)
+            if cached is None or cached[0] != entry["path"]:    # 미적재 or 새 모델 등록
+                model_data = self.registry.load(entry, mmap=self.mmap)
+                scaler = OnlineScaler.from_model(model_data, self.scaler_mode)
+                since = _trained_on(entry)
+                if self.scaler_mode == "expanding":     # 학습 이후 확정된 봉을 다시 반영
+                    rows = [row for date, row in self._closed.get(symbol, ()) if since is None or date >= since]
+                    if rows:
+                        scaler.update(np.vstack(rows))
+                cached = (entry["path"], model_data, scaler, since)
+                self._models[key] = cached
+                if len(self._models) > self.max_models:
+                    self._models.popitem(last=False)
+            self._models.move_to_end(key)
+            return key, cached[1], cached[2]
+
+    # ── 최근 행 윈도우 ───────────────────────────────────────────
+    def window(self, symbol: str) -> RollingWindow:
+        with self._lock:
+            win = self._windows.get(symbol)
+        if win is not None:
+            return win
+
+        qs = (
+            DailyPrice.objects.filter(symbol=symbol)
+            .order_by("-date")
+            .values("date", *FEATS)[: self.window_size]
+        )
+        df = pd.DataFrame.from_records(qs)
+        connection.close()                          # 요청 스레드마다 연결을 남기지 않음
+
+        win = RollingWindow(self.window_size)
+        if not df.empty:
+            win.extend(df.iloc[::-1].set_index("date").dropna())
+        with self._lock:
+            return self._windows.setdefault(symbol, win)
+
+    def push_bar(self, symbol: str, date, bar):
+        """새 일봉(open, high, low, close, volume) 반영 — 수집기에서 호출.
+
+        장중에는 같은 날짜가 여러 번 오므로 expanding scaler 는 다음 날짜 봉이 왔을 때
+        직전(마감된) 날짜 행으로 한 번만 갱신한다.
+        """
+        win = self.window(symbol)
+        with self._lock:
+            prev = win.last_date
+            if not win.append(date, bar) or self.scaler_mode != "expanding":
+                return
+            if prev is not None and self._open_day.get(symbol) == prev:
+                row = win.tail(2)[:1].copy()        # 마감된 직전 날짜 (log1p 적용된 행)
+                self._closed.setdefault(symbol, []).append((prev, row))
+                for key, cached in self._models.items():
+                    if key[0] == symbol and (cached[3] is None or prev >= cached[3]):
+                        cached[2].update(row)
+            self._open_day[symbol] = win.last_date
+
+    # ── 예측 ─────────────────────────────────────────────────────
+    def predict(self, requests) -> list[dict]:
+        """requests = [{"symbol", "lookback", "horizon"(optional)}, ...]"""
+        out = []
+        for req in requests:
+            symbol, lookback = req["symbol"], int(req["lookback"])
+            horizon = req.get("horizon")
+            res = {"symbol": symbol, "lookback": lookback, "horizon": horizon}
+            try:
+                key, model_data, scaler = self.get_model(symbol, lookback, None if horizon is None else int(horizon))
+                win = self.window(symbol)
+                with self._lock:
+                    if win.count < lookback:
+                        raise ValueError(f"데이터 부족 ({win.count} < {lookback})")
+                    rows = win.tail(lookback)
+                    asof = str(win.last_date)
+                    x = scaler.transform(rows).reshape(1, -1)
+                res.update(horizon=key[2], asof=asof, pred=float(model_data["model"].predict(x)[0]))
+            except (FileNotFoundError, ValueError) as e:
+                res["error"] = str(e)
+            out.append(res)
+        return out
+
+    async def apredict(self, requests) -> list[dict]:
+        """async 뷰용 predict — ORM 조회가 있어 스레드 풀에서 실행 (연결은 window() 가 닫음)"""
+        return await sync_to_async(self.predict, thread_sensitive=False)(requests)
+
+    async def apush_bar(self, symbol: str, date, bar):
+        await sync_to_async(self.push_bar, thread_sensitive=False)(symbol, date, bar)
+
+
+_SERVICE: PredictionService | None = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_service(**kwargs) -> PredictionService:
+    """프로세스 전역 PredictionService (in-process 호출용, async 뷰에서는 apredict / apush_bar)"""
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = PredictionService(**kwargs)
+        return _SERVICE
+
+
+# ---------------------------------------------------------------------------
+# 로컬 HTTP 엔드포인트
+# ---------------------------------------------------------------------------
+class _Handler(BaseHTTPRequestHandler):
+    service: PredictionService = None
+
+    def _reply(self, code: int, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"models": len(self.service._models), "symbols": len(self.service._windows)})
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        try:
+            req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if self.path == "/predict":
+                # {"requests": [...]} 또는 {"symbols": [...], "lookback": .., "horizon": ..}
+                reqs = req.get("requests") or [
+                    {"symbol": s, "lookback": req["lookback"], "horizon": req.get("horizon")}
+                    for s in req["symbols"]
+                ]
+                self._reply(200, self.service.predict(reqs))
+            elif self.path == "/bars":
+                # {"symbol": .., "date": "YYYY-MM-DD", "bar": [o, h, l, c, v]}
+                self.service.push_bar(req["symbol"], req["date"], req["bar"])
+                self._reply(200, {"ok": True})
+            else:
+                self._reply(404, {"error": "not found"})
+        except (KeyError, TypeError, ValueError) as e:
+            self._reply(400, {"error": repr(e)})
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, service: PredictionService | None = None):
+    handler = type("Handler", (_Handler,), {"service": service or get_service()})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    print(f"[INFO] prediction server on http://{host}:{port}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("종료 요청됨")
+    finally:
+        httpd.server_close()
+
+
+# ---------------------------------------------------------------------------
+# 스크립트 엔트리 포인트
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--max-models", type=int, default=256, help="LRU capacity")
+    p.add_argument("--window", type=int, default=512, help="rows kept per symbol")
+    p.add_argument("--mmap", action="store_true", help="memory-map model arrays")
+    p.add_argument("--scaler-mode", choices=["fixed", "expanding"], default="fixed",
+                   help="expanding: update saved scaler stats with pushed bars")
+    args = p.parse_args()
+
+    serve(args.host, args.port, get_service(max_models=args.max_models, window=args.window,
+                                            mmap=args.mmap, scaler_mode=args.scaler_mode))
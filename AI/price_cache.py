@@ -0,0 +1,195 @@
+# ---------------------------------------------------------------------------
+# price_cache.py
+# ---------------------------------------------------------------------------
+"""
+DailyPrice 로컬 컬럼형 캐시 (Arrow IPC, 종목별 파일).
+
+ORM .values() 는 행마다 dict 를 만들어 수년 × 다종목 로드가 느리다.
+여기서는 종목별로 cache/prices/<symbol>.arrow 에 date/OHLCV 컬럼을 비압축 IPC 로
+저장해 두고, 읽을 때는 memory-map 으로 열어 복사 없이 배열을 꺼낸다.
+
+- refresh()      : 캐시의 마지막 날짜 이후 행만 DB 에서 받아 이어 붙인다
+                   (종목들을 OR 로 묶은 쿼리, values_list 튜플로 수신)
+- load_arrays()  : (dates[datetime64[D]], values(N, 5) float64) — 날짜 구간은
+                   정렬된 date 컬럼 searchsorted 후 zero-copy slice 로 잘라낸다
+- load_history / load_window / load_windows : normalization 의 같은 이름 함수와
+                   같은 결과(DataFrame)를 캐시에서 반환
+
+DB 에서 과거 행이 수정되면 refresh(rebuild=True) 로 다시 만든다.
+
+    python price_cache.py --symbols QQQ SPY
+"""
+import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import ipc
+from django.db.models import Q
+
+from normalization import FEATS, window_range
+from core.models import DailyPrice
+
+CACHE_DIR = Path(__file__).parent / "cache" / "prices"
+SCHEMA = pa.schema(
+    [("date", pa.date32())]
+    + [(c, pa.float64()) for c in FEATS if c != "volume"]
+    + [("volume", pa.int64())]
+)
+QUERY_CHUNK = 500                                  # OR 조건 하나에 묶는 종목 수
+
+_OPEN: dict[Path, tuple] = {}                     # path -> (mtime_ns, pa.Table)
+
+
+def _path(symbol: str, cache_dir: Path = CACHE_DIR) -> Path:
+    return Path(cache_dir) / f"{symbol}.arrow"
+
+
+# ---------------------------------------------------------------------------
+# 읽기 (memory-map)
+# ---------------------------------------------------------------------------
+def open_table(symbol: str, cache_dir: Path = CACHE_DIR) -> pa.Table | None:
+    """캐시 파일을 memory-map 으로 연 Table (파일이 바뀌었을 때만 다시 연다)"""
+    path = _path(symbol, cache_dir)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    hit = _OPEN.get(path)
+    if hit is None or hit[0] != mtime:
+        with pa.memory_map(str(path), "r") as src:
+            table = ipc.open_file(src).read_all()
+        hit = _OPEN[path] = (mtime, table)
+    return hit[1]
+
+
+def _edge_date(symbol: str, cache_dir: Path, pos: int):
+    table = open_table(symbol, cache_dir)
+    if table is None or table.num_rows == 0:
+        return None
+    return table.column("date")[pos].as_py()
+
+
+def first_date(symbol: str, cache_dir: Path = CACHE_DIR):
+    return _edge_date(symbol, cache_dir, 0)
+
+
+def last_date(symbol: str, cache_dir: Path = CACHE_DIR):
+    return _edge_date(symbol, cache_dir, -1)
+
+
+def _slice(table: pa.Table, start=None, end=None) -> pa.Table:
+    """정렬된 date 컬럼 기준 [start, end] 구간 (양끝 포함) zero-copy slice"""
+    if start is None and end is None:
+        return table
+    dates = table.column("date").to_numpy()       # datetime64[D]
+    lo = 0 if start is None else dates.searchsorted(np.datetime64(pd.Timestamp(start).date(), "D"))
+    hi = len(dates) if end is None else dates.searchsorted(np.datetime64(pd.Timestamp(end).date(), "D"), "right")
+    return table.slice(lo, max(hi - lo, 0))
+
+
+def load_arrays(symbol: str, start=None, end=None, cache_dir: Path = CACHE_DIR):
+    """→ (dates datetime64[D] (N,), values float64 (N, 5)  [open, high, low, close, volume])"""
+    table = open_table(symbol, cache_dir)
+    if table is None:
+        raise ValueError(f"{symbol} 캐시가 없습니다. price_cache.refresh 를 먼저 실행하세요.")
+    table = _slice(table, start, end)
+    dates = table.column("date").to_numpy()
+    values = np.column_stack([table.column(c).to_numpy().astype(np.float64, copy=False) for c in FEATS])
+    return dates, values
+
+
+def load_frame(symbol: str, start=None, end=None, cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    table = open_table(symbol, cache_dir)
+    if table is None:
+        raise ValueError(f"{symbol} 캐시가 없습니다. price_cache.refresh 를 먼저 실행하세요.")
+    df = _slice(table, start, end).to_pandas(date_as_object=True)
+    return df.set_index("date").dropna()
+
+
+# ---------------------------------------------------------------------------
+# 갱신
+# ---------------------------------------------------------------------------
+def _write(symbol: str, table: pa.Table, cache_dir: Path):
+    path = _path(symbol, cache_dir)
+    tmp = path.with_suffix(".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, ipc.new_file(sink, SCHEMA) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)                           # 읽는 쪽은 항상 완전한 파일만 본다
+
+
+def refresh(symbols, cache_dir: Path = CACHE_DIR, rebuild: bool = False) -> dict[str, int]:
+    """캐시 마지막 날짜 이후 DB 행만 받아 종목별 파일에 이어 쓴다 → {symbol: 추가 행 수}"""
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    symbols = list(dict.fromkeys(symbols))
+    lasts = {s: None if rebuild else last_date(s, cache_dir) for s in symbols}
+
+    added = {}
+    cols = ["symbol", "date", *FEATS]
+    for i in range(0, len(symbols), QUERY_CHUNK):
+        chunk = symbols[i : i + QUERY_CHUNK]
+        fresh = [s for s in chunk if lasts[s] is None]
+        cond = Q(symbol__in=fresh)
+        for s in chunk:
+            if lasts[s] is not None:
+                cond |= Q(symbol=s, date__gt=lasts[s])
+
+        rows = DailyPrice.objects.filter(cond).order_by("symbol", "date").values_list(*cols)
+        df = pd.DataFrame.from_records(list(rows), columns=cols)
+        for sym, grp in df.groupby("symbol", sort=False):
+            new = pa.Table.from_pandas(grp.drop(columns="symbol"), schema=SCHEMA, preserve_index=False)
+            old = open_table(sym, cache_dir) if lasts[sym] is not None else None
+            _write(sym, pa.concat_tables([old, new]) if old is not None else new, cache_dir)
+            added[sym] = len(grp)
+    return added
+
+
+# ---------------------------------------------------------------------------
+# normalization 호환 로더
+# ---------------------------------------------------------------------------
+def load_history(symbol: str, cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    df = load_frame(symbol, cache_dir=cache_dir)
+    if df.empty:
+        raise ValueError(f"{symbol} 데이터가 캐시에 없습니다.")
+    return df
+
+
+def load_window(symbol: str, years: int = 2, lookback: int = 252, horizon: int = 40,
+                cache_dir: Path = CACHE_DIR) -> pd.DataFrame:
+    first = first_date(symbol, cache_dir)
+    if first is None:
+        raise ValueError(f"{symbol} 데이터가 캐시에 없습니다.")
+    df = load_frame(symbol, *window_range(first, years, horizon), cache_dir=cache_dir)
+    if df.empty:
+        raise ValueError(f"{symbol}의 선택한 1년+{horizon}일 구간에 데이터가 없습니다.")
+    return df
+
+
+def load_windows(symbols, years: int = 2, horizon: int = 40,
+                 cache_dir: Path = CACHE_DIR) -> dict[str, pd.DataFrame]:
+    """normalization.load_windows 와 같은 dict. 캐시를 먼저 증분 갱신한 뒤 읽는다"""
+    refresh(symbols, cache_dir)
+    out = {}
+    for sym in symbols:
+        try:
+            out[sym] = load_window(sym, years, horizon=horizon, cache_dir=cache_dir)
+        except ValueError:
+            continue
+    return out
+
+
+# ---------------------------------------------------------------------------
+# script entry point
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="+", default=["QQQ"])
+    p.add_argument("--rebuild", action="store_true", help="re-download full history")
+    args = p.parse_args()
+
+    added = refresh(args.symbols, rebuild=args.rebuild)
+    for sym in args.symbols:
+        print(f"  {sym:<10} +{added.get(sym, 0)} rows  (last={last_date(sym)})")
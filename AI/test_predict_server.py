@@ -0,0 +1,86 @@
+# AI/test_predict_server.py
+"""PredictionService (expanding scaler): LRU 에서 밀려났다 다시 올라오거나 새 모델로 바뀌어도
+push_bar 로 확정된 봉이 scaler 에 그대로 반영되는지.
+
+    cd AI && python -m pytest -q test_predict_server.py
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import StandardScaler
+
+from model_learn import save_model
+from normalization import FEATS, OnlineScaler
+from predict_server import PredictionService, RollingWindow
+
+LOOKBACK = 5
+DATES = pd.bdate_range("2030-01-01", periods=8)          # 모델 저장일(오늘) 이후 봉
+
+
+def train(models_dir, symbol, seed):
+    rng = np.random.default_rng(seed)
+    feats = rng.random((50, len(FEATS))) * 100 + 1
+    model = Ridge().fit(rng.standard_normal((10, LOOKBACK * len(FEATS))), rng.standard_normal(10))
+    return save_model(symbol, model, StandardScaler().fit(feats), LOOKBACK, 1, models_dir)
+
+
+def service(models_dir, max_models):
+    svc = PredictionService(models_dir=models_dir, max_models=max_models, window=32, scaler_mode="expanding")
+    for symbol in ("AAA", "BBB"):                         # DB 대신 빈 윈도우로 시작
+        svc._windows[symbol] = RollingWindow(32)
+    return svc
+
+
+def push_days(svc, symbol, rng):
+    bars = rng.random((len(DATES), len(FEATS))) * 100 + 1
+    for date, bar in zip(DATES, bars):
+        svc.push_bar(symbol, date, bar)
+        svc.push_bar(symbol, date, bar * 1.01)           # 장중 재전송 (같은 날짜 덮어쓰기)
+    closed = bars[:-1] * 1.01                            # 마지막 날은 아직 안 닫힘
+    closed[:, FEATS.index("volume")] = np.log1p(closed[:, FEATS.index("volume")])
+    return closed
+
+
+def expected(svc, symbol, closed):
+    entry = svc.registry.latest(symbol, LOOKBACK, 1)
+    base = OnlineScaler.from_model(svc.registry.load(entry), "expanding")
+    return base.update(closed)
+
+
+def test_evicted_model_keeps_closed_days(tmp_path):
+    train(tmp_path, "AAA", 0), train(tmp_path, "BBB", 1)
+    svc = service(tmp_path, max_models=1)
+    svc.get_model("AAA", LOOKBACK)                       # 적재된 상태에서 일부 봉
+    closed = push_days(svc, "AAA", np.random.default_rng(2))
+    svc.get_model("BBB", LOOKBACK)                       # AAA 가 LRU 에서 밀려남
+    assert ("AAA", LOOKBACK, 1) not in svc._models
+
+    _, _, scaler = svc.get_model("AAA", LOOKBACK)        # 다시 적재 → 확정 봉 재반영
+    want = expected(svc, "AAA", closed)
+    assert scaler.count == want.count
+    np.testing.assert_allclose(scaler.mean, want.mean)
+    np.testing.assert_allclose(scaler.var, want.var)
+
+    res = svc.predict([{"symbol": "AAA", "lookback": LOOKBACK}])[0]
+    x = want.transform(svc._windows["AAA"].tail(LOOKBACK)).reshape(1, -1)
+    entry = svc.registry.latest("AAA", LOOKBACK, 1)
+    assert np.isclose(res["pred"], svc.registry.load(entry)["model"].predict(x)[0])
+
+
+def test_model_loaded_after_push_and_hot_reload(tmp_path):
+    train(tmp_path, "AAA", 0)
+    svc = service(tmp_path, max_models=4)
+    closed = push_days(svc, "AAA", np.random.default_rng(3))   # 모델 적재 전에 받은 봉
+
+    _, _, scaler = svc.get_model("AAA", LOOKBACK)
+    np.testing.assert_allclose(scaler.mean, expected(svc, "AAA", closed).mean)
+
+    time.sleep(1.1)                                      # 파일명 stamp 가 초 단위
+    train(tmp_path, "AAA", 4)                            # 새 모델 등록 → 다음 요청에서 교체
+    _, _, reloaded = svc.get_model("AAA", LOOKBACK)
+    assert reloaded is not scaler
+    want = expected(svc, "AAA", closed)
+    assert reloaded.count == want.count
+    np.testing.assert_allclose(reloaded.mean, want.mean)
@@ -0,0 +1,247 @@
+# ---------------------------------------------------------------------------
+# walk_forward.py
+# ---------------------------------------------------------------------------
+"""
+확장-윈도우 walk-forward 백테스트.
+
+normalization.py 의 확장-윈도우 방식을 끝까지 진행한다:
+1) 최초 데이터의 다음 달 1일부터 `years` 년을 첫 학습 구간으로 잡고
+2) 한 달씩 학습 구간 끝을 앞으로 밀면서, 그 다음 한 달을 테스트로 평가
+3) 종목 전체 기간을 DB 에서 한 번만 읽고, 윈도우는 stride view 로 재사용
+
+scaler 모드
+- expanding : fold 마다 학습 구간으로 Z-score 를 다시 맞춤 (look-ahead 없음)
+- fixed     : 첫 학습 구간의 Z-score 를 고정 → 특징/타겟이 fold 간 불변이므로
+              Ridge 충분통계량(XᵀX, Xᵀy) 을 누적해 fold 마다 증분 재학습
+
+fold 는 연속 블록 단위로 프로세스 풀에 분배되고, 완료된 fold 는
+cache/walk_forward/*.jsonl 에 기록되어 재실행 시 건너뛴다.
+
+    python walk_forward.py --symbol QQQ --lookback 252 --horizon 22 --scaler fixed
+"""
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+from django.db import connections
+from sklearn.linear_model import Ridge
+from threadpoolctl import threadpool_limits
+
+from model_learn import window_arrays
+from normalization import OnlineScaler, feature_rows, load_history, next_month_first
+
+CACHE_DIR = Path(__file__).parent / "cache" / "walk_forward"
+
+
+# ---------------------------------------------------------------------------
+# fold 구성
+# ---------------------------------------------------------------------------
+def make_folds(dates: pd.DatetimeIndex, start: pd.Timestamp, years: int = 2, step_months: int = 1):
+    """[(train_end, test_end, a, b), ...]  a/b = 테스트 구간의 행 인덱스 [a, b)"""
+    folds = []
+    train_end = start + relativedelta(years=years)
+    while True:
+        test_end = train_end + relativedelta(months=step_months)
+        a, b = dates.searchsorted(train_end), dates.searchsorted(test_end)
+        if a >= len(dates):
+            break
+        folds.append((train_end, test_end, int(a), int(b)))
+        train_end = test_end
+    return folds
+
+
+# ---------------------------------------------------------------------------
+# Ridge 충분통계량 (fixed 모드 증분 재학습)
+# ---------------------------------------------------------------------------
+class RidgeStats:
+    """XᵀX, Xᵀy 누적 → sklearn Ridge(fit_intercept=True) 와 같은 해"""
+
+    def __init__(self, p: int):
+        self.n = 0
+        self.sx = np.zeros(p)
+        self.sy = 0.0
+        self.xx = np.zeros((p, p))
+        self.xy = np.zeros(p)
+
+    def add(self, X: np.ndarray, y: np.ndarray):
+        if len(X) == 0:
+            return
+        X = np.ascontiguousarray(X)
+        self.n += len(X)
+        self.sx += X.sum(axis=0)
+        self.sy += y.sum()
+        self.xx += X.T @ X
+        self.xy += X.T @ y
+
+    def solve(self, alpha: float):
+        mx, my = self.sx / self.n, self.sy / self.n
+        gram = self.xx - self.n * np.outer(mx, mx)
+        gram[np.diag_indices_from(gram)] += alpha
+        coef = np.linalg.solve(gram, self.xy - self.n * mx * my)
+        return coef, my - mx @ coef
+
+
+# ---------------------------------------------------------------------------
+# worker : 연속된 fold 블록 하나를 처리
+# ---------------------------------------------------------------------------
+def _init_worker():
+    threadpool_limits(1)
+
+
+def _score(y_true, y_pred):
+    err = y_pred - y_true
+    return float(np.abs(err).mean()), float(np.sqrt((err ** 2).mean()))
+
+
+def run_block(raw, folds, lookback, horizon, alpha=1.0, fixed_scaler: OnlineScaler | None = None):
+    """folds = [(fold_no, a, b), ...]  → fold 별 결과 dict 리스트
+
+    샘플 j 의 기준일 인덱스 i = j + lookback, 타겟은 i + horizon 행.
+    학습: 타겟이 테스트 시작(a) 이전에 확정된 샘플만 (i + horizon < a)
+    테스트: a <= i < b
+    """
+    if fixed_scaler is not None:
+        X, y = window_arrays(fixed_scaler.transform(raw), lookback, horizon)
+        stats, seen = RidgeStats(X.shape[1]), 0
+    else:
+        scaler, fitted = OnlineScaler(), 0
+
+    out = []
+    for fold_no, a, b in folds:
+        tr = max(a - horizon - lookback, 0)
+        if fixed_scaler is None:
+            scaler.update(raw[fitted:a])            # 확장 윈도우: 늘어난 행만 Welford 갱신
+            fitted = a
+            X, y = window_arrays(scaler.transform(raw), lookback, horizon)
+        te_lo, te_hi = max(a - lookback, 0), min(b - lookback, len(X))
+        if tr == 0 or te_hi <= te_lo:
+            continue
+
+        if fixed_scaler is None:
+            model = Ridge(alpha=alpha).fit(X[:tr], y[:tr])
+            preds = model.predict(X[te_lo:te_hi])
+        else:
+            stats.add(X[seen:tr], y[seen:tr])     # 이전 fold 이후 늘어난 행만
+            seen = tr
+            coef, intercept = stats.solve(alpha)
+            preds = X[te_lo:te_hi] @ coef + intercept
+
+        mae, rmse = _score(y[te_lo:te_hi], preds)
+        out.append({"fold": fold_no, "n_train": tr, "n_test": te_hi - te_lo,
+                    "mae": mae, "rmse": rmse})
+    return out
+
+
+# ---------------------------------------------------------------------------
+# driver
+# ---------------------------------------------------------------------------
+def _cache_path(symbol, lookback, horizon, alpha, years, scaler):
+    return CACHE_DIR / f"{symbol}_lb{lookback}_h{horizon}_a{alpha:g}_y{years}_{scaler}.jsonl"
+
+
+def _read_cache(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(ln) for ln in f if ln.strip()]
+    return {r["train_end"]: r for r in rows}
+
+
+def walk_forward(symbol: str, lookback: int = 252, horizon: int = 22, years: int = 2,
+                 alpha: float = 1.0, scaler: str = "expanding", workers: int | None = None,
+                 resume: bool = True, raw_df: pd.DataFrame | None = None,
+                 price_cache: bool = False) -> pd.DataFrame:
+    if raw_df is None:
+        if price_cache:
+            import price_cache as pc
+            pc.refresh([symbol])                    # 마지막 날짜 이후 행만 DB 에서 추가
+            raw_df = pc.load_history(symbol)
+        else:
+            raw_df = load_history(symbol)
+        connections.close_all()
+
+    # 확장-윈도우 시작점: 최초 데이터의 다음 달 1일
+    dates = pd.DatetimeIndex(pd.to_datetime(raw_df.index))
+    start = next_month_first(dates[0])
+    keep = dates >= start
+    dates, raw = dates[keep], feature_rows(raw_df)[keep]
+
+    folds = make_folds(dates, start, years)
+    if not folds:
+        raise ValueError(f"{symbol}: 첫 학습 구간({years}년) 이후 데이터가 없습니다.")
+
+    cache_path = _cache_path(symbol, lookback, horizon, alpha, years, scaler)
+    cached = _read_cache(cache_path) if resume else {}
+
+    meta = {}
+    todo = []
+    for k, (train_end, test_end, a, b) in enumerate(folds):
+        key = str(train_end.date())
+        # 테스트 구간 타겟이 모두 확정된 fold 만 캐시 대상 (마지막 미완 fold 는 매번 재계산)
+        meta[k] = {"symbol": symbol, "train_end": key, "test_end": str(test_end.date()),
+                   "complete": b + horizon <= len(dates)}
+        if key not in cached:
+            todo.append((k, a, b))
+
+    fixed = OnlineScaler().update(raw[: folds[0][2]]).freeze() if scaler == "fixed" else None
+
+    live = {m["train_end"] for m in meta.values()}
+    results = [r for key, r in cached.items() if key in live]
+    if todo:
+        workers = workers or os.cpu_count()
+        size = max(1, math.ceil(len(todo) / (workers * 4)))
+        blocks = [todo[i : i + size] for i in range(0, len(todo), size)]
+
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool, \
+             open(cache_path, "a", encoding="utf-8") as cache:
+            futures = [
+                pool.submit(run_block, raw, blk, lookback, horizon, alpha, fixed)
+                for blk in blocks
+            ]
+            for fut in as_completed(futures):
+                for r in fut.result():
+                    m = meta[r.pop("fold")]
+                    r = {**{k: v for k, v in m.items() if k != "complete"}, **r}
+                    results.append(r)
+                    if m["complete"]:
+                        cache.write(json.dumps(r) + "\n")
+                cache.flush()
+
+    if not results:
+        raise ValueError(
+            f"{symbol}: 결과가 나온 fold 가 없습니다 — lookback+horizon({lookback}+{horizon})이 "
+            f"학습/테스트 구간({years}년 시작, {len(dates)}행)보다 깁니다."
+        )
+    return pd.DataFrame(results).sort_values("train_end", ignore_index=True)
+
+
+# ---------------------------------------------------------------------------
+# script entry point
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbol", default="QQQ")
+    p.add_argument("--lookback", type=int, default=252, help="days of history (≈1y)")
+    p.add_argument("--horizon", type=int, default=22, help="days ahead (≈1mo)")
+    p.add_argument("--years", type=int, default=2, help="initial training span")
+    p.add_argument("--alpha", type=float, default=1.0)
+    p.add_argument("--scaler", choices=["expanding", "fixed"], default="expanding")
+    p.add_argument("--workers", type=int, default=None, help="default: os.cpu_count()")
+    p.add_argument("--no-resume", action="store_true", help="ignore cached folds")
+    p.add_argument("--price-cache", action="store_true", help="load prices via the local Arrow cache")
+    args = p.parse_args()
+
+    folds = walk_forward(args.symbol, args.lookback, args.horizon, args.years, args.alpha,
+                         args.scaler, args.workers, resume=not args.no_resume,
+                         price_cache=args.price_cache)
+    pd.set_option("display.max_rows", None)
+    print(folds)
+    print(f"\n=== {args.symbol} | folds={len(folds)} | "
+          f"MAE={folds['mae'].mean():.5f} | RMSE={folds['rmse'].mean():.5f} ===")
@@ -0,0 +1,71 @@
+"""
+bench_build_dataset.py
+----------------------
+model_learn.build_dataset (stride view) vs 기존 iloc 루프 버전 비교.
+
+    python bench/bench_build_dataset.py --years 10 --lookback 252 --horizon 22
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+AI_DIR = Path(__file__).resolve().parents[1] / "AI"
+if str(AI_DIR) not in sys.path:
+    sys.path.append(str(AI_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+from model_learn import FEATS, build_dataset, iter_dataset  # noqa: E402
+
+
+# ── 기존 구현 (비교 기준) ─────────────────────────────────────────
+def build_dataset_loop(df: pd.DataFrame, lookback: int, horizon: int):
+    X_lst, y_lst, date_lst = [], [], []
+    for i in range(lookback, len(df) - horizon):
+        window = df.iloc[i - lookback : i][FEATS].values.flatten()
+        pct_change = (
+            df.iloc[i + horizon]["close"] - df.iloc[i]["close"]
+        ) / df.iloc[i]["close"]
+        X_lst.append(window)
+        y_lst.append(pct_change)
+        date_lst.append(df.index[i])
+    return np.array(X_lst), np.array(y_lst), date_lst
+
+
+def synthetic_frame(days: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2015-01-01", periods=days, name="date")
+    data = rng.standard_normal((days, len(FEATS))) + 3.0   # close 가 0 근처로 가지 않게
+    return pd.DataFrame(data, columns=FEATS, index=idx)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--years", type=int, default=10)
+    p.add_argument("--lookback", type=int, default=252)
+    p.add_argument("--horizon", type=int, default=22)
+    args = p.parse_args()
+
+    df = synthetic_frame(args.years * 252)
+
+    (X0, y0, d0), t_loop = timed(build_dataset_loop, df, args.lookback, args.horizon)
+    (X1, y1, d1), t_vec = timed(build_dataset, df, args.lookback, args.horizon)
+    _, t_chunk = timed(lambda: sum(len(c[0]) for c in iter_dataset(df, args.lookback, args.horizon)))
+
+    assert X0.shape == X1.shape and np.array_equal(X0, X1)
+    assert np.allclose(y0, y1) and d0 == d1
+
+    print(f"rows={len(df)}  samples={len(X1)}  features={X1.shape[1]}")
+    print(f"loop        : {t_loop * 1e3:9.1f} ms")
+    print(f"stride view : {t_vec * 1e3:9.1f} ms  (x{t_loop / t_vec:,.0f})")
+    print(f"f32 chunks  : {t_chunk * 1e3:9.1f} ms  (materialized {X1.shape[0] * X1.shape[1] * 4 / 2**20:,.0f} MiB)")
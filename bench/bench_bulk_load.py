@@ -0,0 +1,84 @@
+"""
+bench_bulk_load.py
+------------------
+DailyPrice 적재: data_fetch.save_to_db (ORM bulk_create) vs bulk_loader.bulk_load
+(staging + COPY/ON CONFLICT). 설정된 DB 에 합성 종목(BO####, BC####)을 넣고 측정 후 지운다.
+
+    python bench/bench_bulk_load.py --rows 1000000 --batch-size 100000
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+HISTORY_DIR = Path(__file__).resolve().parents[1] / "history"
+if str(HISTORY_DIR) not in sys.path:
+    sys.path.append(str(HISTORY_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+from bulk_loader import bulk_load, upsert  # noqa: E402
+from data_fetch import save_to_db  # noqa: E402
+from core.models import DailyPrice  # noqa: E402
+
+DAYS = 2500                                     # 종목당 ≈10년
+
+
+def synthetic_rows(rows: int, prefix: str, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n_sym = max(1, rows // DAYS)
+    dates = pd.bdate_range(end="2025-05-01", periods=DAYS)
+    df = pd.DataFrame({
+        "symbol": np.repeat([f"{prefix}{k:04d}" for k in range(n_sym)], DAYS),
+        "date": np.tile(dates, n_sym),
+    })
+    price = rng.random(len(df)) * 100 + 1
+    df["open"], df["high"], df["low"], df["close"] = price, price * 1.01, price * 0.99, price
+    df["volume"] = rng.integers(1e5, 1e7, len(df))
+    return df.iloc[:rows]
+
+
+def cleanup(prefix: str):
+    DailyPrice.objects.filter(symbol__startswith=prefix).delete()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--batch-size", type=int, default=100_000)
+    args = p.parse_args()
+
+    try:
+        df = synthetic_rows(args.rows, "BO")
+        t0 = time.perf_counter()
+        save_to_db(df)
+        t_orm = time.perf_counter() - t0
+
+        df = synthetic_rows(args.rows, "BC")
+        t0 = time.perf_counter()
+        n = bulk_load(df, args.batch_size)
+        t_bulk = time.perf_counter() - t0
+        assert n == len(df)
+
+        t0 = time.perf_counter()
+        n_dup = bulk_load(df, args.batch_size)          # 전부 중복 → 0 행
+        t_dup = time.perf_counter() - t0
+        assert n_dup == 0
+
+        df.loc[df.index[::100], "close"] *= 0.5         # 1% 행 수정주가 반영
+        t0 = time.perf_counter()
+        stats = upsert(df, args.batch_size)
+        t_up = time.perf_counter() - t0
+        assert stats["updated"] == len(df.index[::100])
+    finally:
+        cleanup("BO")
+        cleanup("BC")
+
+    print(f"rows={len(df):,}  batch={args.batch_size:,}")
+    print(f"bulk_create (ORM)   : {t_orm:8.2f} s  ({len(df) / t_orm:,.0f} rows/s)")
+    print(f"bulk_load           : {t_bulk:8.2f} s  ({len(df) / t_bulk:,.0f} rows/s, x{t_orm / t_bulk:.1f})")
+    print(f"bulk_load (all dup) : {t_dup:8.2f} s")
+    print(f"upsert (1% revised) : {t_up:8.2f} s  {stats}")
@@ -0,0 +1,87 @@
+"""
+bench_compact_prices.py
+-----------------------
+load_window 형태의 range scan: DailyPrice(float, varchar symbol) vs DailyBar
+(smallint symbol_id, int 가격, PK 하나). DB 에 있는 종목으로 측정한다.
+PostgreSQL 이면 두 테이블의 heap / index 크기도 같이 출력.
+
+    python bench/bench_compact_prices.py --symbols QQQ SPY --repeat 5
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+AI_DIR = Path(__file__).resolve().parents[1] / "AI"
+if str(AI_DIR) not in sys.path:
+    sys.path.append(str(AI_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+from normalization import window_range  # noqa: E402  (django.setup)
+from django.db import connection  # noqa: E402
+from django.db.models import Min  # noqa: E402
+from core import price_store  # noqa: E402
+from core.models import DailyBar, DailyPrice  # noqa: E402
+
+
+def load_dailyprice(symbol, start, end):
+    qs = (
+        DailyPrice.objects.filter(symbol=symbol, date__range=(start, end))
+        .values("date", "open", "high", "low", "close", "volume")
+        .order_by("date")
+    )
+    return pd.DataFrame.from_records(qs).set_index("date")
+
+
+def timed(fn, ranges, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for sym, (start, end) in ranges.items():
+            fn(sym, start, end)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def table_sizes():
+    if connection.vendor != "postgresql":
+        return {}
+    out = {}
+    with connection.cursor() as cur:
+        for model in (DailyPrice, DailyBar):
+            t = model._meta.db_table
+            cur.execute(
+                "SELECT COALESCE(SUM(pg_table_size(c.oid)), 0), COALESCE(SUM(pg_indexes_size(c.oid)), 0) "
+                "FROM pg_class c WHERE c.relname = %s OR c.relname LIKE %s", [t, f"{t}\\_y%"]
+            )
+            out[t] = cur.fetchone()
+    return out
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="+", default=["QQQ"])
+    p.add_argument("--years", type=int, default=2)
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args()
+
+    print(f"synced {price_store.sync(args.symbols)} rows into DailyBar")
+    firsts = DailyPrice.objects.filter(symbol__in=args.symbols).values("symbol").annotate(first=Min("date"))
+    ranges = {r["symbol"]: window_range(r["first"], args.years) for r in firsts}
+
+    for sym, (start, end) in ranges.items():
+        a, b = load_dailyprice(sym, start, end), price_store.load_range(sym, start, end)
+        assert list(a.index) == list(b.index)
+        assert np.allclose(a[["open", "high", "low", "close"]], b[["open", "high", "low", "close"]], atol=1e-4)
+
+    t_old = timed(load_dailyprice, ranges, args.repeat)
+    t_new = timed(price_store.load_range, ranges, args.repeat)
+    print(f"symbols={len(ranges)}  years={args.years}")
+    print(f"DailyPrice range scan : {t_old * 1e3:8.1f} ms")
+    print(f"DailyBar range scan   : {t_new * 1e3:8.1f} ms  (x{t_old / t_new:.1f})")
+    for table, (heap, index) in table_sizes().items():
+        print(f"{table:<20} heap {heap / 2**20:8.1f} MiB  index {index / 2**20:8.1f} MiB")
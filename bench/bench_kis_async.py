@@ -0,0 +1,83 @@
+"""
+bench_kis_async.py
+------------------
+종목 N개 현재가: kis_domstk 동기 호출을 차례로 (N × RTT) vs kis_domstk_async 동시 호출.
+가짜 KIS REST 서버(fake_kis_rest)에 응답 지연(--delay)과 초당 한도(--rate)를 걸고 잰다.
+시작 전에 비동기 메서드마다 동기 함수와 같은 DataFrame 을 돌려주는지 확인한다.
+
+    python bench/bench_kis_async.py --symbols 100 --delay 0.05
+    python bench/bench_kis_async.py --symbols 100 --delay 0.05 --rate 20   # 한도 안에서 처리량
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+COLLECTOR_DIR = Path(__file__).resolve().parents[1] / "collector"
+if str(COLLECTOR_DIR) not in sys.path:
+    sys.path.append(str(COLLECTOR_DIR))
+
+from fake_kis_rest import FakeKISRest  # noqa: E402
+
+MIRRORED = [
+    ("get_inquire_price", {}),
+    ("get_inquire_daily_price", {}),
+    ("get_inquire_asking_price_exp_ccn", {"output_dv": "1"}),
+    ("get_inquire_asking_price_exp_ccn", {"output_dv": "2"}),
+    ("get_inquire_daily_itemchartprice", {"output_dv": "2", "inqr_end_dt": "20250530"}),
+    ("get_inquire_time_itemchartprice", {"output_dv": "2", "inqr_hour": "120000"}),
+]
+
+
+async def check_parity(kb, kba):
+    async with kba.AsyncKIS() as api:
+        for name, kw in MIRRORED:
+            want = getattr(kb, name)(itm_no="005930", **kw)
+            got = await getattr(api, name)(itm_no="005930", **kw)
+            assert want.equals(got), name
+    print(f"parity: {len(MIRRORED)} methods match kis_domstk")
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", type=int, default=100)
+    p.add_argument("--delay", type=float, default=0.05, help="fake server latency per response")
+    p.add_argument("--rate", type=float, default=0, help="quota requests/sec (0 = unlimited)")
+    p.add_argument("--concurrency", type=int, default=16)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = FakeKISRest(delay=args.delay, rate=args.rate).start()
+        os.environ.update({
+            "KIS_TOKEN_DIR": tmp, "KIS_MODE": "real", "KIS_RATE_REAL": str(args.rate),
+            "APP_KEY_REAL": "k", "APP_SECRET_REAL": "s", "KIS_API_REAL": server.url, "KIS_ACCT_REAL": "0",
+        })
+        import kis_auth as ka
+        import kis_domstk as kb
+        import kis_domstk_async as kba
+        ka.auth(force=True)
+
+        asyncio.run(check_parity(kb, kba))
+        codes = [f"{i:06d}" for i in range(args.symbols)]
+        time.sleep(1.1)                                 # 서버 1초 창 비우기
+
+        t0 = time.perf_counter()
+        sync = {c: kb.get_inquire_price(itm_no=c) for c in codes}
+        t_sync = time.perf_counter() - t0
+        time.sleep(1.1)
+
+        limited = server.limited
+        t0 = time.perf_counter()
+        fanned = kba.fetch_many("get_inquire_price", codes, concurrency=args.concurrency)
+        t_async = time.perf_counter() - t0
+        server.stop()
+
+    same = all(fanned[c] is not None and fanned[c].equals(sync[c]) for c in codes)
+    print(f"symbols={args.symbols} delay={args.delay}s quota={args.rate or 'none'} concurrency={args.concurrency}")
+    print(f"sync sequential : {t_sync:6.2f}s  ({args.symbols / t_sync:6.1f} req/s)")
+    print(f"async fan-out   : {t_async:6.2f}s  ({args.symbols / t_async:6.1f} req/s)  x{t_sync / t_async:.1f}  "
+          f"same={same}  EGW00201 {server.limited - limited}")
+    print(f"rate_stats      : {ka.rate_stats()}")
@@ -0,0 +1,98 @@
+"""
+bench_kis_http.py
+-----------------
+kis_auth._url_fetch 호출당 지연: 호출마다 requests.get (새 TCP+TLS) vs 공유 keep-alive 연결 풀 (KIS_HTTP_POOL).
+가짜 KIS REST 서버(fake_kis_rest, 자체서명 HTTPS)를 띄우고 get_inquire_price 를 --calls 번 호출한다.
+
+    python bench/bench_kis_http.py --calls 300 --threads 8
+    KIS_HTTP_POOL=4 python bench/bench_kis_http.py --threads 16     # 연결 수는 풀 크기로 제한
+"""
+import argparse
+import copy
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+COLLECTOR_DIR = Path(__file__).resolve().parents[1] / "collector"
+if str(COLLECTOR_DIR) not in sys.path:
+    sys.path.append(str(COLLECTOR_DIR))
+
+from fake_kis_rest import FakeKISRest  # noqa: E402
+
+
+def self_signed(tmp: str):
+    cert, key = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-keyout", key, "-out", cert, "-subj", "/CN=127.0.0.1",
+         "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+def legacy_fetch(ka, api_path, tr_id, params):
+    """변경 전 _url_fetch 와 같은 경로 (deepcopy 헤더 + 모듈 수준 requests.get)"""
+    hdr = copy.deepcopy(ka._BASE_HEADERS)
+    hdr.update({"tr_id": tr_id, "tr_cont": "", "custtype": "P"})
+    return ka.APIRespCompat(requests.get(f"{ka._TRENV.url}{api_path}", headers=hdr, params=params))
+
+
+def run(fn, codes, threads):
+    t0 = time.perf_counter()
+    if threads == 1:
+        for c in codes:
+            fn(c)
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(fn, codes))
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--calls", type=int, default=300)
+    p.add_argument("--threads", type=int, default=8)
+    p.add_argument("--delay", type=float, default=0.0, help="fake server latency per response")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = self_signed(tmp)
+        server = FakeKISRest(delay=args.delay, certfile=cert, keyfile=key).start()
+        os.environ.update({
+            "REQUESTS_CA_BUNDLE": cert, "KIS_TOKEN_DIR": tmp, "KIS_MODE": "real",
+            "APP_KEY_REAL": "k", "APP_SECRET_REAL": "s", "KIS_API_REAL": server.url, "KIS_ACCT_REAL": "0",
+            "KIS_RATE_REAL": "0",                # 연결 비용만 재려고 호출 한도는 끔
+        })
+        import kis_auth as ka
+        import kis_domstk as kb
+        ka.auth(force=True)
+
+        codes = [f"{i % 1000:06d}" for i in range(args.calls)]
+        path, tr_id = "/uapi/domestic-stock/v1/quotations/inquire-price", "FHKST01010100"
+        old = lambda c: legacy_fetch(ka, path, tr_id, {"FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": c})
+        new = lambda c: kb.get_inquire_price(itm_no=c)
+
+        rows = []
+        for threads in sorted({1, args.threads}):
+            conns = server.connections
+            t_old = run(old, codes, threads)
+            c_old = server.connections - conns
+            conns = server.connections
+            ka.latency_stats(reset=True)
+            t_new = run(new, codes, threads)
+            c_new = server.connections - conns
+            rows.append((threads, t_old, c_old, t_new, c_new, ka.latency_stats()[tr_id]))
+        server.stop()
+
+    print(f"calls={args.calls}  (https, self-signed, delay={args.delay}s)")
+    for threads, t_old, c_old, t_new, c_new, lat in rows:
+        print(f"threads={threads:<2} per-call requests.get : {t_old / args.calls * 1e3:7.2f} ms/call  connections {c_old}")
+        print(f"           pooled session      : {t_new / args.calls * 1e3:7.2f} ms/call  connections {c_new}  (x{t_old / t_new:.1f})")
+        print(f"           latency_stats       : {lat}")
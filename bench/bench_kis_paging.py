@@ -0,0 +1,90 @@
+"""
+bench_kis_paging.py
+-------------------
+kis_domstk 연속조회: 예전 재귀 + 페이지마다 pd.concat vs iter_pages/collect_pages (DataFrame 한 번 생성).
+가짜 KIS REST 서버(fake_kis_rest)가 잔고조회(get_inquire_balance_lst)를 --pages 쪽으로 나눠 준다.
+
+    python bench/bench_kis_paging.py --pages 200 --per-page 100
+    python bench/bench_kis_paging.py --pages 1500                  # 재귀 한도 확인
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+COLLECTOR_DIR = Path(__file__).resolve().parents[1] / "collector"
+if str(COLLECTOR_DIR) not in sys.path:
+    sys.path.append(str(COLLECTOR_DIR))
+
+from fake_kis_rest import FakeKISRest  # noqa: E402
+
+URL = '/uapi/domestic-stock/v1/trading/inquire-balance'
+
+
+def legacy_balance_lst(ka, tr_cont="", FK100="", NK100="", dataframe=None):
+    """변경 전 get_inquire_balance_lst 와 같은 흐름 (페이지마다 concat + 자기 호출)"""
+    params = {"CANO": "0", "ACNT_PRDT_CD": "01", "CTX_AREA_FK100": FK100, "CTX_AREA_NK100": NK100}
+    res = ka._url_fetch(URL, "TTTC8434R", tr_cont, params)
+    current_data = pd.DataFrame(res.getBody().output1)
+    dataframe = current_data if dataframe is None else pd.concat([dataframe, current_data], ignore_index=True)
+    tr_cont, FK100, NK100 = res.getHeader().tr_cont, res.getBody().ctx_area_fk100, res.getBody().ctx_area_nk100
+    if tr_cont in ("D", "E"):
+        return dataframe
+    return legacy_balance_lst(ka, "N", FK100, NK100, dataframe)
+
+
+async def async_pages(kba):
+    rows = []
+    async with kba.AsyncKIS() as api:
+        async for records in api.iter_pages(URL, "TTTC8434R", {"CTX_AREA_FK100": "", "CTX_AREA_NK100": ""}):
+            rows.extend(records)
+    return pd.DataFrame(rows)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    try:
+        out = fn()
+    except RecursionError:
+        return None, time.perf_counter() - t0
+    return out, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--pages", type=int, default=200)
+    p.add_argument("--per-page", type=int, default=100)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = FakeKISRest(pages=args.pages, per_page=args.per_page).start()
+        os.environ.update({
+            "KIS_TOKEN_DIR": tmp, "KIS_MODE": "real", "KIS_RATE_REAL": "0",
+            "APP_KEY_REAL": "k", "APP_SECRET_REAL": "s", "KIS_API_REAL": server.url, "KIS_ACCT_REAL": "0",
+        })
+        import kis_auth as ka
+        import kis_domstk as kb
+        import kis_domstk_async as kba
+        ka.auth(force=True)
+
+        old, t_old = timed(lambda: legacy_balance_lst(ka))
+        new, t_new = timed(kb.get_inquire_balance_lst)
+        anew, t_async = timed(lambda: asyncio.run(async_pages(kba)))
+
+        sent = server.requests
+        cutoff = f"{args.pages // 10:04d}"          # 앞 10% 페이지에서 멈춤
+        early, t_early = timed(lambda: kb.get_inquire_balance_lst(stop=lambda rows: rows[-1]["odno"] >= cutoff))
+        early_requests = server.requests - sent
+        server.stop()
+
+    rows = args.pages * args.per_page
+    print(f"pages={args.pages} per_page={args.per_page} rows={rows}")
+    print(f"recursive concat : {'RecursionError' if old is None else f'{t_old:6.2f}s'}")
+    print(f"iter_pages       : {t_new:6.2f}s  rows={len(new)}  same={old is None or new.equals(old)}")
+    print(f"async iter_pages : {t_async:6.2f}s  rows={len(anew)}  same={anew.equals(new)}")
+    print(f"early stop       : {t_early:6.2f}s  rows={len(early)}  requests={early_requests}")
@@ -0,0 +1,98 @@
+"""
+bench_kis_rate.py
+-----------------
+kis_auth 호출 스케줄러 확인: 초당 한도가 있는 가짜 KIS REST 서버(fake_kis_rest --rate)에
+여러 스레드가 시세 조회를 몰아 보내는 동안 주문(POST)을 섞어 넣는다.
+
+- 제한 없음 : 스케줄러를 끄고 그대로 보냄 → EGW00201 이 얼마나 나오는지
+- 스케줄러  : 초당 한도에 맞춰 보냄 → EGW00201 0건, 처리량이 한도에 붙는지, 주문 대기 시간
+
+    python bench/bench_kis_rate.py --rate 20 --calls 200 --threads 16
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+COLLECTOR_DIR = Path(__file__).resolve().parents[1] / "collector"
+if str(COLLECTOR_DIR) not in sys.path:
+    sys.path.append(str(COLLECTOR_DIR))
+
+from fake_kis_rest import FakeKISRest  # noqa: E402
+from kis_rate import RateScheduler  # noqa: E402
+
+ORDER_PATH = "/uapi/domestic-stock/v1/trading/order-cash"
+
+
+def run(ka, kb, server, calls: int, threads: int, orders: int):
+    codes = [f"{i % 1000:06d}" for i in range(calls)]
+    limited, sent = server.limited, server.requests
+    order_waits = []
+
+    def place_orders():
+        for _ in range(orders):
+            time.sleep(calls / max(ka._SCHED.rate or 20, 1) / (orders + 1))
+            t = time.perf_counter()
+            ka._url_fetch(ORDER_PATH, "TTTC0802U", "", {"PDNO": "005930", "ORD_QTY": "1"}, post=True)
+            order_waits.append(time.perf_counter() - t)
+
+    def quote(code):
+        try:
+            return kb.get_inquire_price(itm_no=code)
+        except AttributeError:                          # 오류 응답엔 output 이 없음
+            return None
+
+    t0 = time.perf_counter()
+    orderer = threading.Thread(target=place_orders)
+    orderer.start()
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(quote, codes))
+    orderer.join()
+    elapsed = time.perf_counter() - t0
+    failed = sum(r is None for r in results)
+    return {
+        "elapsed": elapsed,
+        "throughput": (server.requests - sent) / elapsed,
+        "limited": server.limited - limited,
+        "failed": failed,
+        "order_ms": max(order_waits, default=0) * 1e3,
+    }
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--rate", type=float, default=20, help="fake server quota (requests/sec)")
+    p.add_argument("--calls", type=int, default=200)
+    p.add_argument("--threads", type=int, default=16)
+    p.add_argument("--orders", type=int, default=5)
+    p.add_argument("--delay", type=float, default=0.01)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = FakeKISRest(delay=args.delay, rate=args.rate).start()
+        os.environ.update({
+            "KIS_TOKEN_DIR": tmp, "KIS_MODE": "real", "KIS_RATE_REAL": str(args.rate),
+            "APP_KEY_REAL": "k", "APP_SECRET_REAL": "s", "KIS_API_REAL": server.url, "KIS_ACCT_REAL": "0",
+        })
+        import kis_auth as ka
+        import kis_domstk as kb
+        ka.auth(force=True)
+
+        sched = ka._SCHED
+        ka._SCHED = RateScheduler(0)                    # 제한 없음
+        time.sleep(1.1)
+        free = run(ka, kb, server, args.calls, args.threads, args.orders)
+        ka._SCHED = sched
+        time.sleep(1.1)                                 # 서버 1초 창 비우기
+        paced = run(ka, kb, server, args.calls, args.threads, args.orders)
+        server.stop()
+
+    print(f"calls={args.calls} threads={args.threads} orders={args.orders}  quota={args.rate}/s")
+    for name, r in (("no limiter", free), ("scheduler", paced)):
+        print(f"{name:<11}: {r['elapsed']:6.2f}s  {r['throughput']:5.1f} req/s  "
+              f"EGW00201 {r['limited']:4d}  failed {r['failed']:4d}  max order wait {r['order_ms']:6.1f} ms")
+    print(f"rate_stats : {ka.rate_stats()}")
@@ -0,0 +1,120 @@
+"""
+bench_kis_resp.py
+-----------------
+kis_auth 응답 래퍼: 예전 방식(응답마다 body/header namedtuple 클래스 생성) vs 현재 APIRespCompat
+(__slots__ + dict 속성 접근, header 는 필요할 때만). 일봉 100건 응답으로 잰다.
+JSON 파싱은 두 방식이 같으므로 resp.json() 이 미리 파싱한 dict 를 돌려주게 해 래퍼 비용만 잰다.
+출력 배열 → DataFrame: pd.DataFrame(list[dict]) + 문자열 그대로 vs APIResp.frame() (컬럼 단위 + 숫자 변환)
+
+    python bench/bench_kis_resp.py --n 20000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from pathlib import Path
+
+import pandas as pd
+import requests
+from requests.structures import CaseInsensitiveDict
+
+COLLECTOR_DIR = Path(__file__).resolve().parents[1] / "collector"
+if str(COLLECTOR_DIR) not in sys.path:
+    sys.path.append(str(COLLECTOR_DIR))
+
+
+def make_response(rows: int) -> requests.Response:
+    out = [{"stck_bsop_date": f"2025{(i % 12) + 1:02d}{(i % 28) + 1:02d}", "stck_clpr": str(70_000 + i),
+            "stck_oprc": str(69_900 + i), "stck_hgpr": str(70_500 + i), "stck_lwpr": str(69_500 + i),
+            "acml_vol": str(1_000_000 + i), "acml_tr_pbmn": str(70_000_000_000 + i), "flng_cls_code": "00",
+            "prtt_rate": "0.00", "mod_yn": "N", "prdy_vrss_sign": "2", "prdy_vrss": str(i)} for i in range(rows)]
+    body = {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다.",
+            "output1": {"stck_prpr": "70000", "hts_kor_isnm": "삼성전자", "stck_shrn_iscd": "005930"},
+            "output2": out}
+    r = requests.Response()
+    r.status_code = 200
+    r._content = json.dumps(body).encode()
+    r.encoding = "utf-8"
+    r.headers = CaseInsensitiveDict({"Content-Type": "application/json; charset=UTF-8", "tr_id": "FHKST03010100",
+                                     "tr_cont": "D", "gt_uid": "x" * 32, "Date": "Mon, 02 Jun 2025 00:00:00 GMT",
+                                     "Connection": "keep-alive", "Content-Length": str(len(r._content))})
+    return r
+
+
+class LegacyResp:
+    """변경 전 APIRespCompat 과 같은 동작"""
+    def __init__(self, resp):
+        self._resp = resp
+        self._json = resp.json()
+        self._body = namedtuple("body", self._json.keys())(**self._json)
+
+    def getBody(self):
+        return self._body
+
+    def getHeader(self):
+        sanitized = {k.lower().replace("-", "_"): v for k, v in self._resp.headers.items()}
+        return namedtuple("header", sanitized.keys())(*sanitized.values())
+
+
+def run(cls, resp, n):
+    gc.collect()                                    # 앞 측정이 남긴 순환 참조(namedtuple 클래스) 정리
+    t0 = time.perf_counter()
+    for _ in range(n):
+        res = cls(resp)
+        res.getBody().output2
+        res.getHeader().tr_cont
+    return time.perf_counter() - t0
+
+
+def peak_memory(cls, resp, n):
+    gc.collect()
+    tracemalloc.start()
+    run(cls, resp, n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--n", type=int, default=20000)
+    p.add_argument("--rows", type=int, default=100)
+    args = p.parse_args()
+
+    os.environ.update({"KIS_TOKEN_DIR": tempfile.mkdtemp(), "APP_KEY_REAL": "k", "APP_SECRET_REAL": "s",
+                       "KIS_API_REAL": "http://127.0.0.1", "KIS_ACCT_REAL": "0", "KIS_MODE": "real"})
+    import kis_auth as ka
+
+    resp = make_response(args.rows)
+    t0 = time.perf_counter()
+    for _ in range(args.n):
+        body = resp.json()
+    t_json = time.perf_counter() - t0
+    resp.json = lambda **kw: body                   # 이후 측정은 파싱된 dict 재사용 (래퍼 비용만)
+
+    t_new = min(run(ka.APIRespCompat, resp, args.n) for _ in range(5))
+    t_old = min(run(LegacyResp, resp, args.n) for _ in range(5))
+    m_old, m_new = peak_memory(LegacyResp, resp, 2000), peak_memory(ka.APIRespCompat, resp, 2000)
+    us = lambda t: t / args.n * 1e6
+
+    res = ka.APIRespCompat(resp)
+    t0 = time.perf_counter()
+    for _ in range(2000):
+        df_old = pd.DataFrame(res.getBody().output2)
+    t_df_old = (time.perf_counter() - t0) / 2000
+    t0 = time.perf_counter()
+    for _ in range(2000):
+        df_new = res.frame("output2")
+    t_df_new = (time.perf_counter() - t0) / 2000
+
+    print(f"responses={args.n} rows={args.rows}  (json parse {t_json / args.n * 1e6:.1f} us/resp, not included below)")
+    print(f"namedtuple per response : {us(t_old):7.1f} us/resp  peak {m_old / 1e3:7.1f} KB (2000 resp)")
+    print(f"slots wrapper           : {us(t_new):7.1f} us/resp  peak {m_new / 1e3:7.1f} KB (2000 resp)  (x{us(t_old) / us(t_new):.1f})")
+    print(f"pd.DataFrame(list) str  : {t_df_old * 1e6:7.1f} us/frame")
+    print(f"APIResp.frame numeric   : {t_df_new * 1e6:7.1f} us/frame")
+    print(df_new.dtypes.value_counts().to_dict())
@@ -0,0 +1,105 @@
+"""
+bench_predict_many.py
+---------------------
+predict.main 의 원래 종목별 연산 경로(normalize → prepare_features → model.predict)
+를 500 종목에 대해 반복하는 것과 predict_frames 한 번을 비교.
+저장된 scaler 를 쓰는 지금의 main 경로(transform_tail)도 같이 잰다.
+DB 왕복은 제외한 순수 연산 비교 (main 은 종목마다 쿼리 2회가 추가로 든다).
+
+    python bench/bench_predict_many.py --symbols 500 --lookback 252
+"""
+import argparse
+import contextlib
+import copy
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import StandardScaler
+
+AI_DIR = Path(__file__).resolve().parents[1] / "AI"
+if str(AI_DIR) not in sys.path:
+    sys.path.append(str(AI_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+from model_learn import FEATS  # noqa: E402
+from predict import predict_frames, prepare_features  # noqa: E402
+from normalization import OnlineScaler, normalize, transform_tail  # noqa: E402
+
+
+def synthetic_universe(n: int, lookback: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end="2025-05-01", periods=lookback + 50, name="date")
+    base = Ridge().fit(rng.standard_normal((8, 5 * lookback)), rng.standard_normal(8))
+
+    frames, models = {}, {}
+    for k in range(n):
+        sym = f"S{k:04d}"
+        df = pd.DataFrame(rng.random((len(idx), len(FEATS))) * 100 + 1, columns=FEATS, index=idx)
+        df["volume"] = rng.integers(1e5, 1e7, len(idx))
+        model = copy.copy(base)
+        model.coef_ = rng.standard_normal(5 * lookback) * 1e-3
+        model.intercept_ = float(rng.standard_normal())
+        feats = df[FEATS].copy()
+        feats["volume"] = np.log1p(feats["volume"])
+        frames[sym] = df
+        models[sym] = {"model": model, "scaler": StandardScaler().fit(feats), "lookback": lookback}
+    return frames, models
+
+
+def loop_main_path(frames, models, lookback):
+    """변경 전 predict.main: 호출마다 scaler 를 다시 맞춘다"""
+    out = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for sym, df in frames.items():
+            norm_df, _ = normalize(df.rename_axis("date"))
+            norm_df.set_index("date", inplace=True)
+            x = prepare_features(norm_df, lookback)
+            out[sym] = models[sym]["model"].predict(x)[0]
+    return out
+
+
+def loop_saved_scaler(frames, models, lookback):
+    """지금의 predict.main: 저장된 scaler 로 마지막 lookback 행만 변환"""
+    out = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for sym, df in frames.items():
+            scaler = OnlineScaler.from_model(models[sym])
+            x = transform_tail(df, scaler, lookback).reshape(1, -1)
+            out[sym] = models[sym]["model"].predict(x)[0]
+    return out
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", type=int, default=500)
+    p.add_argument("--lookback", type=int, default=252)
+    args = p.parse_args()
+
+    frames, models = synthetic_universe(args.symbols, args.lookback)
+
+    t0 = time.perf_counter()
+    loop_main_path(frames, models, args.lookback)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    loop_saved_scaler(frames, models, args.lookback)
+    t_saved = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = predict_frames(frames, models, args.lookback)
+    t_batch = time.perf_counter() - t0
+
+    ref = loop_saved_scaler(dict([next(iter(frames.items()))]), models, args.lookback)
+    sym, val = next(iter(ref.items()))
+    assert np.isclose(result.loc[sym, "pred"], val)
+
+    print(f"symbols={len(result)}  lookback={args.lookback}")
+    print(f"loop (main path)    : {t_loop * 1e3:9.1f} ms")
+    print(f"loop (saved scaler) : {t_saved * 1e3:9.1f} ms  (x{t_loop / t_saved:,.1f})")
+    print(f"predict_frames      : {t_batch * 1e3:9.1f} ms  (x{t_loop / t_batch:,.0f})")
@@ -0,0 +1,64 @@
+"""
+bench_price_cache.py
+--------------------
+DailyPrice 전체 기간 로드: ORM(normalization.load_history) vs 로컬 Arrow 캐시
+(price_cache.load_history / load_arrays) 비교. DB 에 이미 있는 종목으로 측정한다.
+
+    python bench/bench_price_cache.py --symbols QQQ SPY AAPL --repeat 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+AI_DIR = Path(__file__).resolve().parents[1] / "AI"
+if str(AI_DIR) not in sys.path:
+    sys.path.append(str(AI_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+import price_cache  # noqa: E402
+from normalization import load_history  # noqa: E402
+
+
+def timed(fn, symbols, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for sym in symbols:
+            fn(sym)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="+", default=["QQQ"])
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        added = price_cache.refresh(args.symbols, tmp)
+        t_build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        price_cache.refresh(args.symbols, tmp)
+        t_noop = time.perf_counter() - t0
+
+        for sym in args.symbols:
+            a, b = load_history(sym), price_cache.load_history(sym, tmp)
+            assert list(a.index) == list(b.index) and np.allclose(a.to_numpy(float), b.to_numpy(float))
+
+        t_orm = timed(load_history, args.symbols, args.repeat)
+        t_df = timed(lambda s: price_cache.load_history(s, tmp), args.symbols, args.repeat)
+        t_np = timed(lambda s: price_cache.load_arrays(s, cache_dir=tmp), args.symbols, args.repeat)
+
+    print(f"symbols={len(args.symbols)}  rows={sum(added.values()):,}")
+    print(f"cache build       : {t_build * 1e3:9.1f} ms")
+    print(f"refresh (no new)  : {t_noop * 1e3:9.1f} ms")
+    print(f"ORM load_history  : {t_orm * 1e3:9.1f} ms")
+    print(f"cache DataFrame   : {t_df * 1e3:9.1f} ms  (x{t_orm / t_df:,.0f})")
+    print(f"cache load_arrays : {t_np * 1e3:9.1f} ms  (x{t_orm / t_np:,.0f})")
@@ -0,0 +1,103 @@
+"""
+bench_ws_collectors.py
+----------------------
+실시간 수집기 CPU 비교: kis_ws_subscriptions(websocket-client, 세션마다 스레드)
+vs kis_ws_async(asyncio, 루프 하나). 가짜 KIS 서버(fake_kis_ws)를 별도 프로세스로 띄우고
+같은 종목/세션 수로 --seconds 동안 받은 프레임 수와 수집 프로세스 CPU 시간을 잰다.
+
+    python bench/bench_ws_collectors.py --symbols 400 --sessions 10 --interval 0.05
+"""
+import argparse
+import asyncio
+import multiprocessing as mp
+import sys
+import time
+from pathlib import Path
+
+COLLECTOR_DIR = Path(__file__).resolve().parents[1] / "collector"
+if str(COLLECTOR_DIR) not in sys.path:
+    sys.path.append(str(COLLECTOR_DIR))
+
+from kis_ws_parser import parse_frame  # noqa: E402
+
+
+def serve(port_q, interval, batch):
+    from fake_kis_ws import FakeKISServer
+    server = FakeKISServer(interval=interval, batch=batch).start()
+    port_q.put(server.url)
+    while True:
+        time.sleep(1)
+
+
+def run_threads(url, codes, sessions, seconds):
+    from kis_ws_subscriptions import SubscriptionManager
+    n = [0]
+
+    def on_data(message):
+        for rec in parse_frame(message).records:
+            rec.stck_prpr
+        n[0] += 1
+
+    mgr = SubscriptionManager([f"k{i}" for i in range(sessions)], url=url, on_data=on_data)
+    mgr.subscribe(codes)
+    mgr.start()
+    mgr.wait_connected()
+    time.sleep(1)
+    c0, f0 = time.process_time(), n[0]
+    time.sleep(seconds)
+    cpu, frames = time.process_time() - c0, n[0] - f0
+    mgr.stop()
+    return frames, cpu
+
+
+async def _run_async(url, codes, sessions, seconds):
+    from kis_ws_async import AsyncCollector
+    collector = AsyncCollector([f"k{i}" for i in range(sessions)], url)
+    await collector.subscribe(codes)
+    q = collector.consumer()
+    n = [0]
+
+    async def consume():
+        while True:
+            frame = await q.get()
+            for rec in frame.records:
+                rec.stck_prpr
+            n[0] += 1
+
+    task = asyncio.create_task(consume())
+    collector.start()
+    await asyncio.sleep(2)
+    c0, f0 = time.process_time(), n[0]
+    await asyncio.sleep(seconds)
+    cpu, frames = time.process_time() - c0, n[0] - f0
+    task.cancel()
+    await collector.stop()
+    return frames, cpu
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", type=int, default=400)
+    p.add_argument("--sessions", type=int, default=10)
+    p.add_argument("--interval", type=float, default=0.05, help="fake server seconds between frames per symbol")
+    p.add_argument("--batch", type=int, default=1, help="records per frame")
+    p.add_argument("--seconds", type=float, default=10)
+    args = p.parse_args()
+
+    q = mp.Queue()
+    server = mp.Process(target=serve, args=(q, args.interval, args.batch), daemon=True)
+    server.start()
+    url = q.get()
+    codes = [f"{i:06d}" for i in range(args.symbols)]
+
+    try:
+        results = {
+            "threads": run_threads(url, codes, args.sessions, args.seconds),
+            "asyncio": asyncio.run(_run_async(url, codes, args.sessions, args.seconds)),
+        }
+    finally:
+        server.terminate()
+
+    print(f"symbols={args.symbols} sessions={args.sessions} seconds={args.seconds}")
+    for name, (frames, cpu) in results.items():
+        print(f"{name:<8}: {frames:8,} frames  cpu {cpu:6.2f} s  ({cpu / max(frames, 1) * 1e6:6.1f} us/frame)")
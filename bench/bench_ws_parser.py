@@ -0,0 +1,108 @@
+"""
+bench_ws_parser.py
+------------------
+H0STCNT0 프레임 파싱 처리량 (단일 코어, frames/sec).
+
+- legacy      : 기존 on_message (message.split("|") → body.split("^")[2])
+                타입 변환 없이 현재가 문자열 하나만 꺼내므로 비교용 상한선
+- frame       : kis_ws_parser.parse_frame + 현재가/체결량 접근
+- frame+all   : parse_frame + 레코드 46개 필드 전부 타입 변환 (values())
+- array       : parse_array 로 --chunk 프레임씩 묶어 structured array 변환 (46개 필드 전부)
+
+    python bench/bench_ws_parser.py --frames 200000 --records 1 3
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+COLLECTOR_DIR = Path(__file__).resolve().parents[1] / "collector"
+if str(COLLECTOR_DIR) not in sys.path:
+    sys.path.append(str(COLLECTOR_DIR))
+
+from kis_ws_parser import FIELDS, parse_array, parse_frame  # noqa: E402
+
+
+def synthetic_record(rng: random.Random) -> list[str]:
+    out = []
+    for name, t in FIELDS:
+        if name == "mksc_shrn_iscd":
+            out.append("005930")
+        elif name.endswith("_hour"):
+            out.append(f"09{rng.randint(0, 59):02d}{rng.randint(0, 59):02d}")
+        elif name == "bsop_date":
+            out.append("20250502")
+        elif t is int:
+            out.append(str(rng.randint(0, 10_000_000)))
+        elif t is float:
+            out.append(f"{rng.random() * 100:.2f}")
+        else:
+            out.append(str(rng.randint(1, 5)))
+    return out
+
+
+def synthetic_frames(n: int, records: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(min(n, 1000)):
+        body = "^".join(v for _ in range(records) for v in synthetic_record(rng))
+        pool.append(f"0|H0STCNT0|{records:03d}|{body}")
+    return [pool[i % len(pool)] for i in range(n)]
+
+
+def legacy(frames):
+    for message in frames:
+        if message.startswith("0|"):
+            parts = message.split("|")
+            if len(parts) >= 4 and parts[1] == "H0STCNT0":
+                int(parts[2])
+                values = parts[3].split("^")
+                values[2]
+
+
+def frame_fields(frames):
+    for message in frames:
+        for rec in parse_frame(message).records:
+            rec.stck_prpr, rec.cntg_vol
+
+
+def frame_all(frames):
+    for message in frames:
+        for rec in parse_frame(message).records:
+            rec.values()
+
+
+def array(frames, chunk):
+    for i in range(0, len(frames), chunk):
+        parse_array(frames[i : i + chunk])
+
+
+def rate(fn, frames, repeat, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(frames, *args)
+        best = min(best, time.perf_counter() - t0)
+    return len(frames) / best
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--frames", type=int, default=200_000)
+    p.add_argument("--records", type=int, nargs="+", default=[1, 3], help="data_cnt per frame")
+    p.add_argument("--chunk", type=int, default=1000, help="frames per parse_array call")
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args()
+
+    for records in args.records:
+        frames = synthetic_frames(args.frames, records)
+        print(f"data_cnt={records}  frames={len(frames):,}")
+        for label, fn, extra in [
+            ("legacy", legacy, ()),
+            ("frame", frame_fields, ()),
+            ("frame+all", frame_all, ()),
+            ("array", array, (args.chunk,)),
+        ]:
+            r = rate(fn, frames, args.repeat, *extra)
+            print(f"  {label:<10}: {r:12,.0f} frames/s  ({r * records:12,.0f} records/s)")
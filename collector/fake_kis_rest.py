@@ -0,0 +1,202 @@
+# collector/fake_kis_rest.py
+"""
+로컬 확인용 가짜 KIS REST 서버 (http.server, HTTP/1.1 keep-alive).
+
+- /oauth2/tokenP, /oauth2/Approval         : 고정 토큰 / approval_key
+- /uapi/domestic-stock/v1/quotations/...   : 종목코드로 결정되는 가짜 시세 (output / output1 / output2)
+- /uapi/domestic-stock/v1/trading/...      : 요청에 CTX_AREA_NK* 가 있으면 연속조회 — pages 쪽 × per_page 건,
+                                              응답 헤더 tr_cont M(다음 있음)/D(마지막), body ctx_area_fk*/nk* 로 다음 페이지
+- 그 외 경로                                 : rt_cd "0" 빈 응답
+- delay  : 응답마다 지연 (게이트웨이 RTT 흉내)
+- rate   : 초당 허용 건수를 넘으면 HTTP 500 + EGW00201 (KIS 유량 초과 응답과 같은 형식)
+- certfile/keyfile 을 주면 HTTPS (핸드셰이크 비용까지 재현)
+
+kis_auth 를 여기로 돌리려면 KIS_API_REAL=<server.url> 과 APP_KEY_REAL 등 환경변수만 맞추면 된다.
+
+    python fake_kis_rest.py --port 9443 --delay 0.02 --rate 20
+"""
+import argparse
+import json
+import random
+import ssl
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+RATE_LIMIT_BODY = {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."}
+
+
+def _price(code: str) -> int:
+    return 10_000 + (sum(map(ord, code)) * 137) % 90_000
+
+
+def quote_body(path: str, q: dict) -> dict:
+    """경로별로 kis_domstk 가 읽는 모양(output / output1 / output2)을 흉내낸 응답"""
+    code = q.get("FID_INPUT_ISCD", ["000000"])[0]
+    price = _price(code)
+    base = {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다."}
+    if path.endswith("/inquire-price"):
+        return {**base, "output": {"stck_prpr": str(price), "prdy_vrss": "100", "prdy_ctrt": "0.50",
+                                   "acml_vol": "123456", "stck_oprc": str(price - 50),
+                                   "stck_hgpr": str(price + 100), "stck_lwpr": str(price - 100)}}
+    if path.endswith("/inquire-daily-itemchartprice") or path.endswith("/inquire-daily-price"):
+        end = datetime.strptime(q.get("FID_INPUT_DATE_2", [datetime.now().strftime("%Y%m%d")])[0] or
+                                datetime.now().strftime("%Y%m%d"), "%Y%m%d")
+        rows = [{"stck_bsop_date": (end - timedelta(days=i)).strftime("%Y%m%d"),
+                 "stck_oprc": str(price - i), "stck_hgpr": str(price + 10 - i),
+                 "stck_lwpr": str(price - 10 - i), "stck_clpr": str(price - i),
+                 "acml_vol": str(10_000 + i)} for i in range(30)]
+        return {**base, "output1": {"stck_prpr": str(price), "hts_kor_isnm": f"종목{code}"},
+                "output2": rows, "output": rows}
+    if path.endswith("/inquire-time-itemchartprice"):
+        hour = q.get("FID_INPUT_HOUR_1", ["153000"])[0] or "153000"
+        t = datetime.strptime(hour, "%H%M%S")
+        rows = [{"stck_bsop_date": datetime.now().strftime("%Y%m%d"),
+                 "stck_cntg_hour": (t - timedelta(minutes=i)).strftime("%H%M%S"),
+                 "stck_prpr": str(price + i), "stck_oprc": str(price + i), "stck_hgpr": str(price + i + 5),
+                 "stck_lwpr": str(price + i - 5), "cntg_vol": str(100 + i)} for i in range(30)]
+        return {**base, "output1": {"stck_prpr": str(price)}, "output2": rows}
+    if path.endswith("/inquire-asking-price-exp-ccn"):
+        book = {f"askp{i}": str(price + i * 10) for i in range(1, 11)}
+        book.update({f"bidp{i}": str(price - i * 10) for i in range(1, 11)})
+        book.update({f"askp_rsqn{i}": str(100 * i) for i in range(1, 11)})
+        book.update({f"bidp_rsqn{i}": str(100 * i) for i in range(1, 11)})
+        return {**base, "output1": book, "output2": {"antc_cnpr": str(price), "stck_prpr": str(price)}}
+    rows = [{"stck_bsop_date": datetime.now().strftime("%Y%m%d"), "stck_prpr": str(price)}]
+    return {**base, "output": rows, "output1": rows, "output2": rows}
+
+
+def page_body(q: dict, pages: int, per_page: int) -> tuple[dict, str]:
+    """연속조회 응답 (body, tr_cont) — NK 값이 다음 페이지 번호"""
+    nk_key = next(k for k in q if k.startswith("CTX_AREA_NK"))
+    size = nk_key[len("CTX_AREA_NK"):]
+    page = int(q[nk_key][0] or 0)
+    rows = [{"odno": f"{page:04d}{i:04d}", "pdno": f"{(page * per_page + i) % 1000:06d}",
+             "ord_qty": str(i + 1), "ord_unpr": str(10_000 + i)} for i in range(per_page)]
+    last = page + 1 >= pages
+    body = {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다.",
+            "output": rows, "output1": rows, "output2": [{"tot_evlu_amt": "0"}],
+            f"ctx_area_fk{size}": "fake-fk", f"ctx_area_nk{size}": "" if last else str(page + 1)}
+    return body, "D" if last else "M"
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128                    # 기본 5 면 동시 접속이 몰릴 때 SYN 재전송(1초)이 생긴다
+
+
+class FakeKISRest:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0,
+                 rate: float = 0.0, certfile: str | None = None, keyfile: str | None = None,
+                 pages: int = 3, per_page: int = 100):
+        self.delay = delay
+        self.rate = rate
+        self.pages = pages                      # 연속조회 페이지 수
+        self.per_page = per_page
+        self.requests = 0
+        self.limited = 0
+        self.connections = 0
+        self._hits = deque()
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"       # keep-alive
+            disable_nagle_algorithm = True      # 헤더/본문 두 번 쓰기 + delayed ACK 로 40ms 씩 늘어지지 않게
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: dict, tr_cont: str = ""):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("tr_id", self.headers.get("tr_id", ""))
+                self.send_header("tr_cont", tr_cont)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                if server.delay:
+                    time.sleep(server.delay)
+                if url.path == "/oauth2/tokenP":
+                    return self._reply(200, {"access_token": "fake-token", "token_type": "Bearer",
+                                             "access_token_token_expired": "2099-12-31 23:59:59"})
+                if url.path == "/oauth2/Approval":
+                    return self._reply(200, {"approval_key": f"fake-approval-{random.randint(0, 1 << 30)}"})
+                if not server._admit():
+                    return self._reply(500, RATE_LIMIT_BODY)
+                q = parse_qs(url.query, keep_blank_values=True)
+                if "/trading/" in url.path and any(k.startswith("CTX_AREA_NK") for k in q):
+                    return self._reply(200, *page_body(q, server.pages, server.per_page))
+                self._reply(200, quote_body(url.path, q))
+
+            do_GET = do_POST = _handle
+
+        self._httpd = _Server((host, port), Handler)
+        scheme = "http"
+        if certfile:
+            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ctx.load_cert_chain(certfile, keyfile)
+            self._httpd.socket = ctx.wrap_socket(self._httpd.socket, server_side=True)
+            scheme = "https"
+        self.url = f"{scheme}://{host}:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def _admit(self) -> bool:
+        """1초 창 안의 요청 수가 rate 를 넘으면 거절"""
+        with self._lock:
+            self.requests += 1
+            if self.rate <= 0:
+                return True
+            now = time.monotonic()
+            while self._hits and now - self._hits[0] >= 1.0:
+                self._hits.popleft()
+            if len(self._hits) >= self.rate:
+                self.limited += 1
+                return False
+            self._hits.append(now)
+            return True
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+# ── 메인 실행부 ─────────────────────────────────────────────────
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=9443)
+    p.add_argument("--delay", type=float, default=0.0, help="seconds added to every response")
+    p.add_argument("--rate", type=float, default=0.0, help="requests/sec before EGW00201 (0 = unlimited)")
+    p.add_argument("--certfile")
+    p.add_argument("--keyfile")
+    p.add_argument("--pages", type=int, default=3, help="pages per trading list query")
+    args = p.parse_args()
+
+    server = FakeKISRest(args.host, args.port, args.delay, args.rate, args.certfile, args.keyfile,
+                         pages=args.pages).start()
+    print(f"fake KIS REST: {server.url}")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"requests={server.requests} limited={server.limited} connections={server.connections}")
+    except KeyboardInterrupt:
+        server.stop()
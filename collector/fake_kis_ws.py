@@ -0,0 +1,153 @@
+# collector/fake_kis_ws.py
+"""
+로컬 확인용 가짜 KIS 실시간 서버 (websockets sync server).
+
+- 구독(tr_type 1/2) 요청에 KIS 형식 JSON 으로 응답, 접속당 PER_SESSION 초과 시 MAX SUBSCRIBE OVER
+- 구독 중인 종목마다 interval 초 간격으로 H0STCNT0 체결 프레임(필드 46개) 전송
+- ping_secs 마다 PINGPONG 을 보내고, 클라이언트가 돌려보낸 횟수를 센다
+- kick() 으로 모든 접속을 끊어 재접속/구독 복원을 확인할 수 있다
+
+    python fake_kis_ws.py --port 21000
+    KIS_WS_URL=ws://127.0.0.1:21000 KIS_WS_SYMBOLS=005930,000660 python kis_ws_client.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime
+
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import serve
+
+from kis_ws_parser import FIELDS, N_FIELDS
+
+PER_SESSION = 41
+
+
+def trade_frame(symbols, rng: random.Random) -> str:
+    """종목들의 체결 레코드를 한 프레임에 (data_cnt = 종목 수)"""
+    now = datetime.now()
+    values = []
+    for code in symbols:
+        rec = ["0"] * N_FIELDS
+        for i, (name, t) in enumerate(FIELDS):
+            if t is float:
+                rec[i] = f"{rng.random() * 10:.2f}"
+            elif t is str:
+                rec[i] = "0"
+        price = rng.randint(50_000, 80_000)
+        rec[0], rec[1], rec[2], rec[12] = code, f"{now:%H%M%S}", str(price), str(rng.randint(1, 500))
+        rec[33] = f"{now:%Y%m%d}"
+        values.extend(rec)
+    return f"0|H0STCNT0|{len(symbols):03d}|{'^'.join(values)}"
+
+
+def reply(tr_id: str, tr_key: str, rt_cd: str, msg_cd: str, msg1: str) -> str:
+    return json.dumps({
+        "header": {"tr_id": tr_id, "tr_key": tr_key, "encrypt": "N"},
+        "body": {"rt_cd": rt_cd, "msg_cd": msg_cd, "msg1": msg1},
+    })
+
+
+class FakeKISServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, interval: float = 0.2,
+                 ping_secs: float = 10.0, per_session: int = PER_SESSION, batch: int = 1):
+        self.interval = interval
+        self.ping_secs = ping_secs
+        self.per_session = per_session
+        self.batch = batch                      # 한 프레임에 담을 종목 수 (data_cnt)
+        self.connections = {}                   # conn → set(종목)
+        self.pongs = 0
+        self.connects = 0
+        self._lock = threading.Lock()
+        self._server = serve(self._handle, host, port, ping_interval=None)
+        self.port = self._server.socket.getsockname()[1]
+        self.url = f"ws://{host}:{self.port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+
+    def kick(self):
+        """현재 접속을 모두 끊는다 (재접속 확인용)"""
+        with self._lock:
+            conns = list(self.connections)
+        for conn in conns:
+            conn.close()
+
+    def subscriptions(self) -> list[set]:
+        with self._lock:
+            return [set(s) for s in self.connections.values()]
+
+    def _handle(self, conn):
+        subs = set()
+        with self._lock:
+            self.connections[conn] = subs
+            self.connects += 1
+        stop = threading.Event()
+        threading.Thread(target=self._feed, args=(conn, subs, stop), daemon=True).start()
+        try:
+            for message in conn:
+                msg = json.loads(message)
+                header = msg.get("header", {})
+                if header.get("tr_id") == "PINGPONG":
+                    self.pongs += 1
+                    continue
+                tr_id = msg["body"]["input"]["tr_id"]
+                key = msg["body"]["input"]["tr_key"]
+                with self._lock:
+                    if header.get("tr_type") == "2":
+                        subs.discard(key)
+                        out = reply(tr_id, key, "0", "OPSP0001", "UNSUBSCRIBE SUCCESS")
+                    elif key in subs:
+                        out = reply(tr_id, key, "1", "OPSP0002", "ALREADY IN SUBSCRIBE")
+                    elif len(subs) >= self.per_session:
+                        out = reply(tr_id, key, "1", "OPSP0008", "MAX SUBSCRIBE OVER")
+                    else:
+                        subs.add(key)
+                        out = reply(tr_id, key, "0", "OPSP0000", "SUBSCRIBE SUCCESS")
+                conn.send(out)
+        except ConnectionClosed:
+            pass
+        finally:
+            stop.set()
+            with self._lock:
+                self.connections.pop(conn, None)
+
+    def _feed(self, conn, subs, stop):
+        rng = random.Random()
+        last_ping = time.monotonic()
+        while not stop.wait(self.interval):
+            with self._lock:
+                codes = sorted(subs)
+            try:
+                for i in range(0, len(codes), self.batch):
+                    conn.send(trade_frame(codes[i : i + self.batch], rng))
+                if time.monotonic() - last_ping >= self.ping_secs:
+                    conn.send(json.dumps({"header": {"tr_id": "PINGPONG", "datetime": f"{datetime.now():%Y%m%d%H%M%S}"}}))
+                    last_ping = time.monotonic()
+            except ConnectionClosed:
+                return
+
+# ── 메인 실행부 ─────────────────────────────────────────────────
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=21000)
+    p.add_argument("--interval", type=float, default=0.5, help="seconds between trade frames")
+    p.add_argument("--batch", type=int, default=1, help="records per frame (data_cnt)")
+    args = p.parse_args()
+
+    server = FakeKISServer(args.host, args.port, args.interval, batch=args.batch).start()
+    print(f"fake KIS websocket: {server.url}")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"connections={len(server.subscriptions())} subs={[len(s) for s in server.subscriptions()]} pongs={server.pongs}")
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,249 @@
+# collector/intraday.py
+"""
+분봉 수집/집계 → IntradayBar 저장.
+
+1) 실시간: BarAggregator 가 체결 틱(H0STCNT0)을 받아 메모리에서 1/5/15/60분봉을 만든다.
+   봉 시작 시각이 바뀌면 직전 봉을 확정(pending)하고, batch_size 개가 모이거나
+   flush_secs 가 지나면 한 번의 bulk upsert 로 저장한다 (틱마다 DB 를 치지 않음).
+   한동안 체결이 없는 종목의 봉도 sweep() 이 시각 기준으로 닫는다 (grace_secs 만큼 늦게).
+   이미 닫은 봉(종목·주기별 마지막 봉 시작 시각)에 늦게 온 틱은 late 로 세고 버린다 —
+   같은 ts 의 조각 봉이 upsert 로 완성된 봉을 덮어쓰지 않게.
+2) 조회: 주식당일분봉조회(get_inquire_time_itemchartprice)를 30건씩 거슬러 올라가며
+   받아 1분봉으로 저장하고 rollup() 으로 5/15/60분봉을 만든다 (장중 재시작 시 구멍 메우기).
+
+    python intraday.py --symbols 005930 000660             # 당일 분봉 조회 → 저장
+    INTRADAY_BARS=1 python kis_ws_client.py                 # 실시간 틱 → 분봉
+"""
+import argparse
+import os, sys, time, django
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+# ── Django 환경 설정 ───────────────────────────────────────────────
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+django.setup()
+
+from core.models import IntradayBar
+from kis_ws_parser import parse_frame
+
+KST = ZoneInfo("Asia/Seoul")
+INTERVALS = (1, 5, 15, 60)                  # 분
+VALUES = ["open", "high", "low", "close", "volume"]
+
+
+def bucket(ts: datetime, minutes: int) -> datetime:
+    """ts 가 속한 봉의 시작 시각 (자정 기준 정렬이라 09:00 장 시작과 맞는다)"""
+    m = (ts.hour * 60 + ts.minute) // minutes * minutes
+    return ts.replace(hour=m // 60, minute=m % 60, second=0, microsecond=0)
+
+
+class Bar:
+    __slots__ = ("symbol", "interval", "ts", "open", "high", "low", "close", "volume")
+
+    def __init__(self, symbol, interval, ts, price, volume):
+        self.symbol, self.interval, self.ts = symbol, interval, ts
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+
+    def add(self, price, volume):
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+
+    def to_model(self) -> IntradayBar:
+        return IntradayBar(symbol=self.symbol, interval=self.interval, ts=self.ts,
+                           open=self.open, high=self.high, low=self.low,
+                           close=self.close, volume=self.volume)
+
+# ── 저장 ────────────────────────────────────────────────────────
+def save_bars(bars, batch_size: int = 1000) -> int:
+    """Bar / IntradayBar 목록 → bulk upsert (같은 봉이 다시 오면 값 덮어씀)"""
+    objs = [b.to_model() if isinstance(b, Bar) else b for b in bars]
+    if objs:
+        IntradayBar.objects.bulk_create(
+            objs, batch_size=batch_size, update_conflicts=True,
+            unique_fields=["symbol", "interval", "ts"], update_fields=VALUES,
+        )
+    return len(objs)
+
+# ── 실시간 집계 ──────────────────────────────────────────────────
+class BarAggregator:
+    """틱 → 분봉 (메모리) → 배치 저장.
+
+    writer 는 확정된 Bar 목록을 받는 함수 (기본 save_bars). 네트워크 콜백 스레드에서
+    on_tick 만 호출하면 되고, 저장은 조건이 찼을 때 writer 로 한 번에 넘긴다
+    (DB 를 기다리지 않으려면 writer 를 스레드 풀에 submit 하는 함수로).
+    sweep 은 로컬 시계 기준이라 거래소 타임스탬프보다 grace_secs 만큼 여유를 둔다.
+    """
+
+    def __init__(self, intervals=INTERVALS, batch_size: int = 500,
+                 flush_secs: float = 5.0, writer=save_bars, grace_secs: float = 3.0):
+        self.intervals = tuple(sorted(intervals))     # 가장 짧은 봉부터 (늦은 틱 판정)
+        self.batch_size = batch_size
+        self.flush_secs = flush_secs
+        self.writer = writer
+        self.grace = timedelta(seconds=grace_secs)
+        self._open: dict[tuple[str, int], Bar] = {}
+        self._closed: dict[tuple[str, int], datetime] = {}   # 마지막으로 닫은 봉 시작 시각
+        self._pending: list[Bar] = []
+        self._last_flush = time.monotonic()
+        self.stats = {"ticks": 0, "late": 0, "bars": 0, "flushes": 0}
+
+    def on_tick(self, symbol: str, ts: datetime, price: float, volume: int = 0):
+        self.stats["ticks"] += 1
+        for minutes in self.intervals:
+            key = (symbol, minutes)
+            start = bucket(ts, minutes)
+            bar = self._open.get(key)
+            if bar is not None and start == bar.ts:
+                bar.add(price, volume)
+            elif bar is not None and start > bar.ts:
+                self._close(key)
+                self._open[key] = Bar(symbol, minutes, start, price, volume)
+            elif bar is None and (key not in self._closed or start > self._closed[key]):
+                self._open[key] = Bar(symbol, minutes, start, price, volume)
+            else:                                   # 이미 닫힌(저장 대기/저장된) 봉에 늦게 온 틱은 버린다
+                self.stats["late"] += 1
+                break
+        self.maybe_flush()
+
+    def on_message(self, message, day=None):
+        """KIS 웹소켓 원문 한 건 (또는 Frame) → on_tick (체결 외 메시지는 무시)"""
+        for symbol, ts, price, volume in parse_trades(message, day):
+            self.on_tick(symbol, ts, price, volume)
+
+    def _close(self, key):
+        bar = self._open.pop(key)
+        self._closed[key] = bar.ts
+        self._pending.append(bar)
+
+    def sweep(self, now: datetime):
+        """now 시점에 이미 끝난 열린 봉을 확정 (체결이 끊긴 종목용, grace 만큼 늦게)"""
+        for key, bar in list(self._open.items()):
+            if bar.ts + timedelta(minutes=bar.interval) + self.grace <= now:
+                self._close(key)
+
+    def maybe_flush(self, now: datetime | None = None):
+        if now is not None:
+            self.sweep(now)
+        if len(self._pending) >= self.batch_size or (
+            self._pending and time.monotonic() - self._last_flush >= self.flush_secs
+        ):
+            self.flush()
+
+    def flush(self) -> int:
+        pending, self._pending = self._pending, []
+        self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        self.writer(pending)
+        self.stats["bars"] += len(pending)
+        self.stats["flushes"] += 1
+        return len(pending)
+
+    def close(self) -> int:
+        """장 마감/종료 시 열린 봉까지 전부 저장"""
+        for key in list(self._open):
+            self._close(key)
+        return self.flush()
+
+
+def parse_trades(message, day=None):
+    """'0|H0STCNT0|cnt|f^f^...' (또는 이미 파싱한 Frame) → [(symbol, ts, price, volume)]
+
+    날짜는 레코드의 영업일자(bsop_date), 비어 있으면 day (기본 오늘, KST).
+    """
+    frame = parse_frame(message) if isinstance(message, str) else message
+    if frame is None:
+        return []
+    out = []
+    for rec in frame.records:
+        d, hhmmss = rec.bsop_date, rec.stck_cntg_hour
+        if d:
+            y, mo, dd = int(d[:4]), int(d[4:6]), int(d[6:8])
+        else:
+            day = day or datetime.now(KST).date()
+            y, mo, dd = day.year, day.month, day.day
+        ts = datetime(y, mo, dd, int(hhmmss[:2]), int(hhmmss[2:4]), int(hhmmss[4:6]), tzinfo=KST)
+        out.append((rec.mksc_shrn_iscd, ts, float(rec.stck_prpr), rec.cntg_vol))
+    return out
+
+# ── 분봉 조회 (REST) ─────────────────────────────────────────────
+def minute_frame(raw: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """주식당일분봉조회 output2 → ts 인덱스 1분봉 DataFrame (open, high, low, close, volume)"""
+    if raw is None or raw.empty:
+        return pd.DataFrame(columns=VALUES, index=pd.DatetimeIndex([], tz=KST, name="ts"))
+    ts = pd.to_datetime(raw["stck_bsop_date"] + raw["stck_cntg_hour"], format="%Y%m%d%H%M%S")
+    df = pd.DataFrame({
+        "open": raw["stck_oprc"].astype(float).values,
+        "high": raw["stck_hgpr"].astype(float).values,
+        "low": raw["stck_lwpr"].astype(float).values,
+        "close": raw["stck_prpr"].astype(float).values,
+        "volume": raw["cntg_vol"].astype("int64").values,
+    }, index=pd.DatetimeIndex(ts.dt.tz_localize(KST), name="ts"))
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+def rollup(df: pd.DataFrame, minutes: int) -> pd.DataFrame:
+    """1분봉 → minutes 분봉 (봉 시작 시각 라벨, 자정 기준 정렬)"""
+    if minutes == 1 or df.empty:
+        return df
+    out = df.resample(f"{minutes}min", label="left", closed="left").agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    )
+    return out.dropna(subset=["open"])
+
+
+def frame_to_bars(df: pd.DataFrame, symbol: str, minutes: int) -> list[IntradayBar]:
+    return [
+        IntradayBar(symbol=symbol, interval=minutes, ts=ts.to_pydatetime(),
+                    open=o, high=h, low=l, close=c, volume=int(v))
+        for ts, o, h, l, c, v in df[VALUES].itertuples(name=None)
+    ]
+
+
+def fetch_minute_bars(symbol: str, until: str | None = None, start: str = "090000") -> pd.DataFrame:
+    """당일 1분봉을 until(HHMMSS, 기본 현재)부터 30건씩 거슬러 start 까지 조회"""
+    import kis_domstk as kb                  # kis_auth 가 import 시 환경변수를 요구하므로 지연 import
+
+    frames, hour = [], until
+    while True:
+        raw = kb.get_inquire_time_itemchartprice(output_dv="2", itm_no=symbol, inqr_hour=hour)
+        if raw is None or raw.empty:
+            break
+        frames.append(raw)
+        earliest = raw["stck_cntg_hour"].min()
+        if earliest <= start or len(raw) < 30:
+            break
+        prev = datetime.strptime(earliest, "%H%M%S") - timedelta(minutes=1)
+        hour = prev.strftime("%H%M%S")
+    df = minute_frame(pd.concat(frames) if frames else None, symbol)
+    return df[df.index.strftime("%H%M%S") >= start]
+
+
+def backfill(symbols, intervals=INTERVALS) -> int:
+    """종목별 당일 분봉 조회 → 1분봉 + rollup 봉 저장 → 저장 봉 수"""
+    total = 0
+    for symbol in symbols:
+        df = fetch_minute_bars(symbol)
+        bars = [b for m in intervals for b in frame_to_bars(rollup(df, m), symbol, m)]
+        total += save_bars(bars)
+        print(f"  {symbol}: 1분봉 {len(df)}개 → 저장 {len(bars)}개")
+    return total
+
+# ── 메인 실행부 ─────────────────────────────────────────────────
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="+", required=True)
+    p.add_argument("--intervals", nargs="+", type=int, default=list(INTERVALS))
+    args = p.parse_args()
+
+    print(f"[분봉 저장 완료] {backfill(args.symbols, args.intervals)} bars")
@@ -3,9 +3,15 @@
 Korea Investment Securities Open API – Authentication & Common HTTP Wrapper
 (env-only + legacy-compat + 403-retry)  2025-05-01
 """
-import os, json, copy, time, requests
+import os, json, time, threading, requests
+import numpy as np
+import pandas as pd
+from collections import deque, namedtuple
 from datetime import datetime, timedelta
-from collections import namedtuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from kis_rate import RATE_LIMIT_CODE, classify, get_scheduler
 
 # ───────────────────────────── 0. 기본 헤더
 MY_AGENT = os.getenv("MY_AGENT", "kis-client/1.0")
@@ -101,7 +107,7 @@ def auth(force=False):
     wait_sec  = int(os.getenv("KIS_AUTH_RETRY_WAIT", 60))
 
     for i in range(max_retry):
-        r = requests.post(url, headers=_BASE_HEADERS, data=json.dumps(payload))
+        r = get_session().post(url, headers=_BASE_HEADERS, data=json.dumps(payload), timeout=HTTP_TIMEOUT)
         if r.status_code == 200:
             break
         if r.status_code == 403 and r.headers.get("Content-Type","").startswith("application/json") \
@@ -127,52 +133,261 @@ def _apply_headers():
         "appsecret": _TRENV.app_sec,
     })
 
+def _token_expired() -> bool:
+    return datetime.now() - _LAST_AUTH > timedelta(hours=24)
+
 def _auto_reauth():
-    if datetime.now() - _LAST_AUTH > timedelta(hours=24):
+    if _token_expired():
         auth(force=True)
 
 # ───────────────────────────── 5. 응답 래퍼 + compat
+# 예전에는 응답마다 namedtuple 클래스를 새로 만들었다 (body·header 각각). 클래스 생성은 비싸고
+# 수집기처럼 오래 도는 프로세스에선 메모리도 쌓인다 → 파싱된 dict 위에 속성 접근만 얹는다.
+# getBody().output / getHeader().tr_cont 처럼 쓰던 코드는 그대로 동작한다.
+class _Record:
+    __slots__ = ("_d",)
+    _name = "record"
+
+    def __init__(self, d: dict):
+        self._d = d
+    def __getattr__(self, name):
+        if name == "_d":                        # copy/pickle 중 슬롯이 비었을 때 재귀 방지
+            raise AttributeError(name)
+        try:
+            return self._d[name]
+        except KeyError:
+            raise AttributeError(name) from None
+    def __getitem__(self, key): return self._d[key]
+    def __iter__(self):         return iter(self._d.values())   # namedtuple 처럼 값 순회
+    def __len__(self):          return len(self._d)
+    def __eq__(self, other):    return isinstance(other, _Record) and self._d == other._d
+    def __repr__(self):
+        return f"{self._name}(" + ", ".join(f"{k}={v!r}" for k, v in self._d.items()) + ")"
+    def get(self, key, default=None): return self._d.get(key, default)
+    def _asdict(self):          return self._d
+    @property
+    def _fields(self):          return tuple(self._d)
+
+class _Body(_Record):
+    __slots__ = ()
+    _name = "body"
+
+class _Header(_Record):
+    __slots__ = ()
+    _name = "header"
+
+
+# 코드·번호·날짜·시각·구분값은 숫자처럼 보여도 문자열로 둔다. 값이 아니라 필드 이름으로 정해서
+# 같은 필드는 응답마다 같은 dtype 이 된다 ("005930" 이든 "373220" 이든 종목코드는 문자열).
+STR_FIELDS   = frozenset({"pdno", "odno", "orgn_odno", "cano", "rt_cd", "msg_cd", "msg1", "tr_cont"})
+STR_SUFFIXES = ("_iscd", "_hour", "_tmd", "_time", "_dt", "_date", "_yn", "_code", "_cd", "_dvsn",
+                "_sign", "_no", "_orgno", "_brno", "_id", "_nm", "_name", "_isnm")
+STR_PREFIXES = ("ctx_area_",)
+
+def is_str_field(name: str) -> bool:
+    return name in STR_FIELDS or name.endswith(STR_SUFFIXES) or name.startswith(STR_PREFIXES)
+
+def _decode_column(col, keep_str=False):
+    """KIS 문자열 필드 → int64 / float64 (빈 값은 NaN), 숫자가 아니면 그대로 문자열.
+    문자열로 둘 필드(keep_str)는 호출하는 쪽이 이름으로 정한다 (is_str_field)"""
+    if keep_str:
+        return np.array(col, dtype=object)
+    try:
+        return np.array(col, dtype=np.int64)
+    except (ValueError, TypeError, OverflowError):
+        pass
+    try:
+        return np.array([v if v != "" else "nan" for v in col], dtype=np.float64)
+    except (ValueError, TypeError):
+        return np.array(col, dtype=object)
+
+def decode_records(records, numeric=True, keep_str=()) -> dict:
+    """output 배열(list[dict]) → {필드: np.ndarray} — 컬럼 단위로 한 번에 변환
+    is_str_field 에 걸리는 필드와 keep_str 로 준 필드는 문자열 그대로"""
+    if isinstance(records, dict):
+        records = [records]
+    if not records:
+        return {}
+    keys = list(records[0])
+    if all(len(r) == len(keys) for r in records):
+        cols = zip(*(r.values() for r in records))      # KIS 는 행마다 같은 키 순서
+    else:
+        cols = ([r.get(k, "") for r in records] for k in keys)
+    if not numeric:
+        return {k: np.array(c, dtype=object) for k, c in zip(keys, cols)}
+    return {k: _decode_column(c, k in keep_str or is_str_field(k)) for k, c in zip(keys, cols)}
+
+
 class APIResp:
+    __slots__ = ("_resp", "_status", "_json", "_body", "_header")
+
     def __init__(self, resp: requests.Response):
         self._resp = resp
         self._status = resp.status_code
         self._json = resp.json() if resp.headers.get("Content-Type","").startswith("application/json") else {}
-        self._body = namedtuple("body", self._json.keys())(**self._json) if self._json else None
+        self._body = _Body(self._json) if self._json else None
+        self._header = None                     # getHeader() 를 부를 때 만든다
     def ok(self):  return self._status==200 and getattr(self._body,"rt_cd","")=="0"
     def err(self): return "" if self.ok() else f"[{getattr(self._body,'msg_cd','')}] {getattr(self._body,'msg1','')}"
     def json(self):return self._json
 
-def _build_hdr_namedtuple(resp):
-    sanitized = {k.lower().replace("-", "_"): v for k, v in resp.headers.items()}
-    return namedtuple("header", sanitized.keys())(*sanitized.values())
+    def columns(self, key="output", numeric=True, keep_str=()) -> dict:
+        """body[key] 배열 → {필드: np.ndarray} (숫자 필드는 int64/float64)"""
+        return decode_records(self._json.get(key) or [], numeric, keep_str)
+
+    def frame(self, key="output", numeric=True, keep_str=()) -> pd.DataFrame:
+        """body[key] 배열 → DataFrame (컬럼 단위 생성 + 숫자 변환)"""
+        return pd.DataFrame(self.columns(key, numeric, keep_str))
 
 
 class APIRespCompat(APIResp):
+    __slots__ = ()
+
     def getBody(self):         return self._body
-    def getHeader(self):       return _build_hdr_namedtuple(self._resp)
+    def getHeader(self):
+        if self._header is None:
+            self._header = _Header({k.lower().replace("-", "_"): v for k, v in self._resp.headers.items()})
+        return self._header
     def isOK(self):            return self.ok()
     def getErrorCode(self):    return getattr(self._body,"msg_cd","")
     def getErrorMessage(self): return getattr(self._body,"msg1","")
+    def printError(self):      print(f"[KIS_API] HTTP {self._status} {self.err()}")
+
+# ───────────────────────────── 6. HTTP 세션 (keep-alive 풀 + 재시도)
+# 연결 풀(HTTPAdapter → urllib3 PoolManager, 스레드 안전)은 프로세스에 하나, Session 은 스레드마다
+# (Session 의 쿠키/상태는 스레드 간 공유가 보장되지 않음). 모든 스레드가 같은 풀에서 연결을 빌려
+# 쓰므로 동시에 열리는 연결은 호스트당 POOL_SIZE 개로 제한되고, 더 많은 스레드는 빈 연결을 기다린다.
+POOL_SIZE   = int(os.getenv("KIS_HTTP_POOL", 10))           # 호스트당 최대 연결 수 (스레드 전체 공유)
+HTTP_RETRY  = int(os.getenv("KIS_HTTP_RETRY", 3))           # 일시 오류 재시도 (GET 만)
+HTTP_TIMEOUT = (float(os.getenv("KIS_HTTP_CONNECT_TIMEOUT", 3)),
+                float(os.getenv("KIS_HTTP_READ_TIMEOUT", 10)))
+_local = threading.local()
+_adapter = None
+_adapter_lock = threading.Lock()
+
+def _shared_adapter() -> HTTPAdapter:
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            retry = Retry(
+                total=HTTP_RETRY, connect=HTTP_RETRY, read=HTTP_RETRY,
+                backoff_factor=0.2,
+                status_forcelist=(502, 503, 504),        # 500 은 EGW00201 등 업무 오류 → 스케줄러가 처리
+                allowed_methods=frozenset({"GET"}),      # 주문(POST)은 중복 체결 위험이 있어 재시도하지 않음
+                raise_on_status=False,
+            )
+            _adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE,
+                                   pool_block=True, max_retries=retry)   # 풀이 차면 새 연결 대신 대기
+        return _adapter
+
+def _new_session() -> requests.Session:
+    adapter = _shared_adapter()
+    sess = requests.Session()
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
+
+def get_session() -> requests.Session:
+    sess = getattr(_local, "session", None)
+    if sess is None:
+        sess = _local.session = _new_session()
+    return sess
+
+# ───────────────────────────── 7. tr_id 별 지연 시간
+class _Latency:
+    __slots__ = ("count", "errors", "total", "max", "recent")
+
+    def __init__(self):
+        self.count = self.errors = 0
+        self.total = self.max = 0.0
+        self.recent = deque(maxlen=1024)        # 최근 표본 (분위수 계산용)
+
+_LATENCY: dict[str, _Latency] = {}
+_LAT_LOCK = threading.Lock()
+
+def _record(tr_id: str, elapsed: float, ok: bool):
+    with _LAT_LOCK:
+        st = _LATENCY.get(tr_id)
+        if st is None:
+            st = _LATENCY[tr_id] = _Latency()
+        st.count += 1
+        st.errors += 0 if ok else 1
+        st.total += elapsed
+        st.max = max(st.max, elapsed)
+        st.recent.append(elapsed)
 
-# ───────────────────────────── 6. HTTP wrapper
+def latency_stats(reset=False) -> dict:
+    """{tr_id: {count, errors, mean_ms, p50_ms, p95_ms, max_ms}}"""
+    out = {}
+    with _LAT_LOCK:
+        for tr_id, st in _LATENCY.items():
+            xs = sorted(st.recent)
+            out[tr_id] = {
+                "count": st.count,
+                "errors": st.errors,
+                "mean_ms": round(st.total / st.count * 1e3, 2),
+                "p50_ms": round(xs[len(xs) // 2] * 1e3, 2),
+                "p95_ms": round(xs[min(len(xs) - 1, int(len(xs) * 0.95))] * 1e3, 2),
+                "max_ms": round(st.max * 1e3, 2),
+            }
+        if reset:
+            _LATENCY.clear()
+    return out
+
+# ───────────────────────────── 8. 호출 스케줄러 (초당 한도 + 우선순위)
+# 모든 REST 호출은 전송 전에 토큰을 받는다. 주문(POST) → 계좌 조회 → 시세 순으로 먼저 나간다.
+# 그래도 EGW00201 을 받으면 스케줄러를 잠시 멈추고 같은 우선순위로 다시 보낸다
+# (게이트웨이에서 거절된 요청이라 주문도 중복 위험 없음).
+RATE_RETRY = int(os.getenv("KIS_RATE_RETRY", 3))
+_SCHED = get_scheduler(_CFG["is_paper"])
+
+def _rate_limited(resp: requests.Response) -> bool:
+    return resp.status_code == 500 and RATE_LIMIT_CODE in resp.text
+
+def rate_stats() -> dict:
+    """대기열 깊이 / 우선순위별 대기 시간 / 유량 초과 횟수"""
+    return _SCHED.metrics()
+
+# ───────────────────────────── 9. HTTP wrapper
 def _get_base_header():
     _auto_reauth()
-    return copy.deepcopy(_BASE_HEADERS)
+    return dict(_BASE_HEADERS)                  # 값이 전부 문자열이라 얕은 복사로 충분
+
+def _resolve_tr_id(tr_id):
+    """모의투자 계정이면 거래 tr_id 첫 글자(T/J/C)를 V 로"""
+    if tr_id and tr_id[0] in ("T","J","C") and _TRENV.is_paper:
+        return "V"+tr_id[1:]
+    return tr_id
 
 def _url_fetch(api_path, tr_id, tr_cont,
-               params=None, post=False, postFlag=False, extra_headers=None) -> APIRespCompat:
+               params=None, post=False, postFlag=False, extra_headers=None,
+               priority=None) -> APIRespCompat:
 
     if postFlag: post = True
     url = f"{_TRENV.url}{api_path}"
     hdr = _get_base_header()
 
-    if tr_id and tr_id[0] in ("T","J","C") and _TRENV.is_paper:
-        tr_id = "V"+tr_id[1:]
+    tr_id = _resolve_tr_id(tr_id)
     hdr.update({"tr_id":tr_id,"tr_cont":tr_cont,"custtype":"P", **(extra_headers or {})})
 
-    resp = requests.post(url, headers=hdr, data=json.dumps(params or {})) if post \
-           else requests.get(url, headers=hdr, params=params or {})
+    if priority is None:
+        priority = classify(api_path, post)
+    sess = get_session()
+    for attempt in range(RATE_RETRY + 1):
+        _SCHED.acquire(priority)
+        t0 = time.perf_counter()
+        try:
+            resp = sess.post(url, headers=hdr, data=json.dumps(params or {}), timeout=HTTP_TIMEOUT) if post \
+                   else sess.get(url, headers=hdr, params=params or {}, timeout=HTTP_TIMEOUT)
+        except requests.RequestException:
+            _record(tr_id, time.perf_counter() - t0, False)
+            raise
+        _record(tr_id, time.perf_counter() - t0, resp.status_code == 200)
+        if not _rate_limited(resp) or attempt == RATE_RETRY:
+            break
+        _SCHED.penalize()
     return APIRespCompat(resp)
 
-# ───────────────────────────── 7. export list
-__all__ = ["auth", "_url_fetch", "APIResp", "_TRENV", "_get_base_header", "getTREnv"]
+# ───────────────────────────── 10. export list
+__all__ = ["auth", "_url_fetch", "APIResp", "_TRENV", "_get_base_header", "getTREnv",
+           "get_session", "latency_stats", "rate_stats", "decode_records"]
@@ -78,6 +78,7 @@ __all__ = [
     "query_period_profit_obj",
     "query_period_profit_list",
     "query_price",
+    "query_prices",
     "query_ccnl",
     "query_daily_price",
     "query_asking_or_expect",
@@ -240,6 +241,13 @@ def query_price(itm_no: str):
     return kb.get_inquire_price(itm_no=itm_no)
 
 
+def query_prices(itm_nos: List[str]) -> dict:
+    """여러 종목 현재가를 동시에 조회 (kis_domstk_async) → {종목: DataFrame | None}"""
+    import kis_domstk_async as kba
+
+    return kba.fetch_many("get_inquire_price", itm_nos)
+
+
 def query_ccnl(itm_no: str):
     return kb.get_inquire_ccnl(itm_no=itm_no)
 
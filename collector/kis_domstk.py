@@ -8,15 +8,46 @@ Created on Wed Feb 15 16:57:19 2023
 """
 import kis_auth as kis
 
-import time, copy
-import requests
-import json
-
 import pandas as pd
 
-from collections import namedtuple
-from datetime import datetime
-from pandas import DataFrame
+from datetime import datetime, timedelta
+
+#====|  연속조회 (페이지)  |=================================================================================================================================
+# 응답 헤더 tr_cont 가 F/M 이면 다음 페이지가 있고 D/E 면 마지막.
+# 다음 페이지는 요청 헤더 tr_cont="N" + 직전 응답 body 의 CTX_AREA_FK100/NK100 (예약주문조회는 FK200/NK200) 로 요청한다.
+
+# 페이지마다 레코드 list(output*) 를 yield — 다 쓰기 전에 멈추면(break) 나머지 페이지는 요청하지 않는다
+def iter_pages(url, tr_id, params, output="output1", tr_cont="", ctx=("CTX_AREA_FK100", "CTX_AREA_NK100"), max_pages=None):
+    fk_key, nk_key = ctx
+    params = dict(params)
+    pages = 0
+    while True:
+        res = kis._url_fetch(url, tr_id, tr_cont, params)  # API 호출, kis_auth.py에 존재
+        body = res.getBody()
+        records = getattr(body, output) or []
+        yield records if isinstance(records, list) else [records]
+        pages += 1
+
+        tr_cont = res.getHeader().tr_cont  # 페이징 처리 getHeader(), getBody() kis_auth.py 존재
+        if tr_cont not in ("F", "M") or (max_pages is not None and pages >= max_pages):  # 마지막 페이지
+            return
+        params[fk_key] = getattr(body, fk_key.lower())
+        params[nk_key] = getattr(body, nk_key.lower())
+        tr_cont = "N"
+
+# 페이지들을 모아 DataFrame 을 한 번만 생성 (페이지마다 concat 하지 않음)
+# dataframe : 앞에 붙일 기존 결과 (예전 재귀 호출 인자 호환), stop(records) 가 True 면 그 페이지까지만
+def collect_pages(pages, dataframe=None, stop=None):
+    rows = []
+    for records in pages:
+        rows.extend(records)
+        if stop is not None and stop(records):
+            pages.close()
+            break
+    current_data = pd.DataFrame(rows)
+    if dataframe is not None:
+        return pd.concat([dataframe, current_data], ignore_index=True)
+    return current_data
 
 #====|  [국내주식] 주문/계좌  |===========================================================================================================================
 
@@ -138,7 +169,7 @@ def get_order_rvsecncl(ord_orgno="", orgn_odno="", ord_dvsn="", rvse_cncl_dvsn_c
 # 국내주식주문 > 주식정정취소가능주문조회 List를 DataFrame 으로 반환
 # Input: None (Option) 상세 Input값 변경이 필요한 경우 API문서 참조
 # Output: DataFrame (Option) output API 문서 참조 등
-def get_inquire_psbl_rvsecncl_lst(tr_cont="", FK100="", NK100="", dataframe=None):  # 국내주식주문 > 주식정정취소가능주문조회
+def get_inquire_psbl_rvsecncl_lst(tr_cont="", FK100="", NK100="", dataframe=None, stop=None):  # 국내주식주문 > 주식정정취소가능주문조회
     url = '/uapi/domestic-stock/v1/trading/inquire-psbl-rvsecncl'
     tr_id = "TTTC8036R"
 
@@ -151,30 +182,8 @@ def get_inquire_psbl_rvsecncl_lst(tr_cont="", FK100="", NK100="", dataframe=None
         "CTX_AREA_NK100": NK100                 # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_NK100 값 : 다음페이지 조회시(2번째부터)
     }
 
-    res = kis._url_fetch(url, tr_id, tr_cont, params)
-
-    # Assuming 'output2' is a dictionary that you want to convert to a DataFrame
-    # current_data = res.getBody().output  # getBody() kis_auth.py 존재
-    current_data = pd.DataFrame(res.getBody().output)
-
-    # Append to the existing DataFrame if it exists
-    if dataframe is not None:
-        dataframe = pd.concat([dataframe, current_data], ignore_index=True)  #
-    else:
-        dataframe = current_data
-
-    tr_cont, FK100, NK100 = res.getHeader().tr_cont, res.getBody().ctx_area_fk100, res.getBody().ctx_area_nk100 # 페이징 처리 getHeader(), getBody() kis_auth.py 존재
-    # print(tr_cont, FK100, NK100)
-
-    if tr_cont == "D" or tr_cont == "E": # 마지막 페이지
-        print("The End")
-        current_data = pd.DataFrame(dataframe)
-        dataframe = current_data
-        return dataframe
-    elif tr_cont == "F" or tr_cont == "M": # 다음 페이지 존재하는 경우 자기 호출 처리
-        print('Call Next')
-        time.sleep(0.1)  # 시스템 안정적 운영을 위하여 반드시 지연 time 필요
-        return get_inquire_psbl_rvsecncl_lst("N", FK100, NK100, dataframe)
+    pages = iter_pages(url, tr_id, params, "output", tr_cont)
+    return collect_pages(pages, dataframe, stop)  # 연속조회 전체를 DataFrame 하나로
 
 
 
@@ -230,7 +239,7 @@ def get_inquire_daily_ccld_obj(dv="01", inqr_strt_dt=None, inqr_end_dt=None, tr_
 # Input: None (Option) 상세 Input값 변경이 필요한 경우 API문서 참조
 #        dv 기간구분 - 01:3개월 이내(TTTC8001R),  02:3개월 이전(CTSC9115R)
 # Output: DataFrame (Option) output1 API 문서 참조 등
-def get_inquire_daily_ccld_lst(dv="01", inqr_strt_dt="", inqr_end_dt="", tr_cont="", FK100="", NK100="", dataframe=None):  # 국내주식주문 > 주식일별주문체결조회
+def get_inquire_daily_ccld_lst(dv="01", inqr_strt_dt="", inqr_end_dt="", tr_cont="", FK100="", NK100="", dataframe=None, stop=None):  # 국내주식주문 > 주식일별주문체결조회
     url = '/uapi/domestic-stock/v1/trading/inquire-daily-ccld'
 
     if dv == "01":
@@ -259,27 +268,8 @@ def get_inquire_daily_ccld_lst(dv="01", inqr_strt_dt="", inqr_end_dt="", tr_cont
         "CTX_AREA_FK100": FK100, # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_FK100 값 : 다음페이지 조회시(2번째부터)
         "CTX_AREA_NK100": NK100  # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_NK100 값 : 다음페이지 조회시(2번째부터)
     }
-    res = kis._url_fetch(url, tr_id, tr_cont, params) # API 호출, kis_auth.py에 존재
-
-    # Assuming 'output1' is a dictionary that you want to convert to a DataFrame
-    current_data = pd.DataFrame(res.getBody().output1)
-
-    # Append to the existing DataFrame if it exists
-    if dataframe is not None:
-        dataframe = pd.concat([dataframe, current_data], ignore_index=True)  #
-    else:
-        dataframe = current_data
-
-    tr_cont, FK100, NK100 = res.getHeader().tr_cont, res.getBody().ctx_area_fk100, res.getBody().ctx_area_nk100 # 페이징 처리 getHeader(), getBody() kis_auth.py 존재
-    # print(dv, tr_cont, FK100, NK100)
-
-    if tr_cont == "D" or tr_cont == "E": # 마지막 페이지
-        print("The End")
-        return dataframe
-    elif tr_cont == "F" or tr_cont == "M": # 다음 페이지 존재하는 경우 자기 호출 처리
-        print('Call Next')
-        time.sleep(0.1)  # 시스템 안정적 운영을 위하여 반드시 지연 time 필요
-        return get_inquire_daily_ccld_lst(dv, inqr_strt_dt, inqr_end_dt, "N", FK100, NK100, dataframe)
+    pages = iter_pages(url, tr_id, params, "output1", tr_cont)
+    return collect_pages(pages, dataframe, stop)  # 연속조회 전체를 DataFrame 하나로
 
 
 ##############################################################################################
@@ -321,7 +311,7 @@ def get_inquire_balance_obj(tr_cont="", FK100="", NK100="", dataframe=None):  #
 # 주식계좌잔고 종목별 List를 DataFrame 으로 반환
 # Input: None (Option) 상세 Input값 변경이 필요한 경우 API문서 참조
 # Output: DataFrame (Option) output2 - 종목번호, 상품명(종목명), 매매구분명(매수매도구분), 전일매수수량 ... 등
-def get_inquire_balance_lst(tr_cont="", FK100="", NK100="", dataframe=None):  # 국내주식주문 > 주식잔고조회(현재종목별 잔고)
+def get_inquire_balance_lst(tr_cont="", FK100="", NK100="", dataframe=None, stop=None):  # 국내주식주문 > 주식잔고조회(현재종목별 잔고)
     url = '/uapi/domestic-stock/v1/trading/inquire-balance'
     tr_id = "TTTC8434R"
     params = {
@@ -338,27 +328,8 @@ def get_inquire_balance_lst(tr_cont="", FK100="", NK100="", dataframe=None):  #
         "CTX_AREA_FK100": FK100, # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_FK100 값 : 다음페이지 조회시(2번째부터)
         "CTX_AREA_NK100": NK100  # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_NK100 값 : 다음페이지 조회시(2번째부터)
     }
-    res = kis._url_fetch(url, tr_id, tr_cont, params) # API 호출, kis_auth.py에 존재
-
-    # Assuming 'output1' is a dictionary that you want to convert to a DataFrame
-    current_data = pd.DataFrame(res.getBody().output1)
-
-    # Append to the existing DataFrame if it exists
-    if dataframe is not None:
-        dataframe = pd.concat([dataframe, current_data], ignore_index=True)  #
-    else:
-        dataframe = current_data
-
-    tr_cont, FK100, NK100 = res.getHeader().tr_cont, res.getBody().ctx_area_fk100, res.getBody().ctx_area_nk100 # 페이징 처리 getHeader(), getBody() kis_auth.py 존재
-    print(tr_cont, FK100, NK100)
-
-    if tr_cont == "D" or tr_cont == "E": # 마지막 페이지
-        print("The End")
-        return dataframe
-    elif tr_cont == "F" or tr_cont == "M": # 다음 페이지 존재하는 경우 자기 호출 처리
-        print('Call Next')
-        time.sleep(0.1)  # 시스템 안정적 운영을 위하여 반드시 지연 time 필요
-        return get_inquire_balance_lst("N", FK100, NK100, dataframe)
+    pages = iter_pages(url, tr_id, params, "output1", tr_cont)
+    return collect_pages(pages, dataframe, stop)  # 연속조회 전체를 DataFrame 하나로
 
 ##############################################################################################
 # [국내주식] 주문/계좌 > 매수가능조회
@@ -575,7 +546,7 @@ def get_order_resv_rvse(pdno="", ord_qty=0, ord_unpr=0, sll_buy_dvsn_cd="", ord_
 # [국내주식] 주문/계좌 > 주식예약주문조회[v1_국내주식-020] List를 DataFrame 으로 반환
 # Input: None (Option) 상세 Input값 변경이 필요한 경우 API문서 참조
 # Output: DataFrame (Option) output2 -
-def get_order_resv_ccnl(inqr_strt_dt=None, inqr_end_dt=None, ord_seq=0, tr_cont="", FK100="", NK100="", dataframe=None):  # 국내주식주문 > 매수가능조회
+def get_order_resv_ccnl(inqr_strt_dt=None, inqr_end_dt=None, ord_seq=0, tr_cont="", FK100="", NK100="", dataframe=None, stop=None):  # 국내주식주문 > 매수가능조회
     url = '/uapi/domestic-stock/v1/trading/order-resv-ccnl'
     tr_id = "CTSC0004R"
 
@@ -598,27 +569,8 @@ def get_order_resv_ccnl(inqr_strt_dt=None, inqr_end_dt=None, ord_seq=0, tr_cont=
         "CTX_AREA_FK200": FK100,         # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_FK200 값 : 다음페이지 조회시(2번째부터)
         "CTX_AREA_NK200": NK100          # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_NK200 값 : 다음페이지 조회시(2번째부터)
     }
-    res = kis._url_fetch(url, tr_id, tr_cont, params) # API 호출, kis_auth.py에 존재
-
-    # Assuming 'output1' is a dictionary that you want to convert to a DataFrame
-    current_data = pd.DataFrame(res.getBody().output)
-
-    # Append to the existing DataFrame if it exists
-    if dataframe is not None:
-        dataframe = pd.concat([dataframe, current_data], ignore_index=True)  #
-    else:
-        dataframe = current_data
-
-    tr_cont, FK100, NK100 = res.getHeader().tr_cont, res.getBody().ctx_area_fk200, res.getBody().ctx_area_nk200 # 페이징 처리 getHeader(), getBody() kis_auth.py 존재
-    print(tr_cont, FK100, NK100)
-
-    if tr_cont == "D" or tr_cont == "E": # 마지막 페이지
-        print("The End")
-        return dataframe
-    elif tr_cont == "F" or tr_cont == "M": # 다음 페이지 존재하는 경우 자기 호출 처리
-        print('Call Next')
-        time.sleep(0.1)  # 시스템 안정적 운영을 위하여 반드시 지연 time 필요
-        return get_order_resv_ccnl(inqr_strt_dt, inqr_end_dt, ord_seq, "N", FK100, NK100, dataframe)
+    pages = iter_pages(url, tr_id, params, "output", tr_cont, ctx=("CTX_AREA_FK200", "CTX_AREA_NK200"))
+    return collect_pages(pages, dataframe, stop)  # 연속조회 전체를 DataFrame 하나로
 
 ##############################################################################################
 # [국내주식] 주문/계좌 > 주식잔고조회_실현손익
@@ -657,7 +609,7 @@ def get_inquire_balance_rlz_pl_obj(tr_cont="", FK100="", NK100="", dataframe=Non
 # 주식잔고조회_실현손익 list DataFrame 으로 반환
 # Input: None (Option) 상세 Input값 변경이 필요한 경우 API문서 참조
 # Output: DataFrame (Option) output2 - 예수금총금액, 익일정산금액, 가수도정산금액, CMA평가금액, 전일매수금액, 금일매수금액 ... 등
-def get_inquire_balance_rlz_pl_lst(tr_cont="", FK100="", NK100="", dataframe=None):  # [국내주식] 주문/계좌 > 주식잔고조회_실현손익 (보유주식내역 Output2)
+def get_inquire_balance_rlz_pl_lst(tr_cont="", FK100="", NK100="", dataframe=None, stop=None):  # [국내주식] 주문/계좌 > 주식잔고조회_실현손익 (보유주식내역 Output2)
     url = '/uapi/domestic-stock/v1/trading/inquire-balance-rlz-pl'
     tr_id = "TTTC8494R"
 
@@ -675,28 +627,8 @@ def get_inquire_balance_rlz_pl_lst(tr_cont="", FK100="", NK100="", dataframe=Non
         "CTX_AREA_FK100": FK100, # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_FK100 값 : 다음페이지 조회시(2번째부터)
         "CTX_AREA_NK100": NK100  # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_NK100 값 : 다음페이지 조회시(2번째부터)
     }
-    res = kis._url_fetch(url, tr_id, tr_cont, params)  # API 호출, kis_auth.py에 존재
-
-    # print(res.getBody())  # 오류 원인 확인 필요시 사용
-    # Assuming 'output1' is a dictionary that you want to convert to a DataFrame
-    current_data = pd.DataFrame(res.getBody().output1)
-
-    # Append to the existing DataFrame if it exists
-    if dataframe is not None:
-        dataframe = pd.concat([dataframe, current_data], ignore_index=True)  #
-    else:
-        dataframe = current_data
-
-    tr_cont, FK100, NK100 = res.getHeader().tr_cont, res.getBody().ctx_area_fk100, res.getBody().ctx_area_nk100  # 페이징 처리 getHeader(), getBody() kis_auth.py 존재
-    print(tr_cont, FK100, NK100)
-
-    if tr_cont == "D" or tr_cont == "E":  # 마지막 페이지
-        print("The End")
-        return dataframe
-    elif tr_cont == "F" or tr_cont == "M":  # 다음 페이지 존재하는 경우 자기 호출 처리
-        print('Call Next')
-        time.sleep(0.1)  # 시스템 안정적 운영을 위하여 반드시 지연 time 필요
-        return get_inquire_balance_rlz_pl_lst("N", FK100, NK100, dataframe)
+    pages = iter_pages(url, tr_id, params, "output1", tr_cont)
+    return collect_pages(pages, dataframe, stop)  # 연속조회 전체를 DataFrame 하나로
 
 
 ##############################################################################################
@@ -767,7 +699,7 @@ def get_inquire_period_trade_profit_obj(inqr_strt_dt=None, inqr_end_dt=None, tr_
 # 기간별매매손익현황조회 object DataFrame 으로 반환
 # Input: None (Option) 상세 Input값 변경이 필요한 경우 API문서 참조
 # Output: DataFrame (Option) output1 - 매매일자, 상품번호, 상품명, 매매구분명, 대출일자, 보유수량... 등
-def get_inquire_period_trade_profit_lst(inqr_strt_dt=None, inqr_end_dt=None, tr_cont="", FK100="", NK100="", dataframe=None):  # [국내주식] 주문/계좌 > 기간별매매손익현황조회 (output1)
+def get_inquire_period_trade_profit_lst(inqr_strt_dt=None, inqr_end_dt=None, tr_cont="", FK100="", NK100="", dataframe=None, stop=None):  # [국내주식] 주문/계좌 > 기간별매매손익현황조회 (output1)
     url = '/uapi/domestic-stock/v1/trading/inquire-period-trade-profit'
     tr_id = "TTTC8715R"
 
@@ -787,27 +719,8 @@ def get_inquire_period_trade_profit_lst(inqr_strt_dt=None, inqr_end_dt=None, tr_
         "CTX_AREA_FK100": FK100, # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_FK100 값 : 다음페이지 조회시(2번째부터)
         "CTX_AREA_NK100": NK100  # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_NK100 값 : 다음페이지 조회시(2번째부터)
     }
-    res = kis._url_fetch(url, tr_id, tr_cont, params) # API 호출, kis_auth.py에 존재
-
-    # Assuming 'output1' is a dictionary that you want to convert to a DataFrame
-    current_data = pd.DataFrame(res.getBody().output1)
-
-    # Append to the existing DataFrame if it exists
-    if dataframe is not None:
-        dataframe = pd.concat([dataframe, current_data], ignore_index=True)  #
-    else:
-        dataframe = current_data
-
-    tr_cont, FK100, NK100 = res.getHeader().tr_cont, res.getBody().ctx_area_fk100, res.getBody().ctx_area_nk100 # 페이징 처리 getHeader(), getBody() kis_auth.py 존재
-    print(tr_cont, FK100, NK100)
-
-    if tr_cont == "D" or tr_cont == "E": # 마지막 페이지
-        print("The End")
-        return dataframe
-    elif tr_cont == "F" or tr_cont == "M": # 다음 페이지 존재하는 경우 자기 호출 처리
-        print('Call Next')
-        time.sleep(0.1)  # 시스템 안정적 운영을 위하여 반드시 지연 time 필요
-        return get_inquire_period_trade_profit_lst(inqr_strt_dt, inqr_end_dt, "N", FK100, NK100, dataframe)
+    pages = iter_pages(url, tr_id, params, "output1", tr_cont)
+    return collect_pages(pages, dataframe, stop)  # 연속조회 전체를 DataFrame 하나로
 
 
 ##############################################################################################
@@ -848,7 +761,7 @@ def get_inquire_period_profit_obj(inqr_strt_dt=None, inqr_end_dt=None, tr_cont="
 # 기간별손익일별합산조회 object DataFrame 으로 반환
 # Input: None (Option) 상세 Input값 변경이 필요한 경우 API문서 참조
 # Output: DataFrame (Option) output1 - 매매일자, 상품번호, 상품명, 매매구분명, 대출일자, 보유수량... 등
-def get_inquire_period_profit_lst(inqr_strt_dt=None, inqr_end_dt=None, tr_cont="", FK100="", NK100="", dataframe=None):  # [국내주식] 주문/계좌 > 기간별손익일별합산조회 (output1)
+def get_inquire_period_profit_lst(inqr_strt_dt=None, inqr_end_dt=None, tr_cont="", FK100="", NK100="", dataframe=None, stop=None):  # [국내주식] 주문/계좌 > 기간별손익일별합산조회 (output1)
     url = '/uapi/domestic-stock/v1/trading/inquire-period-profit'
     tr_id = "TTTC8708R"
 
@@ -869,27 +782,8 @@ def get_inquire_period_profit_lst(inqr_strt_dt=None, inqr_end_dt=None, tr_cont="
         "CTX_AREA_FK100": FK100, # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_FK100 값 : 다음페이지 조회시(2번째부터)
         "CTX_AREA_NK100": NK100  # 공란 : 최초 조회시 이전 조회 Output CTX_AREA_NK100 값 : 다음페이지 조회시(2번째부터)
     }
-    res = kis._url_fetch(url, tr_id, tr_cont, params) # API 호출, kis_auth.py에 존재
-
-    # Assuming 'output1' is a dictionary that you want to convert to a DataFrame
-    current_data = pd.DataFrame(res.getBody().output1)
-
-    # Append to the existing DataFrame if it exists
-    if dataframe is not None:
-        dataframe = pd.concat([dataframe, current_data], ignore_index=True)  #
-    else:
-        dataframe = current_data
-
-    tr_cont, FK100, NK100 = res.getHeader().tr_cont, res.getBody().ctx_area_fk100, res.getBody().ctx_area_nk100 # 페이징 처리 getHeader(), getBody() kis_auth.py 존재
-    print(tr_cont, FK100, NK100)
-
-    if tr_cont == "D" or tr_cont == "E": # 마지막 페이지
-        print("The End")
-        return dataframe
-    elif tr_cont == "F" or tr_cont == "M": # 다음 페이지 존재하는 경우 자기 호출 처리
-        print('Call Next')
-        time.sleep(0.1)  # 시스템 안정적 운영을 위하여 반드시 지연 time 필요
-        return get_inquire_period_profit_lst(inqr_strt_dt, inqr_end_dt, "N", FK100, NK100, dataframe)
+    pages = iter_pages(url, tr_id, params, "output1", tr_cont)
+    return collect_pages(pages, dataframe, stop)  # 연속조회 전체를 DataFrame 하나로
 
 #====|  [국내주식] 기본시세  |============================================================================================================================
 
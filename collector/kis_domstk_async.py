@@ -0,0 +1,244 @@
+# collector/kis_domstk_async.py
+"""
+kis_domstk 기본시세 조회 함수의 asyncio 판 (httpx.AsyncClient).
+
+- 메서드 이름·인자·반환 DataFrame 모양은 kis_domstk 의 같은 이름 함수와 같다
+  → `kb.get_inquire_price(itm_no=c)` 를 `await api.get_inquire_price(itm_no=c)` 로 바꾸면 된다
+- 호출 전에 kis_auth 와 같은 스케줄러(kis_rate)에서 토큰을 받는다 → 스레드 호출과 합쳐도 초당 한도 안
+  EGW00201 을 받으면 스케줄러를 멈추고 다시 보낸다 (kis_auth._url_fetch 와 같은 규칙)
+- 인증 헤더·tr_id 변환·지연 시간 기록(latency_stats)도 kis_auth 것을 그대로 쓴다
+- iter_pages() : 연속조회(tr_cont / CTX_AREA_*) 페이지를 async for 로 (kis_domstk.iter_pages 와 같은 규칙)
+- gather() : 종목 여러 개를 동시에 → {종목: DataFrame | None(실패)}
+- fetch_many() : 동기 코드용 shim (이벤트 루프를 하나 돌려 gather 실행)
+
+    async with AsyncKIS() as api:
+        prices = await api.gather("get_inquire_price", ["005930", "000660"])
+
+    prices = fetch_many("get_inquire_price", ["005930", "000660"])      # 동기 호출부
+"""
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pandas as pd
+
+import kis_auth as kis
+from kis_rate import classify
+
+CONCURRENCY = int(os.getenv("KIS_ASYNC_CONCURRENCY", kis.POOL_SIZE))   # 동시에 보내는 요청 수
+
+
+def _verify():
+    """requests 와 같은 CA 번들 (REQUESTS_CA_BUNDLE) 을 쓰도록"""
+    bundle = os.getenv("REQUESTS_CA_BUNDLE") or os.getenv("SSL_CERT_FILE")
+    return ssl.create_default_context(cafile=bundle) if bundle else True
+
+
+def _frame(res, key: str, single: bool = False) -> pd.DataFrame:
+    data = getattr(res.getBody(), key)              # getBody() kis_auth.py 존재
+    return pd.DataFrame(data, index=[0]) if single else pd.DataFrame(data)
+
+
+def _now_hhmmss() -> str:
+    return datetime.now().strftime("%H%M%S")
+
+
+class AsyncKIS:
+    def __init__(self, concurrency: int = CONCURRENCY):
+        self.concurrency = concurrency
+        self.client: httpx.AsyncClient | None = None
+        self._sem = asyncio.Semaphore(concurrency)
+        self._auth_lock = asyncio.Lock()
+
+    async def open(self):
+        if kis._TRENV is None:
+            await asyncio.to_thread(kis.auth)
+        self.client = httpx.AsyncClient(
+            base_url=kis._TRENV.url,
+            limits=httpx.Limits(max_connections=self.concurrency,
+                                max_keepalive_connections=self.concurrency),
+            timeout=httpx.Timeout(kis.HTTP_TIMEOUT[1], connect=kis.HTTP_TIMEOUT[0]),
+            verify=_verify(),
+        )
+        return self
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _reauth(self):
+        """토큰 24시간 만료 시 재발급 — auth() 는 동기 POST + EGW00133 재시도 sleep 이 있어
+        루프를 막지 않게 스레드에서, 동시에 만료를 본 코루틴들은 한 번만 기다린다"""
+        if not kis._token_expired():
+            return
+        async with self._auth_lock:
+            if kis._token_expired():
+                await asyncio.to_thread(kis.auth, True)
+
+    # ── 공통 호출 ──
+    async def fetch(self, api_path, tr_id, tr_cont="", params=None, post=False,
+                    priority=None) -> kis.APIRespCompat:
+        """kis_auth._url_fetch 의 async 판"""
+        await self._reauth()
+        hdr = dict(kis._BASE_HEADERS)
+        tr_id = kis._resolve_tr_id(tr_id)
+        hdr.update({"tr_id": tr_id, "tr_cont": tr_cont, "custtype": "P"})
+        if priority is None:
+            priority = classify(api_path, post)
+        sched = kis._SCHED
+        async with self._sem:
+            for attempt in range(kis.RATE_RETRY + 1):
+                await sched.acquire_async(priority)
+                t0 = time.perf_counter()
+                try:
+                    resp = await (self.client.post(api_path, headers=hdr, content=json.dumps(params or {})) if post
+                                  else self.client.get(api_path, headers=hdr, params=params or {}))
+                except httpx.HTTPError:
+                    kis._record(tr_id, time.perf_counter() - t0, False)
+                    raise
+                kis._record(tr_id, time.perf_counter() - t0, resp.status_code == 200)
+                if not kis._rate_limited(resp) or attempt == kis.RATE_RETRY:
+                    break
+                sched.penalize()
+        return kis.APIRespCompat(resp)
+
+    async def iter_pages(self, url, tr_id, params, output="output1", tr_cont="",
+                         ctx=("CTX_AREA_FK100", "CTX_AREA_NK100"), max_pages=None):
+        """kis_domstk.iter_pages 의 async 판 — 페이지(레코드 list)를 async for 로 받는다"""
+        fk_key, nk_key = ctx
+        params = dict(params)
+        pages = 0
+        while True:
+            res = await self.fetch(url, tr_id, tr_cont, params)
+            body = res.getBody()
+            records = getattr(body, output) or []
+            yield records if isinstance(records, list) else [records]
+            pages += 1
+            tr_cont = res.getHeader().tr_cont
+            if tr_cont not in ("F", "M") or (max_pages is not None and pages >= max_pages):
+                return
+            params[fk_key] = getattr(body, fk_key.lower())
+            params[nk_key] = getattr(body, nk_key.lower())
+            tr_cont = "N"
+
+    async def gather(self, method, symbols, **kw) -> dict:
+        """종목마다 method(itm_no=종목, **kw) 를 동시에 → {종목: DataFrame | None}"""
+        fn = getattr(self, method) if isinstance(method, str) else method
+
+        async def one(code):
+            try:
+                return await fn(itm_no=code, **kw)
+            except Exception as e:                  # 오류 응답엔 output 이 없어 AttributeError
+                print(f"[kis-async] {code} 조회 실패: {e!r}")
+                return None
+
+        results = await asyncio.gather(*(one(c) for c in symbols))
+        return dict(zip(symbols, results))
+
+    # ── [국내주식] 기본시세 ──
+    async def get_inquire_price(self, div_code="J", itm_no="", tr_cont="", FK100="", NK100="", dataframe=None):  # 주식현재가 시세
+        res = await self.fetch('/uapi/domestic-stock/v1/quotations/inquire-price', "FHKST01010100", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no})
+        return _frame(res, "output", single=True)
+
+    async def get_inquire_ccnl(self, div_code="J", itm_no="", tr_cont="", FK100="", NK100="", dataframe=None):  # 주식현재가 체결
+        res = await self.fetch('/uapi/domestic-stock/v1/quotations/inquire-ccnl', "FHKST01010300", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no})
+        return _frame(res, "output")
+
+    async def get_inquire_daily_price(self, div_code="J", itm_no="", period_code="D", adj_prc_code="1", tr_cont="", FK100="", NK100="", dataframe=None):  # 주식현재가 일자별
+        res = await self.fetch('/uapi/domestic-stock/v1/quotations/inquire-daily-price', "FHKST01010400", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no,
+                                "FID_PERIOD_DIV_CODE": period_code, "FID_ORG_ADJ_PRC": adj_prc_code})
+        return _frame(res, "output")
+
+    async def get_inquire_asking_price_exp_ccn(self, output_dv='1', div_code="J", itm_no="", tr_cont="", FK100="", NK100="", dataframe=None):  # 주식현재가 호가/예상체결
+        res = await self.fetch('/uapi/domestic-stock/v1/quotations/inquire-asking-price-exp-ccn', "FHKST01010200", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no})
+        return _frame(res, "output1" if output_dv == "1" else "output2", single=True)   # 호가 / 예상체결가
+
+    async def get_inquire_investor(self, div_code="J", itm_no="", tr_cont="", FK100="", NK100="", dataframe=None):  # 주식현재가 투자자
+        res = await self.fetch('/uapi/domestic-stock/v1/quotations/inquire-investor', "FHKST01010900", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no})
+        return _frame(res, "output")
+
+    async def get_inquire_member(self, div_code="J", itm_no="", tr_cont="", FK100="", NK100="", dataframe=None):  # 주식현재가 회원사
+        res = await self.fetch('/uapi/domestic-stock/v1/quotations/inquire-member', "FHKST01010600", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no})
+        return _frame(res, "output", single=True)
+
+    async def get_inquire_daily_itemchartprice(self, output_dv="1", div_code="J", itm_no="", inqr_strt_dt=None, inqr_end_dt=None, period_code="D", adj_prc="1", tr_cont="", FK100="", NK100="", dataframe=None):  # 국내주식기간별시세(일/주/월/년)
+        if inqr_strt_dt is None:
+            inqr_strt_dt = (datetime.now() - timedelta(days=100)).strftime("%Y%m%d")
+        if inqr_end_dt is None:
+            inqr_end_dt = datetime.today().strftime("%Y%m%d")
+        res = await self.fetch('/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice', "FHKST03010100", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no,
+                                "FID_INPUT_DATE_1": inqr_strt_dt, "FID_INPUT_DATE_2": inqr_end_dt,
+                                "FID_PERIOD_DIV_CODE": period_code, "FID_ORG_ADJ_PRC": adj_prc})
+        return _frame(res, "output1", single=True) if output_dv == "1" else _frame(res, "output2")
+
+    async def get_inquire_time_itemconclusion(self, output_dv="1", div_code="J", itm_no="", inqr_hour=None, tr_cont="", FK100="", NK100="", dataframe=None):  # 주식현재가 당일시간대별체결
+        res = await self.fetch('/uapi/domestic-stock/v1/quotations/inquire-time-itemconclusion', "FHPST01060000", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no,
+                                "FID_INPUT_HOUR_1": inqr_hour or _now_hhmmss()})
+        return _frame(res, "output1", single=True) if output_dv == "1" else _frame(res, "output2")
+
+    async def get_inquire_daily_overtimeprice(self, output_dv="1", div_code="J", itm_no="", tr_cont="", FK100="", NK100="", dataframe=None):  # 주식현재가 시간외일자별주가
+        res = await self.fetch('/uapi/domestic-stock/v1/quotations/inquire-daily-overtimeprice', "FHPST02320000", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no})
+        return _frame(res, "output1", single=True) if output_dv == "1" else _frame(res, "output2")
+
+    async def get_inquire_time_itemchartprice(self, output_dv="1", div_code="J", itm_no="", inqr_hour=None, incu_yn="N", tr_cont="", FK100="", NK100="", dataframe=None):  # 주식당일분봉조회
+        res = await self.fetch('/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice', "FHKST03010200", tr_cont,
+                               {"FID_ETC_CLS_CODE": "", "FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no,
+                                "FID_INPUT_HOUR_1": inqr_hour or _now_hhmmss(), "FID_PW_DATA_INCU_YN": incu_yn})
+        return _frame(res, "output1", single=True) if output_dv == "1" else _frame(res, "output2")
+
+    async def get_inquire_daily_price_2(self, div_code="J", itm_no="", tr_cont="", FK100="", NK100="", dataframe=None):  # 주식현재가 시세2
+        res = await self.fetch('/uapi/domestic-stock/v1/quotations/inquire-price-2', "FHPST01010000", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no})
+        return _frame(res, "output", single=True)
+
+    async def get_quotations_inquire_price(self, div_code="J", itm_no="", tr_cont="", FK100="", NK100="", dataframe=None):  # ETF/ETN 현재가
+        res = await self.fetch('/uapi/etfetn/v1/quotations/inquire-price', "FHPST02400000", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no})
+        return _frame(res, "output", single=True)
+
+    async def get_quotations_nav_comparison_trend(self, output_dv="1", div_code="J", itm_no="", tr_cont="", FK100="", NK100="", dataframe=None):  # NAV 비교추이(종목)
+        res = await self.fetch('/uapi/etfetn/v1/quotations/nav-comparison-trend', "FHPST02440000", tr_cont,
+                               {"FID_COND_MRKT_DIV_CODE": div_code, "FID_INPUT_ISCD": itm_no})
+        return _frame(res, "output1" if output_dv == "1" else "output2", single=True)
+
+
+def fetch_many(method: str, symbols, concurrency: int = CONCURRENCY, **kw) -> dict:
+    """동기 호출부용 shim — 실행 중인 이벤트 루프 안에서는 await AsyncKIS().gather(...) 를 쓸 것"""
+    async def main():
+        async with AsyncKIS(concurrency) as api:
+            return await api.gather(method, list(symbols), **kw)
+    return asyncio.run(main())
+
+# ── 메인 실행부 ─────────────────────────────────────────────────
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="+", default=["005930", "000660"])
+    p.add_argument("--method", default="get_inquire_price")
+    args = p.parse_args()
+
+    t0 = time.perf_counter()
+    out = fetch_many(args.method, args.symbols)
+    for code, df in out.items():
+        print(code, "실패" if df is None else df.iloc[0].to_dict())
+    print(f"{len(out)}종목 {time.perf_counter() - t0:.2f}s  rate={kis.rate_stats()}")
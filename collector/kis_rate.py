@@ -0,0 +1,199 @@
+# collector/kis_rate.py
+"""
+KIS REST 호출 스케줄러 — 초당 호출 한도(token bucket) + 우선순위 대기열.
+
+- 계정 모드별 한도: 실전 KIS_RATE_REAL(기본 20/s), 모의 KIS_RATE_PAPER(기본 2/s)
+  버스트는 KIS_RATE_BURST (기본 1 — 게이트웨이는 최근 1초 창으로 세므로 몰아 보내면
+  창 경계에서 한도를 넘는다. 1 이면 1/rate 간격으로 고르게 나간다)
+- 실제 간격은 한도의 KIS_RATE_HEADROOM(기본 0.95) 배 — 네트워크 지터로 요청이
+  게이트웨이에 몰려 도착해도 1초 창에 한도+1 건이 들어가지 않게
+- 토큰이 없으면 호출 스레드는 대기열에 들어가고, 토큰이 생길 때마다
+  우선순위가 가장 높은(숫자가 작은) 대기자부터 깨운다: 주문 < 계좌조회 < 시세
+- 게이트웨이가 EGW00201(초당 거래건수 초과)을 돌려주면 penalize() 로 토큰을 비우고
+  cooldown 동안 아무도 보내지 않는다 (kis_auth._url_fetch 가 같은 우선순위로 재시도)
+- metrics() : 현재/최대 대기 수, 우선순위별 호출 수·평균/최대 대기 시간, 유량 초과 횟수
+
+    from kis_rate import get_scheduler, PRIORITY_ORDER
+    get_scheduler().acquire(PRIORITY_ORDER)
+    await get_scheduler().acquire_async(PRIORITY_QUOTE)    # asyncio 클라이언트 (kis_domstk_async)
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+
+PRIORITY_ORDER = 0                      # 주문/정정/취소
+PRIORITY_ACCOUNT = 1                    # 잔고·체결 등 계좌 조회
+PRIORITY_QUOTE = 2                      # 시세 조회
+PRIORITY_NAMES = {PRIORITY_ORDER: "order", PRIORITY_ACCOUNT: "account", PRIORITY_QUOTE: "quote"}
+
+RATE_LIMIT_CODE = "EGW00201"
+
+
+def default_rate(is_paper: bool) -> float:
+    quota = float(os.getenv("KIS_RATE_PAPER", 2) if is_paper else os.getenv("KIS_RATE_REAL", 20))
+    return quota * float(os.getenv("KIS_RATE_HEADROOM", 0.95))
+
+
+def classify(api_path: str, post: bool) -> int:
+    """API 경로로 우선순위 결정 (주문 POST > 계좌 조회 > 시세)"""
+    if "/trading/" in api_path:
+        return PRIORITY_ORDER if post else PRIORITY_ACCOUNT
+    return PRIORITY_QUOTE
+
+
+def _resolve(fut):
+    if not fut.done():
+        fut.set_result(None)
+
+
+class _WaitStats:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = self.max = 0.0
+
+
+class RateScheduler:
+    def __init__(self, rate: float, burst: float | None = None, cooldown: float = 1.0):
+        self.rate = rate
+        self.burst = max(1.0, burst or 1.0)
+        self.cooldown = cooldown
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._heap: list[tuple[int, int]] = []  # (priority, seq) — 대기 중인 호출
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._async_waiters: list = []          # (loop, future) — acquire_async 대기자 깨우기용
+        self.max_depth = 0
+        self.throttled = 0
+        self._stats = {p: _WaitStats() for p in PRIORITY_NAMES}
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def _enqueue(self, priority: int) -> tuple[int, int]:
+        me = (priority, next(self._seq))
+        heapq.heappush(self._heap, me)
+        self.max_depth = max(self.max_depth, len(self._heap))
+        return me
+
+    def _take(self, me: tuple[int, int]) -> float | None:
+        """내 차례이고 토큰이 있으면 가져가고 0 → 아니면 기다릴 시간 (None = 앞 순서가 끝날 때까지)"""
+        now = time.monotonic()
+        self._refill(now)
+        if self._heap[0] != me:
+            return None
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def _dequeue(self, me: tuple[int, int]):
+        self._heap.remove(me)
+        heapq.heapify(self._heap)
+        self._wake()                            # 다음 대기자가 자기 차례인지 확인
+
+    def _wake(self):
+        self._cond.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, fut in waiters:
+            loop.call_soon_threadsafe(_resolve, fut)
+
+    def _account(self, priority: int, waited: float):
+        st = self._stats.setdefault(priority, _WaitStats())
+        st.count += 1
+        st.total += waited
+        st.max = max(st.max, waited)
+
+    def acquire(self, priority: int = PRIORITY_QUOTE) -> float:
+        """토큰 하나를 얻을 때까지 대기 → 기다린 시간(초)"""
+        if self.rate <= 0:                      # 0 이하 = 제한 없음
+            return 0.0
+        t0 = time.monotonic()
+        with self._cond:
+            me = self._enqueue(priority)
+            try:
+                while (wait := self._take(me)) != 0.0:
+                    self._cond.wait(wait)
+            finally:
+                self._dequeue(me)
+        waited = time.monotonic() - t0
+        self._account(priority, waited)
+        return waited
+
+    async def acquire_async(self, priority: int = PRIORITY_QUOTE) -> float:
+        """acquire 의 asyncio 판 — 스레드 호출과 같은 버킷·대기열을 쓴다 (루프를 막지 않음)"""
+        if self.rate <= 0:
+            return 0.0
+        loop = asyncio.get_running_loop()
+        t0 = time.monotonic()
+        with self._cond:
+            me = self._enqueue(priority)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._take(me)
+                    if wait == 0.0:
+                        break
+                    fut = loop.create_future()
+                    self._async_waiters.append((loop, fut))
+                try:
+                    await asyncio.wait_for(fut, wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                self._dequeue(me)
+        waited = time.monotonic() - t0
+        self._account(priority, waited)
+        return waited
+
+    def penalize(self, seconds: float | None = None):
+        """유량 초과 응답을 받았을 때: 토큰을 비우고 cooldown 동안 전송 중지"""
+        with self._cond:
+            self.throttled += 1
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + (seconds or self.cooldown))
+            self._wake()
+
+    def depth(self) -> int:
+        return len(self._heap)
+
+    def metrics(self) -> dict:
+        with self._cond:
+            out = {
+                "rate": self.rate,
+                "depth": len(self._heap),
+                "max_depth": self.max_depth,
+                "throttled": self.throttled,
+            }
+        for p, st in self._stats.items():
+            if st.count:
+                out[PRIORITY_NAMES.get(p, str(p))] = {
+                    "count": st.count,
+                    "mean_wait_ms": round(st.total / st.count * 1e3, 1),
+                    "max_wait_ms": round(st.max * 1e3, 1),
+                }
+        return out
+
+
+_SCHEDULER: RateScheduler | None = None
+_LOCK = threading.Lock()
+
+
+def get_scheduler(is_paper: bool = False) -> RateScheduler:
+    """프로세스 공용 스케줄러 (처음 부를 때 계정 모드로 한도 결정)"""
+    global _SCHEDULER
+    with _LOCK:
+        if _SCHEDULER is None:
+            burst = os.getenv("KIS_RATE_BURST")
+            _SCHEDULER = RateScheduler(default_rate(is_paper), float(burst) if burst else None)
+        return _SCHEDULER
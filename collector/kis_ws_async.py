@@ -0,0 +1,321 @@
+# collector/kis_ws_async.py
+"""
+asyncio 실시간 수집기 — 이벤트 루프 하나가 여러 웹소켓 세션을 돌린다.
+
+kis_ws_client(websocket-client, 세션마다 스레드) 와 같은 일을 하되
+- approval_key 발급은 세션 수만큼 동시에 (requests 를 to_thread 로)
+- 세션마다 코루틴 하나: 접속 → 배정 종목 구독 → 수신 루프
+  · PINGPONG 은 그대로 돌려보내고, idle_timeout 동안 아무것도 안 오면 끊고 재접속
+  · 끊기면 지수 백오프 + jitter 후 재접속, 구독은 배정 목록으로 복원
+- 체결 프레임은 kis_ws_parser.Frame 으로 한 번만 파싱해 consumer 큐마다 넣는다
+  큐가 차면 가장 오래된 프레임을 버리고 dropped 로 센다 (수신 루프는 기다리지 않음)
+
+    python kis_ws_async.py --symbols 005930 000660 --sessions 1
+    python kis_ws_async.py --fake --symbols $(seq -f "%06g" 1 120)   # 로컬 가짜 서버
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import ssl
+
+import requests
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed, WebSocketException
+
+from kis_ws_parser import TR_TRADE, parse_frame
+from kis_ws_subscriptions import PER_SESSION, subscribe_message
+
+WS_URL = os.getenv("KIS_WS_URL", "wss://ops.koreainvestment.com:21000")
+
+
+def get_approval(app_key: str, app_secret: str, base_url: str) -> str:
+    res = requests.post(
+        f"{base_url}/oauth2/Approval",
+        headers={"content-type": "application/json"},
+        data=json.dumps({"grant_type": "client_credentials", "appkey": app_key, "secretkey": app_secret}),
+        timeout=10,
+    )
+    res.raise_for_status()
+    return res.json()["approval_key"]
+
+
+async def approval_keys(n: int, app_key: str, app_secret: str, base_url: str) -> list[str]:
+    """세션 수만큼 approval_key 를 동시에 발급"""
+    return await asyncio.gather(
+        *(asyncio.to_thread(get_approval, app_key, app_secret, base_url) for _ in range(n))
+    )
+
+# ── 세션 ────────────────────────────────────────────────────────
+class AsyncSession:
+    def __init__(self, index: int, collector: "AsyncCollector", approval_key: str):
+        self.index = index
+        self.collector = collector
+        self.approval_key = approval_key
+        self.symbols: set[str] = set()
+        self.acked: set[str] = set()
+        self.errors: dict[str, str] = {}
+        self.connects = 0
+        self.ws = None
+        self.task: asyncio.Task | None = None
+
+    async def send_sub(self, symbol: str, subscribe: bool = True):
+        if self.ws is None:
+            return                              # 접속되면 run() 에서 한꺼번에 보냄
+        try:
+            await self.ws.send(subscribe_message(self.approval_key, self.collector.tr_id, symbol, subscribe))
+        except ConnectionClosed:
+            pass                                # 재접속 후 복원
+
+    async def run(self):
+        c = self.collector
+        delay = c.backoff[0]
+        ssl_ctx = None
+        if c.url.startswith("wss"):
+            ssl_ctx = ssl.create_default_context()
+            ssl_ctx.check_hostname = False
+            ssl_ctx.verify_mode = ssl.CERT_NONE
+        while True:
+            try:
+                async with connect(c.url, ssl=ssl_ctx, ping_interval=None, max_queue=None) as ws:
+                    self.ws = ws
+                    self.connects += 1
+                    self.acked.clear()
+                    delay = c.backoff[0]
+                    for symbol in sorted(self.symbols):
+                        await ws.send(subscribe_message(self.approval_key, c.tr_id, symbol))
+                    print(f"[aws-{self.index}] 접속 #{self.connects}, {len(self.symbols)}종목 구독")
+                    await self._recv_loop(ws)
+            except asyncio.CancelledError:
+                raise
+            except (OSError, WebSocketException, asyncio.TimeoutError) as e:  # 핸드셰이크 실패(InvalidStatus 등) 포함
+                print(f"[aws-{self.index}] 연결 끊김: {e!r}")
+            except Exception as e:                  # 세션 태스크가 죽으면 그 세션 종목이 끊기므로 재시도
+                print(f"[aws-{self.index}] 예외: {e!r}")
+            finally:
+                self.ws = None
+            wait = delay * (0.5 + random.random())
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, c.backoff[1])
+
+    async def _recv_loop(self, ws):
+        c = self.collector
+        while True:
+            message = await asyncio.wait_for(ws.recv(), c.idle_timeout)
+            if message[:1] in ("0", "1"):
+                frame = parse_frame(message, c.tr_id)
+                if frame is not None:
+                    c.publish(frame)
+                continue
+            try:
+                msg = json.loads(message)
+            except ValueError:
+                print(f"[aws-{self.index}] 알 수 없는 메시지: {message[:80]}")
+                continue
+            header = msg.get("header", {})
+            if header.get("tr_id") == "PINGPONG":
+                await ws.send(message)
+                continue
+            body, key = msg.get("body", {}), header.get("tr_key", "")
+            msg1 = body.get("msg1", "").upper()
+            if body.get("rt_cd") == "0" or "ALREADY" in msg1:
+                if "UNSUBSCRIBE" in msg1:
+                    self.acked.discard(key)
+                else:
+                    self.acked.add(key)
+                    self.errors.pop(key, None)
+            elif body:
+                self.errors[key] = f"{body.get('msg_cd', '')} {body.get('msg1', '')}".strip()
+                print(f"[aws-{self.index}] 구독 오류 {key}: {self.errors[key]}")
+
+# ── 수집기 ──────────────────────────────────────────────────────
+class AsyncCollector:
+    """approval_key 하나당 세션 하나, 세션당 per_session 종목. consumer 는 asyncio.Queue 로 Frame 을 받는다"""
+
+    def __init__(self, approval_keys, url: str = WS_URL, tr_id: str = TR_TRADE,
+                 per_session: int = PER_SESSION, idle_timeout: float = 60.0, backoff=(1.0, 30.0)):
+        self.url = url
+        self.tr_id = tr_id
+        self.per_session = per_session
+        self.idle_timeout = idle_timeout
+        self.backoff = backoff
+        self.sessions = [AsyncSession(i, self, key) for i, key in enumerate(approval_keys)]
+        self.pending: list[str] = []
+        self._where: dict[str, AsyncSession] = {}
+        self._queues: list[asyncio.Queue] = []
+        self.frames = 0
+        self.dropped = 0
+        self._started = False
+
+    def consumer(self, maxsize: int = 10_000) -> asyncio.Queue:
+        q = asyncio.Queue(maxsize)
+        self._queues.append(q)
+        return q
+
+    def publish(self, frame):
+        self.frames += 1
+        for q in self._queues:
+            if q.full():
+                q.get_nowait()                  # 느린 consumer 때문에 수신이 멈추지 않게 가장 오래된 것을 버림
+                self.dropped += 1
+            q.put_nowait(frame)
+
+    async def subscribe(self, symbols) -> list[str]:
+        for symbol in symbols:
+            if symbol in self._where or symbol in self.pending:
+                continue
+            room = [s for s in self.sessions if len(s.symbols) < self.per_session]
+            if not room:
+                self.pending.append(symbol)
+                continue
+            session = room[0]
+            session.symbols.add(symbol)
+            self._where[symbol] = session
+            if self._started and session.task is None:
+                self._spawn(session)
+            else:
+                await session.send_sub(symbol)
+        if self.pending:
+            print(f"[aws] 세션 한도 초과: {len(self.pending)}종목 대기")
+        return list(self.pending)
+
+    async def unsubscribe(self, symbols):
+        for symbol in symbols:
+            if symbol in self.pending:
+                self.pending.remove(symbol)
+                continue
+            session = self._where.pop(symbol, None)
+            if session is not None:
+                session.symbols.discard(symbol)
+                session.acked.discard(symbol)
+                await session.send_sub(symbol, False)
+        waiting, self.pending = self.pending, []
+        if waiting:
+            await self.subscribe(waiting)
+
+    def _spawn(self, session: AsyncSession):
+        session.task = asyncio.create_task(session.run(), name=f"kis-aws-{session.index}")
+
+    def start(self):
+        """배정된 종목이 있는 세션만 시작 (이벤트 루프 안에서 호출). 나머지는 종목이 배정될 때 시작"""
+        self._started = True
+        for s in self.sessions:
+            if s.symbols and s.task is None:
+                self._spawn(s)
+        return self
+
+    async def stop(self):
+        tasks = [s.task for s in self.sessions if s.task is not None]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for s in self.sessions:
+            s.task = None
+        self._started = False
+
+    def stats(self) -> dict:
+        return {
+            "sessions": sum(1 for s in self.sessions if s.task is not None),
+            "symbols": len(self._where),
+            "pending": len(self.pending),
+            "acked": sum(len(s.acked) for s in self.sessions),
+            "connects": sum(s.connects for s in self.sessions),
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "backlog": max((q.qsize() for q in self._queues), default=0),
+        }
+
+# ── consumer 예시 ───────────────────────────────────────────────
+async def print_prices(q: asyncio.Queue):
+    while True:
+        frame = await q.get()
+        for rec in frame.records:
+            print(f"{rec.mksc_shrn_iscd} {rec.stck_cntg_hour} 현재가: {rec.stck_prpr} 원")
+
+
+async def feed_ticks(q: asyncio.Queue, store):
+    """tick_store.TickStore 로 전달 (put 은 버퍼에 넣기만 하므로 루프를 막지 않음)"""
+    while True:
+        store.on_message(await q.get())
+
+
+async def feed_bars(q: asyncio.Queue, aggregator):
+    """intraday.BarAggregator — 집계는 루프에서, 저장(writer)은 스레드에서.
+    sweep 은 로컬 시계 기준이지만 닫힌 봉에 늦게 온 틱은 집계기가 late 로 버린다."""
+    from intraday import KST
+    from datetime import datetime
+    while True:
+        aggregator.on_message(await q.get())
+        aggregator.maybe_flush(datetime.now(KST))
+
+
+async def main(args):
+    fake = None
+    if args.fake:
+        from fake_kis_ws import FakeKISServer
+        fake = FakeKISServer(interval=args.fake_interval).start()
+        url, keys = fake.url, [f"fake-{i}" for i in range(args.sessions)]
+    else:
+        mode = os.getenv("KIS_MODE", "real").lower()
+        paper = mode in ("paper", "vps")
+        url = args.url
+        keys = await approval_keys(
+            args.sessions,
+            os.environ["APP_KEY_PAPER" if paper else "APP_KEY_REAL"],
+            os.environ["APP_SECRET_PAPER" if paper else "APP_SECRET_REAL"],
+            os.environ["KIS_API_VPS" if paper else "KIS_API_REAL"],
+        )
+
+    collector = AsyncCollector(keys, url)
+    await collector.subscribe(args.symbols)
+    consumers = [asyncio.create_task(print_prices(collector.consumer()))] if args.print else []
+
+    ticks = bars = None
+    if os.getenv("TICK_STORE"):
+        from tick_store import from_env
+        ticks = from_env()
+        consumers.append(asyncio.create_task(feed_ticks(collector.consumer(), ticks)))
+    if os.getenv("INTRADAY_BARS") == "1":
+        from concurrent.futures import ThreadPoolExecutor
+        from intraday import BarAggregator, save_bars
+        pool = ThreadPoolExecutor(1, thread_name_prefix="bar-writer")   # 순서 유지, 루프는 DB 를 기다리지 않음
+        bars = BarAggregator(writer=lambda b: pool.submit(save_bars, b))
+        consumers.append(asyncio.create_task(feed_bars(collector.consumer(), bars)))
+
+    collector.start()
+    try:
+        while True:
+            await asyncio.sleep(args.report)
+            print("collector:", collector.stats())
+            if ticks is not None:
+                print("tick_store:", ticks.metrics())
+    finally:
+        await collector.stop()
+        for t in consumers:
+            t.cancel()
+        if ticks is not None:
+            ticks.stop()
+        if bars is not None:
+            bars.close()
+            pool.shutdown(wait=True)
+        if fake is not None:
+            fake.stop()
+
+# ── 메인 실행부 ─────────────────────────────────────────────────
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="+", default=[os.getenv("KIS_WS_SYMBOLS", "005930")])
+    p.add_argument("--sessions", type=int, default=1, help="approval keys / connections (41 symbols each)")
+    p.add_argument("--url", default=WS_URL)
+    p.add_argument("--report", type=float, default=60.0, help="seconds between stats lines")
+    p.add_argument("--no-print", dest="print", action="store_false", help="do not print every trade")
+    p.add_argument("--fake", action="store_true", help="run against a local fake_kis_ws server")
+    p.add_argument("--fake-interval", type=float, default=0.5)
+    args = p.parse_args()
+    args.symbols = [s for arg in args.symbols for s in arg.split(",") if s]
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        print("종료 요청됨")
@@ -3,19 +3,31 @@ import os
 import json
 import time
 import threading
-from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from zoneinfo import ZoneInfo
 
 import asyncio
 
 import requests
-import websocket
-import ssl
+
+from kis_ws_parser import parse_frame
+from kis_ws_subscriptions import SubscriptionManager
 
 # ────────────── 환경 변수 ──────────────
 
 STOCK_CODE = "005930" # 향후 종목 서치 기능으로 전환할 예정
+STOCK_CODES = [c for c in os.getenv("KIS_WS_SYMBOLS", STOCK_CODE).split(",") if c]  # 쉼표 구분
+WS_URL = os.getenv("KIS_WS_URL", "wss://ops.koreainvestment.com:21000")
+WS_SESSIONS = int(os.getenv("KIS_WS_SESSIONS", "1"))  # 세션(approval_key)당 41종목
 KIS_MODE = "real" # virture이면 가상 설정 가능
 KIS_PROD_CODE="01"
+INTRADAY_BARS = os.getenv("INTRADAY_BARS") == "1"  # 1이면 체결 틱으로 분봉 집계 → IntradayBar 저장
+BARS = None  # intraday.BarAggregator (진입점에서 생성)
+TICKS = None  # tick_store.TickStore (TICK_STORE=db|segments 일 때)
+BARS_LOCK = threading.Lock()
+BAR_WRITER = None  # 분봉 저장 스레드 (콜백 스레드는 DB 를 기다리지 않음)
+KST = ZoneInfo("Asia/Seoul")
 
 if KIS_MODE == "real":
     APP_KEY = "PS37wzsl8l576b6HpO0g5GulicDXoUvPPMbt"
@@ -44,66 +56,30 @@ def get_approval(key, secret):
     return res.json()["approval_key"]
 
 # 실시간 체결 데이터에서 현재가 출력
-def show_current_price(data):
-    values = data.split("^")
-    if len(values) > 2:
-        print(f"현재가: {values[2]} 원")
-    else:
-        print("현재가 데이터 누락")
-
-# 웹소켓 콜백
-def on_open(ws):
-    print("WebSocket 연결 성공")
-    sub_msg = {
-        "header": {
-            "approval_key": APPROVAL_KEY,
-            "custtype": "P",
-            "tr_type": "1",
-            "content-type": "utf8",
-        },
-        "body": {
-            "input": {
-                "tr_id": "H0STCNT0",
-                "tr_key": STOCK_CODE,
-            }
-        }
-    }
-    ws.send(json.dumps(sub_msg))
-    print("구독 요청 전송:", sub_msg)
+def show_current_price(frame):
+    for rec in frame.records:  # data_cnt > 1 이면 레코드가 여러 개
+        print(f"현재가: {rec.stck_prpr} 원")
 
+# 웹소켓 콜백 (세션 스레드마다 호출됨)
 def on_message(ws, message):
     if message.startswith("0|"):  # 실시간 데이터
-        parts = message.split("|")
-        if len(parts) >= 4 and parts[1] == "H0STCNT0":
-            data_cnt = int(parts[2])
-            show_current_price(parts[3])
-    else:
-        print("기타 수신 데이터:", message)
-
-def on_error(ws, error):
-    print("WebSocket 에러:", error)
-
-def on_close(ws, code, msg):
-    print(f"🔌 WebSocket 종료 code={code}, msg={msg}")
+        frame = parse_frame(message)
+        if frame is not None:  # H0STCNT0 체결
+            show_current_price(frame)
+            if TICKS is not None:
+                TICKS.on_message(frame)  # 버퍼에 넣기만 함 (DB 쓰기는 writer 스레드)
+            if BARS is not None:
+                with BARS_LOCK:  # 세션이 여럿이면 콜백 스레드도 여럿
+                    BARS.on_message(frame)
+                    BARS.maybe_flush(datetime.now(KST))
 
 # WebSocket 실행 함수
 def run_ws():
-    host = "wss://ops.koreainvestment.com:21000"
-    auth = f"{APP_KEY}|{APP_SECRET}|{APPROVAL_KEY}"
-    query = (
-        f"?authorization={quote(auth)}"
-        f"&tr_type=1&tr_id=H0STCNT0&custtype=P"
-        f"&tr_key={STOCK_CODE}&content-type=utf8"
-    )
-    ws = websocket.WebSocketApp(
-        host + query,
-        on_open=on_open,
-        on_message=on_message,
-        on_error=on_error,
-        on_close=on_close
-    )
-    threading.Thread(target=lambda: ws.run_forever(sslopt={"cert_reqs": ssl.CERT_NONE}), daemon=True).start()
-    return ws
+    """종목을 세션(접속당 41건)에 나눠 구독. 재접속 시 구독은 관리자가 복원"""
+    keys = [APPROVAL_KEY] + [get_approval(APP_KEY, APP_SECRET) for _ in range(WS_SESSIONS - 1)]
+    mgr = SubscriptionManager(keys, url=WS_URL, on_data=lambda message: on_message(None, message))
+    mgr.subscribe(STOCK_CODES)
+    return mgr.start()
 
 # ────────────── 진입점 ──────────────
 if __name__ == "__main__":
@@ -111,10 +87,32 @@ if __name__ == "__main__":
     APPROVAL_KEY = get_approval(APP_KEY, APP_SECRET)
     print("approval_key:", APPROVAL_KEY)
 
+    if INTRADAY_BARS:
+        from intraday import BarAggregator, save_bars
+        BAR_WRITER = ThreadPoolExecutor(1, thread_name_prefix="bar-writer")  # 순서 유지
+        BARS = BarAggregator(writer=lambda b: BAR_WRITER.submit(save_bars, b))
+    if os.getenv("TICK_STORE"):
+        from tick_store import from_env
+        TICKS = from_env()
+
     ws_client = run_ws()
     try:
+        last_report = time.monotonic()
         while True:
             time.sleep(1)
+            if time.monotonic() - last_report >= 60:
+                print("subscriptions:", ws_client.stats())
+                if TICKS is not None:
+                    print("tick_store:", TICKS.metrics())
+                last_report = time.monotonic()
     except KeyboardInterrupt:
         print("종료 요청됨")
-        ws_client.close()
\ No newline at end of file
+        ws_client.stop()
+        if TICKS is not None:
+            TICKS.stop()
+            print("tick_store:", TICKS.metrics())
+        if BARS is not None:
+            with BARS_LOCK:
+                saved = BARS.close()
+            BAR_WRITER.shutdown(wait=True)
+            print(f"분봉 저장: {saved}개 (누적 {BARS.stats})")
\ No newline at end of file
@@ -0,0 +1,243 @@
+# collector/kis_ws_parser.py
+"""
+KIS 실시간 체결가(H0STCNT0) 프레임 파서.
+
+프레임 형식:  <암호화 0|1>|<tr_id>|<data_cnt>|<f0^f1^ ... ^f(46*data_cnt-1)>
+한 메시지에 체결 레코드가 data_cnt 개 이어 붙어 올 수 있다 (필드 46개씩).
+
+- parse_frame(msg)  → Frame(tr_id, count, records)  — 레코드는 TradeRecord 뷰
+  '|' 는 앞 3개만, '^' 는 한 번만 split 하고, 레코드는 그 리스트를 offset 으로 가리킨다
+  (레코드마다 슬라이스 복사 없음). 필드는 속성 접근 시점에 타입 변환.
+- TradeRecord.values() / as_dict() → 46개 필드 전부 타입 변환
+- parse_array(msg | [msg, ...]) → NumPy structured array (레코드 1행, 본문을 한 번에 split → 컬럼별 일괄 변환)
+
+    bench: python bench/bench_ws_parser.py
+"""
+from operator import itemgetter
+
+import numpy as np
+
+TR_TRADE = "H0STCNT0"
+
+# (필드명, 타입) — KIS 국내주식 실시간체결가 응답 순서 그대로
+FIELDS = [
+    ("mksc_shrn_iscd", str),                  # 유가증권 단축 종목코드
+    ("stck_cntg_hour", str),                  # 주식 체결 시간 (HHMMSS)
+    ("stck_prpr", int),                       # 주식 현재가
+    ("prdy_vrss_sign", str),                  # 전일 대비 부호
+    ("prdy_vrss", int),                       # 전일 대비
+    ("prdy_ctrt", float),                     # 전일 대비율
+    ("wghn_avrg_stck_prc", float),            # 가중 평균 주식 가격
+    ("stck_oprc", int),                       # 주식 시가
+    ("stck_hgpr", int),                       # 주식 최고가
+    ("stck_lwpr", int),                       # 주식 최저가
+    ("askp1", int),                           # 매도호가1
+    ("bidp1", int),                           # 매수호가1
+    ("cntg_vol", int),                        # 체결 거래량
+    ("acml_vol", int),                        # 누적 거래량
+    ("acml_tr_pbmn", int),                    # 누적 거래 대금
+    ("seln_cntg_csnu", int),                  # 매도 체결 건수
+    ("shnu_cntg_csnu", int),                  # 매수 체결 건수
+    ("ntby_cntg_csnu", int),                  # 순매수 체결 건수
+    ("cttr", float),                          # 체결강도
+    ("seln_cntg_smtn", int),                  # 총 매도 수량
+    ("shnu_cntg_smtn", int),                  # 총 매수 수량
+    ("ccld_dvsn", str),                       # 체결구분 (1 매수, 3 장전, 5 매도)
+    ("shnu_rate", float),                     # 매수비율
+    ("prdy_vol_vrss_acml_vol_rate", float),   # 전일 거래량 대비 등락율
+    ("oprc_hour", str),                       # 시가 시간
+    ("oprc_vrss_prpr_sign", str),             # 시가대비구분
+    ("oprc_vrss_prpr", int),                  # 시가대비
+    ("hgpr_hour", str),                       # 최고가 시간
+    ("hgpr_vrss_prpr_sign", str),             # 고가대비구분
+    ("hgpr_vrss_prpr", int),                  # 고가대비
+    ("lwpr_hour", str),                       # 최저가 시간
+    ("lwpr_vrss_prpr_sign", str),             # 저가대비구분
+    ("lwpr_vrss_prpr", int),                  # 저가대비
+    ("bsop_date", str),                       # 영업 일자 (YYYYMMDD)
+    ("new_mkop_cls_code", str),               # 신 장운영 구분 코드
+    ("trht_yn", str),                         # 거래정지 여부
+    ("askp_rsqn1", int),                      # 매도호가 잔량1
+    ("bidp_rsqn1", int),                      # 매수호가 잔량1
+    ("total_askp_rsqn", int),                 # 총 매도호가 잔량
+    ("total_bidp_rsqn", int),                 # 총 매수호가 잔량
+    ("vol_tnrt", float),                      # 거래량 회전율
+    ("prdy_smns_hour_acml_vol", int),         # 전일 동시간 누적 거래량
+    ("prdy_smns_hour_acml_vol_rate", float),  # 전일 동시간 누적 거래량 비율
+    ("hour_cls_code", str),                   # 시간 구분 코드 (0 장중, A 장후예상, B 장전예상, ...)
+    ("mrkt_trtm_cls_code", str),              # 임의종료구분코드
+    ("vi_stnd_prc", int),                     # 정적VI발동기준가
+]
+NAMES = [name for name, _ in FIELDS]
+N_FIELDS = len(FIELDS)                        # 46
+INDEX = {name: i for i, name in enumerate(NAMES)}
+
+
+STR_IDX = [i for i, (_, t) in enumerate(FIELDS) if t is str]
+INT_IDX = [i for i, (_, t) in enumerate(FIELDS) if t is int]
+FLOAT_IDX = [i for i, (_, t) in enumerate(FIELDS) if t is float]
+_get_str, _get_int, _get_float = (itemgetter(*idx) for idx in (STR_IDX, INT_IDX, FLOAT_IDX))
+_ORDER = itemgetter(*np.argsort(STR_IDX + INT_IDX + FLOAT_IDX).tolist())  # (str…, int…, float…) → 필드 순서
+
+
+def _int(s: str) -> int:
+    return int(s) if s else 0                 # 장전/시간외 프레임은 일부 숫자 필드가 빈 문자열
+
+
+def _float(s: str) -> float:
+    return float(s) if s else 0.0
+
+
+def decode(values: list, offset: int = 0) -> tuple:
+    """레코드 하나의 46개 필드 → 타입 변환된 tuple (FIELDS 순서)
+
+    타입별로 itemgetter + map 으로 한 번에 변환하고 (C 레벨 루프), 빈 필드가 있어
+    실패하면 필드별로 다시 변환한다.
+    """
+    rec = values[offset : offset + N_FIELDS] if offset or len(values) != N_FIELDS else values
+    try:
+        ints = tuple(map(int, _get_int(rec)))
+        floats = tuple(map(float, _get_float(rec)))
+    except ValueError:
+        ints = tuple(map(_int, _get_int(rec)))
+        floats = tuple(map(_float, _get_float(rec)))
+    return _ORDER(_get_str(rec) + ints + floats)
+
+# ── 레코드 뷰 ───────────────────────────────────────────────────
+class TradeRecord:
+    """'^' split 결과 리스트의 한 레코드 구간을 가리키는 뷰. 속성 접근 시 타입 변환"""
+    __slots__ = ("_v", "_o")
+
+    def __init__(self, values: list, offset: int = 0):
+        self._v = values
+        self._o = offset
+
+    def raw(self, name: str) -> str:
+        return self._v[self._o + INDEX[name]]
+
+    def values(self) -> tuple:
+        return decode(self._v, self._o)
+
+    def as_dict(self) -> dict:
+        return dict(zip(NAMES, self.values()))
+
+    def __repr__(self):
+        return f"TradeRecord({self.mksc_shrn_iscd} {self.stck_cntg_hour} {self.stck_prpr})"
+
+
+def _field(i: int, t):
+    if t is str:
+        def get(self):
+            return self._v[self._o + i]
+    elif t is int:
+        def get(self):
+            s = self._v[self._o + i]
+            return int(s) if s else 0
+    else:
+        def get(self):
+            s = self._v[self._o + i]
+            return float(s) if s else 0.0
+    return property(get)
+
+
+for _i, (_name, _t) in enumerate(FIELDS):
+    setattr(TradeRecord, _name, _field(_i, _t))
+del _i, _name, _t
+
+
+class Frame:
+    __slots__ = ("tr_id", "encrypted", "count", "records")
+
+    def __init__(self, tr_id, encrypted, count, records):
+        self.tr_id, self.encrypted, self.count, self.records = tr_id, encrypted, count, records
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return self.count
+
+# ── 파서 ────────────────────────────────────────────────────────
+def split_frame(message: str):
+    """'0|tr_id|cnt|body' → (encrypted, tr_id, cnt, body). 실시간 데이터가 아니면 None
+
+    JSON 제어 메시지(구독 응답, PINGPONG)는 '{' 로 시작하므로 첫 글자만 보고 거른다.
+    """
+    head = message[:1]
+    if head != "0" and head != "1":
+        return None
+    parts = message.split("|", 3)
+    if len(parts) < 4:
+        return None
+    return head == "1", parts[1], int(parts[2]), parts[3]
+
+
+def parse_frame(message: str, tr_id: str = TR_TRADE) -> Frame | None:
+    """체결 프레임 → Frame (tr_id 가 다르거나 암호화 프레임이면 None)"""
+    split = split_frame(message)
+    if split is None:
+        return None
+    encrypted, tid, count, body = split
+    if tid != tr_id or encrypted:
+        return None
+    values = body.split("^")
+    if len(values) < count * N_FIELDS:
+        raise ValueError(f"{tid}: data_cnt={count} 인데 필드 {len(values)}개")
+    if count == 1:
+        records = [TradeRecord(values)]
+    else:
+        records = [TradeRecord(values, k * N_FIELDS) for k in range(count)]
+    return Frame(tid, encrypted, count, records)
+
+# ── NumPy structured array ──────────────────────────────────────
+_STR_WIDTH = {
+    "mksc_shrn_iscd": 9, "stck_cntg_hour": 6, "bsop_date": 8,
+    "oprc_hour": 6, "hgpr_hour": 6, "lwpr_hour": 6, "new_mkop_cls_code": 2,
+}
+DTYPE = np.dtype([
+    (name, f"U{_STR_WIDTH.get(name, 1)}" if t is str else (np.int64 if t is int else np.float64))
+    for name, t in FIELDS
+])
+
+
+def parse_array(messages) -> np.ndarray:
+    """프레임 하나 또는 여러 개 → DTYPE structured array (레코드당 1행)
+
+    프레임 본문을 '^' 로 이어 붙여 한 번만 split 하고, 46 간격 slice 로 컬럼을 꺼내
+    컬럼마다 NumPy 로 한 번에 변환한다. 빈 숫자 필드는 0.
+    (U 문자열 2차원 배열로 reshape 후 astype 하는 방식은 문자열 배열 생성이 더 느렸다)
+    """
+    if isinstance(messages, str):
+        messages = [messages]
+    bodies = []
+    for msg in messages:
+        split = split_frame(msg)
+        if split is None or split[1] != TR_TRADE or split[0]:
+            continue
+        count, body = split[2], split[3]
+        n_values = body.count("^") + 1
+        if n_values < count * N_FIELDS:
+            raise ValueError(f"{TR_TRADE}: data_cnt={count} 인데 필드 {n_values}개")
+        if n_values > count * N_FIELDS:       # 뒤에 붙은 여분 필드는 잘라 레코드 경계를 맞춘다
+            body = "^".join(body.split("^")[: count * N_FIELDS])
+        bodies.append(body)
+
+    if not bodies:
+        return np.empty(0, dtype=DTYPE)
+    values = "^".join(bodies).split("^")
+    n = len(values) // N_FIELDS
+    out = np.empty(n, dtype=DTYPE)
+    for i, (name, t) in enumerate(FIELDS):
+        col = values[i::N_FIELDS]                 # 레코드 경계가 46 단위라 stride slice 가 곧 컬럼
+        if t is str:
+            out[name] = col
+        elif t is int:
+            arr = np.fromstring(" ".join(col), dtype=np.int64, sep=" ")
+            # 빈 필드는 공백 구분에서 사라져 길이가 줄어든다 → 그 컬럼만 필드별 변환
+            out[name] = arr if len(arr) == n else np.fromiter(map(_int, col), np.int64, n)
+        else:
+            try:
+                out[name] = np.array(col, dtype=np.float64)
+            except ValueError:
+                out[name] = np.fromiter(map(_float, col), np.float64, n)
+    return out
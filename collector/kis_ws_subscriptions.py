@@ -0,0 +1,267 @@
+# collector/kis_ws_subscriptions.py
+"""
+KIS 실시간 구독 관리자 — 여러 웹소켓 세션에 종목을 나눠 담고, 런타임 구독/해지와
+재접속 후 구독 복원을 맡는다.
+
+- KIS 는 세션(접속) 하나에 실시간 등록을 41건까지 허용한다 (PER_SESSION).
+  종목은 여유가 가장 많은 세션에 배정하고, 세션이 다 차면 새 세션을 연다
+  (approval_key 수 = 최대 세션 수). 자리가 없으면 pending 에 두었다가 해지로 빈자리가 나면 배정.
+- 세션은 자기 스레드에서 run_forever 를 돌리고, 끊기면 지수 백오프(+jitter) 후 다시 접속해
+  on_open 에서 배정된 종목을 전부 다시 구독한다.
+- 서버 JSON 응답: PINGPONG 은 그대로 돌려보내고, 구독 응답(rt_cd)은 acked / errors 로 기록.
+- ws_factory 로 WebSocketApp 대신 다른 구현을 넣을 수 있다 (fake_kis_ws.py 로 로컬 확인).
+
+    mgr = SubscriptionManager([approval_key], on_data=handle_frame).start()
+    mgr.subscribe(["005930", "000660"])
+    mgr.unsubscribe(["000660"])
+"""
+import json
+import random
+import ssl
+import threading
+import time
+
+import websocket
+
+WS_URL_REAL = "ws://ops.koreainvestment.com:21000"
+WS_URL_PAPER = "ws://ops.koreainvestment.com:31000"
+PER_SESSION = 41                       # KIS 세션당 실시간 등록 한도
+TR_TRADE = "H0STCNT0"
+
+
+def subscribe_message(approval_key: str, tr_id: str, tr_key: str, subscribe: bool = True) -> str:
+    return json.dumps({
+        "header": {
+            "approval_key": approval_key,
+            "custtype": "P",
+            "tr_type": "1" if subscribe else "2",       # 1 등록, 2 해제
+            "content-type": "utf8",
+        },
+        "body": {"input": {"tr_id": tr_id, "tr_key": tr_key}},
+    })
+
+
+def default_factory(url, on_open, on_message, on_error, on_close):
+    return websocket.WebSocketApp(url, on_open=on_open, on_message=on_message,
+                                  on_error=on_error, on_close=on_close)
+
+# ── 세션 ────────────────────────────────────────────────────────
+class Session:
+    """웹소켓 접속 하나 + 그 접속에 배정된 종목 집합"""
+
+    def __init__(self, index: int, url: str, approval_key: str, tr_id: str, on_data,
+                 ws_factory=default_factory, backoff=(1.0, 30.0)):
+        self.index = index
+        self.url = url
+        self.approval_key = approval_key
+        self.tr_id = tr_id
+        self.on_data = on_data
+        self.ws_factory = ws_factory
+        self.backoff = backoff
+        self.symbols: set[str] = set()          # 배정된(원하는) 종목 — 재접속 시 이 목록으로 복원
+        self.acked: set[str] = set()            # 현재 접속에서 서버가 등록을 확인한 종목
+        self.errors: dict[str, str] = {}
+        self.connects = 0
+        self.connected = threading.Event()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ws = None
+        self._thread = threading.Thread(target=self._run, name=f"kis-ws-{index}", daemon=True)
+
+    # ── 구독 ──
+    def add(self, symbol: str):
+        with self._lock:
+            self.symbols.add(symbol)
+        self._send(symbol, True)
+
+    def remove(self, symbol: str):
+        with self._lock:
+            self.symbols.discard(symbol)
+            self.acked.discard(symbol)
+        self._send(symbol, False)
+
+    def _send(self, symbol: str, subscribe: bool):
+        ws = self._ws
+        if ws is None or not self.connected.is_set():
+            return                              # 접속되면 on_open 에서 한꺼번에 보냄
+        try:
+            ws.send(subscribe_message(self.approval_key, self.tr_id, symbol, subscribe))
+        except Exception as e:                  # 끊기는 중이면 재접속 후 복원된다
+            print(f"[ws-{self.index}] 구독 전송 실패 {symbol}: {e!r}")
+
+    # ── 콜백 ──
+    def _on_open(self, ws):
+        self.connects += 1
+        self.acked.clear()
+        self.connected.set()
+        with self._lock:
+            symbols = sorted(self.symbols)
+        for symbol in symbols:
+            ws.send(subscribe_message(self.approval_key, self.tr_id, symbol))
+        print(f"[ws-{self.index}] 접속 #{self.connects}, {len(symbols)}종목 구독")
+
+    def _on_message(self, ws, message):
+        if message[:1] in ("0", "1"):           # 실시간 데이터 프레임
+            self.on_data(message)
+            return
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            print(f"[ws-{self.index}] 알 수 없는 메시지: {message[:80]}")
+            return
+        header = msg.get("header", {})
+        if header.get("tr_id") == "PINGPONG":
+            ws.send(message)                    # KIS 는 받은 PINGPONG 을 그대로 돌려받아야 접속 유지
+            return
+        body = msg.get("body", {})
+        key = header.get("tr_key", "")
+        if body.get("rt_cd") == "0" or "ALREADY" in body.get("msg1", "").upper():
+            if "UNSUBSCRIBE" in body.get("msg1", "").upper():
+                self.acked.discard(key)
+            else:
+                self.acked.add(key)
+                self.errors.pop(key, None)
+        elif body:
+            self.errors[key] = f"{body.get('msg_cd', '')} {body.get('msg1', '')}".strip()
+            print(f"[ws-{self.index}] 구독 오류 {key}: {self.errors[key]}")
+
+    def _on_error(self, ws, error):
+        print(f"[ws-{self.index}] 에러: {error!r}")
+
+    def _on_close(self, ws, code, msg):
+        self.connected.clear()
+        self.acked.clear()
+
+    # ── 접속 루프 ──
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        delay = self.backoff[0]
+        while not self._stop.is_set():
+            self._ws = self.ws_factory(self.url, self._on_open, self._on_message,
+                                       self._on_error, self._on_close)
+            connects = self.connects
+            sslopt = {"cert_reqs": ssl.CERT_NONE} if self.url.startswith("wss") else None
+            try:
+                self._ws.run_forever(sslopt=sslopt)
+            except Exception as e:
+                print(f"[ws-{self.index}] run_forever 예외: {e!r}")
+            self.connected.clear()
+            if self._stop.is_set():
+                break
+            if self.connects > connects:        # 한 번이라도 붙었으면 백오프 초기화
+                delay = self.backoff[0]
+            wait = delay * (0.5 + random.random())
+            print(f"[ws-{self.index}] 연결 끊김 → {wait:.1f}s 후 재접속")
+            self._stop.wait(wait)
+            delay = min(delay * 2, self.backoff[1])
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+# ── 관리자 ──────────────────────────────────────────────────────
+class SubscriptionManager:
+    """종목 → 세션 배정. approval_keys 하나당 세션 하나 (같은 키를 여러 번 넣어도 됨)"""
+
+    def __init__(self, approval_keys, url: str = WS_URL_REAL, tr_id: str = TR_TRADE,
+                 on_data=None, per_session: int = PER_SESSION, ws_factory=default_factory,
+                 backoff=(1.0, 30.0)):
+        if isinstance(approval_keys, str):
+            approval_keys = [approval_keys]
+        self.approval_keys = list(approval_keys)
+        self.url = url
+        self.tr_id = tr_id
+        self.on_data = on_data or (lambda message: None)
+        self.per_session = per_session
+        self.ws_factory = ws_factory
+        self.backoff = backoff
+        self.sessions: list[Session] = []
+        self.pending: list[str] = []            # 자리가 없어 아직 배정 못 한 종목 (순서 유지)
+        self._where: dict[str, Session] = {}
+        self._lock = threading.Lock()
+        self._started = False
+
+    @property
+    def capacity(self) -> int:
+        return len(self.approval_keys) * self.per_session
+
+    def _session_with_room(self) -> Session | None:
+        open_ = [s for s in self.sessions if len(s.symbols) < self.per_session]
+        if open_:
+            return min(open_, key=lambda s: len(s.symbols))
+        if len(self.sessions) < len(self.approval_keys):
+            s = Session(len(self.sessions), self.url, self.approval_keys[len(self.sessions)],
+                        self.tr_id, self.on_data, self.ws_factory, self.backoff)
+            self.sessions.append(s)
+            if self._started:
+                s.start()
+            return s
+        return None
+
+    def subscribe(self, symbols) -> list[str]:
+        """종목 추가 → 자리가 없어 pending 으로 남은 종목 목록"""
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        with self._lock:
+            for symbol in symbols:
+                if symbol in self._where or symbol in self.pending:
+                    continue
+                session = self._session_with_room()
+                if session is None:
+                    self.pending.append(symbol)
+                    continue
+                self._where[symbol] = session
+                session.add(symbol)
+            if self.pending:
+                print(f"[ws] 세션 한도({self.capacity}) 초과: {len(self.pending)}종목 대기")
+            return list(self.pending)
+
+    def unsubscribe(self, symbols):
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        with self._lock:
+            for symbol in symbols:
+                if symbol in self.pending:
+                    self.pending.remove(symbol)
+                    continue
+                session = self._where.pop(symbol, None)
+                if session is not None:
+                    session.remove(symbol)
+            waiting, self.pending = self.pending, []
+        if waiting:                             # 빈자리에 대기 종목 배정
+            self.subscribe(waiting)
+
+    def start(self):
+        with self._lock:
+            self._started = True
+            for s in self.sessions:
+                s.start()
+        return self
+
+    def stop(self):
+        for s in self.sessions:
+            s.stop()
+
+    def wait_connected(self, timeout: float = 10.0) -> bool:
+        deadline = time.monotonic() + timeout
+        return all(s.connected.wait(max(0.0, deadline - time.monotonic())) for s in self.sessions)
+
+    def assignments(self) -> dict[int, list[str]]:
+        return {s.index: sorted(s.symbols) for s in self.sessions}
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "symbols": len(self._where),
+            "pending": len(self.pending),
+            "acked": sum(len(s.acked) for s in self.sessions),
+            "connects": sum(s.connects for s in self.sessions),
+            "errors": {k: v for s in self.sessions for k, v in s.errors.items()},
+        }
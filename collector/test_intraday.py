@@ -0,0 +1,59 @@
+# collector/test_intraday.py
+"""BarAggregator: sweep 으로 닫힌 봉에 늦게 온 틱이 저장된 봉을 덮어쓰지 않는지.
+
+    cd collector && python -m pytest -q test_intraday.py
+"""
+from datetime import datetime
+
+from intraday import KST, BarAggregator
+
+
+def at(hh, mm, ss=0):
+    return datetime(2025, 6, 2, hh, mm, ss, tzinfo=KST)
+
+
+def make():
+    saved = []
+    agg = BarAggregator(intervals=(1, 5), batch_size=1, flush_secs=0, writer=saved.extend, grace_secs=2)
+    return agg, saved
+
+
+def test_late_tick_after_sweep_is_dropped():
+    agg, saved = make()
+    agg.on_tick("005930", at(9, 0, 10), 100.0, 10)
+    agg.on_tick("005930", at(9, 0, 50), 105.0, 5)
+    agg.maybe_flush(at(9, 1, 1))                    # grace 안: 아직 열려 있음
+    assert saved == []
+    agg.maybe_flush(at(9, 1, 3))                    # 09:00 1분봉 확정
+    assert [(b.interval, b.ts, b.volume) for b in saved] == [(1, at(9, 0), 15)]
+
+    agg.on_tick("005930", at(9, 0, 59), 90.0, 7)    # 이미 닫은 09:00 봉에 늦게 온 틱
+    assert agg.stats["late"] == 1
+    assert ("005930", 1) not in agg._open           # 같은 ts 의 조각 봉을 만들지 않음
+
+    agg.close()
+    one = [b for b in saved if b.interval == 1]
+    five = [b for b in saved if b.interval == 5]
+    assert [(b.ts, b.low, b.volume) for b in one] == [(at(9, 0), 100.0, 15)]
+    assert [(b.ts, b.low, b.volume) for b in five] == [(at(9, 0), 100.0, 15)]
+
+
+def test_tick_inside_grace_still_counts():
+    agg, saved = make()
+    agg.on_tick("005930", at(9, 0, 10), 100.0, 10)
+    agg.maybe_flush(at(9, 1, 1))
+    agg.on_tick("005930", at(9, 0, 59), 99.0, 1)    # 로컬 시계가 조금 앞서도 반영
+    agg.on_tick("005930", at(9, 1, 0), 101.0, 2)    # 다음 봉 → 09:00 봉 확정
+    assert agg.stats["late"] == 0
+    assert [(b.interval, b.ts, b.low, b.volume) for b in saved] == [(1, at(9, 0), 99.0, 11)]
+
+
+def test_next_bucket_after_sweep_opens_new_bar():
+    agg, saved = make()
+    agg.on_tick("005930", at(9, 0, 10), 100.0, 10)
+    agg.maybe_flush(at(9, 3, 0))
+    agg.on_tick("005930", at(9, 3, 5), 102.0, 4)
+    agg.close()
+    assert agg.stats["late"] == 0
+    assert sorted((b.interval, b.ts, b.volume) for b in saved) == [
+        (1, at(9, 0), 10), (1, at(9, 3), 4), (5, at(9, 0), 14)]
@@ -0,0 +1,304 @@
+# collector/tick_store.py
+"""
+실시간 체결 틱 저장 (웹소켓 콜백 → 링 버퍼 → 백그라운드 writer → Tick / 세그먼트 파일).
+
+- TickBuffer  : 용량 고정 링 버퍼. 콜백 스레드는 append 만 하고 절대 기다리지 않는다.
+                가득 차면 가장 오래된 틱을 밀어내고 dropped 로 센다 (backpressure 지표).
+- TickStore   : put/on_message + 백그라운드 writer 스레드. batch_size 개가 쌓이거나 flush_secs 가 지나면
+                버퍼를 비워 sink 로 한 번에 쓴다. sink 가 실패하면 fallback sink 로 보낸다.
+- CopySink    : PostgreSQL COPY FROM STDIN (그 외 DB 는 bulk_create) → core.Tick
+- SegmentSink : append-only CSV 세그먼트 (크기/시간 기준으로 roll, 닫힌 파일만 .csv)
+                나중에 load_segments() 로 DB 에 넣는다 (DB 장애·장중 부하 회피용)
+
+    TICK_STORE=db python kis_ws_client.py
+    TICK_STORE=segments TICK_SEGMENT_DIR=/data/ticks python kis_ws_client.py
+    python tick_store.py --load-segments /data/ticks         # 닫힌 세그먼트 → Tick
+"""
+import argparse
+import io
+import os, sys, time, threading, django
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+# ── Django 환경 설정 ───────────────────────────────────────────────
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+django.setup()
+
+from django.db import close_old_connections, connections
+
+from core.models import Tick
+from intraday import parse_trades
+
+COLUMNS = ["symbol", "ts", "price", "volume"]
+
+# ── 링 버퍼 ─────────────────────────────────────────────────────
+class TickBuffer:
+    """(symbol, ts, price, volume) 고정 용량 버퍼 — put 은 잠깐의 lock 외에 블록하지 않음"""
+
+    def __init__(self, capacity: int = 200_000, batch_size: int = 5000):
+        self.capacity = capacity
+        self.batch_size = batch_size                # 이만큼 쌓이면 writer 를 깨움
+        self._q = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self.received = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def put(self, tick):
+        with self._lock:
+            if len(self._q) == self.capacity:
+                self.dropped += 1                   # deque 가 가장 오래된 항목을 밀어냄
+            self._q.append(tick)
+            self.received += 1
+            n = len(self._q)
+            if n > self.high_water:
+                self.high_water = n
+        if n >= self.batch_size:
+            self._ready.set()
+
+    def drain(self, limit: int) -> list:
+        with self._lock:
+            n = min(limit, len(self._q))
+            batch = [self._q.popleft() for _ in range(n)]
+            if not self._q:
+                self._ready.clear()
+        return batch
+
+    def wait(self, timeout: float) -> bool:
+        """batch_size 이상 쌓이거나 timeout 까지 대기 (writer 스레드 전용)"""
+        return self._ready.wait(timeout)
+
+    def wake(self):
+        self._ready.set()
+
+    def __len__(self):
+        return len(self._q)
+
+# ── sink ────────────────────────────────────────────────────────
+class CopySink:
+    """Tick 테이블 적재. PostgreSQL 은 COPY, 그 외(SQLite 테스트)는 bulk_create"""
+    name = "db"
+
+    def __init__(self, using: str = "default"):
+        self.using = using
+
+    def write(self, batch):
+        conn = connections[self.using]
+        if conn.vendor != "postgresql":
+            Tick.objects.using(self.using).bulk_create(
+                [Tick(symbol=s, ts=ts, price=p, volume=v) for s, ts, p, v in batch]
+            )
+            return
+        buf = io.StringIO()
+        for s, ts, p, v in batch:
+            buf.write(f"{s},{ts.isoformat()},{p},{v}\n")
+        sql = f"COPY {Tick._meta.db_table} ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+        with conn.cursor() as cur:
+            raw = cur.cursor
+            if hasattr(raw, "copy_expert"):         # psycopg2
+                buf.seek(0)
+                raw.copy_expert(sql, buf)
+            else:                                   # psycopg3
+                with raw.copy(sql) as copy:
+                    copy.write(buf.getvalue())
+        if not conn.get_autocommit():
+            conn.commit()
+
+    def close(self):
+        connections[self.using].close()
+
+
+class SegmentSink:
+    """append-only CSV 세그먼트. 쓰는 중인 파일은 .part, roll 되면 .csv 로 이름을 바꾼다"""
+    name = "segments"
+
+    def __init__(self, directory, max_bytes: int = 64 * 2**20, max_secs: float = 300.0):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_secs = max_secs
+        self._f = None
+        self._path = None
+        self._opened = 0.0
+        self._seq = 0
+
+    def _open(self):
+        self._seq += 1
+        stem = f"ticks-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}-{self._seq:04d}"
+        self._path = self.directory / f"{stem}.part"
+        self._f = open(self._path, "a", encoding="utf-8")
+        self._opened = time.monotonic()
+
+    def _roll(self):
+        if self._f is None:
+            return
+        self._f.close()
+        self._path.rename(self._path.with_suffix(".csv"))
+        self._f = self._path = None
+
+    def write(self, batch):
+        if self._f is not None and (
+            self._f.tell() >= self.max_bytes or time.monotonic() - self._opened >= self.max_secs
+        ):
+            self._roll()
+        if self._f is None:
+            self._open()
+        self._f.write("".join(f"{s},{ts.isoformat()},{p},{v}\n" for s, ts, p, v in batch))
+        self._f.flush()
+
+    def close(self):
+        self._roll()
+
+
+def load_segments(directory, sink=None, remove: bool = True) -> int:
+    """닫힌 세그먼트(.csv) → sink (기본 CopySink). 적재한 파일은 지운다 → 틱 수"""
+    sink = sink or CopySink()
+    total = 0
+    for path in sorted(Path(directory).glob("ticks-*.csv")):
+        with open(path, encoding="utf-8") as f:
+            batch = []
+            for line in f:
+                s, ts, p, v = line.rstrip("\n").split(",")
+                batch.append((s, datetime.fromisoformat(ts), float(p), int(v)))
+        sink.write(batch)
+        total += len(batch)
+        if remove:
+            path.unlink()
+        print(f"  {path.name}: {len(batch)} ticks")
+    return total
+
+# ── writer ──────────────────────────────────────────────────────
+class TickStore:
+    """콜백 스레드용 put / on_message + 백그라운드 writer 스레드.
+
+    sink 실패 시 fallback(예: SegmentSink)으로 같은 배치를 보내 유실을 막는다.
+    metrics() 로 버퍼 깊이, 밀려난 틱 수, 배치 지연 등을 확인한다.
+    """
+
+    def __init__(self, sink, capacity: int = 200_000, batch_size: int = 5000,
+                 flush_secs: float = 1.0, fallback=None):
+        self.buffer = TickBuffer(capacity, batch_size)
+        self.sink = sink
+        self.fallback = fallback
+        self.batch_size = batch_size
+        self.flush_secs = flush_secs
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tick-writer", daemon=True)
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.lost = 0
+        self.last_batch_ms = 0.0
+        self.max_batch_ms = 0.0
+        self.last_flush = time.monotonic()
+
+    # ── 콜백 스레드 ──
+    def put(self, symbol: str, ts: datetime, price: float, volume: int):
+        self.buffer.put((symbol, ts, price, volume))
+
+    def on_message(self, message, day=None):
+        """웹소켓 원문 (또는 kis_ws_parser.Frame) → 체결 틱을 버퍼에"""
+        for tick in parse_trades(message, day):
+            self.buffer.put(tick)
+
+    # ── writer 스레드 ──
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.buffer.wait(self.flush_secs)
+            self.flush()
+        self.flush()
+        for sink in (self.sink, self.fallback):    # DB 연결은 스레드별이라 writer 스레드에서 닫는다
+            if sink is not None:
+                sink.close()
+
+    def flush(self) -> int:
+        n = 0
+        while True:
+            batch = self.buffer.drain(self.batch_size)
+            if not batch:
+                break
+            self._write(batch)
+            n += len(batch)
+            if len(batch) < self.batch_size:
+                break
+        self.last_flush = time.monotonic()
+        return n
+
+    def _write(self, batch):
+        t0 = time.perf_counter()
+        try:
+            self.sink.write(batch)
+            self.written += len(batch)
+        except Exception as e:                      # DB 장애가 수집을 멈추지 않게
+            self.errors += 1
+            close_old_connections()
+            print(f"[tick_store] {self.sink.name} 쓰기 실패 ({len(batch)}건): {e!r}")
+            if self.fallback is None:
+                self.lost += len(batch)
+            else:
+                try:
+                    self.fallback.write(batch)
+                    self.written += len(batch)
+                except Exception as e2:
+                    self.lost += len(batch)
+                    print(f"[tick_store] fallback 쓰기 실패: {e2!r}")
+        ms = (time.perf_counter() - t0) * 1e3
+        self.batches += 1
+        self.last_batch_ms = ms
+        self.max_batch_ms = max(self.max_batch_ms, ms)
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self.buffer.wake()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def metrics(self) -> dict:
+        b = self.buffer
+        return {
+            "received": b.received,
+            "written": self.written,
+            "dropped": b.dropped,
+            "lost": self.lost,
+            "depth": len(b),
+            "high_water": b.high_water,
+            "fill": round(len(b) / b.capacity, 3),
+            "batches": self.batches,
+            "errors": self.errors,
+            "last_batch_ms": round(self.last_batch_ms, 1),
+            "max_batch_ms": round(self.max_batch_ms, 1),
+            "since_flush_s": round(time.monotonic() - self.last_flush, 1),
+        }
+
+
+def from_env() -> TickStore | None:
+    """TICK_STORE=db|segments (+ TICK_SEGMENT_DIR) → 시작된 TickStore, 미설정이면 None"""
+    mode = os.getenv("TICK_STORE", "")
+    if not mode:
+        return None
+    segments = SegmentSink(os.getenv("TICK_SEGMENT_DIR", "/tmp/kis/ticks"))
+    if mode == "segments":
+        store = TickStore(segments)
+    elif mode == "db":
+        store = TickStore(CopySink(), fallback=segments)
+    else:
+        raise ValueError(f"알 수 없는 TICK_STORE: {mode}")
+    return store.start()
+
+# ── 메인 실행부 ─────────────────────────────────────────────────
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--load-segments", required=True, metavar="DIR", help="closed segment files → Tick")
+    p.add_argument("--keep", action="store_true", help="do not delete loaded segment files")
+    args = p.parse_args()
+
+    print(f"[틱 적재 완료] {load_segments(args.load_segments, remove=not args.keep)} ticks")
@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-17 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_normalized_dailyprice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeatureState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=10)),
+                ('version', models.CharField(max_length=16)),
+                ('config', models.JSONField()),
+                ('seed', models.JSONField()),
+                ('normalizer', models.JSONField()),
+                ('train_start', models.DateField()),
+                ('train_end', models.DateField()),
+                ('last_date', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='normalized_dailyprice',
+            name='core_normal_symbol_7d9e6e_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='normalized_dailyprice',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='normalized_dailyprice',
+            name='version',
+            field=models.CharField(default='', max_length=16),
+        ),
+        migrations.AlterUniqueTogether(
+            name='normalized_dailyprice',
+            unique_together={('symbol', 'version', 'date')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='featurestate',
+            unique_together={('symbol', 'version')},
+        ),
+    ]
@@ -0,0 +1,116 @@
+# Generated by Django 5.2 on 2026-10-17 23:08
+#
+# DailyPrice → Symbol + DailyBar (정수 가격, PK 하나) 압축 스키마.
+# PostgreSQL 에서 PRICE_PARTITIONED=1 이면 core_dailybar 를 date 연 단위 range 파티션으로 만든다.
+# 기존 DailyPrice 행은 마지막 단계에서 집합 연산으로 한 번에 옮긴다 (이후 증분은 core/price_store.sync).
+
+import os
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+INT4_MAX = 2**31 - 1
+
+
+def _decimals(code: str, max_price: float) -> int:
+    """KRX(6자리 숫자 코드)는 원 단위 0, 그 외 4자리에서 시작해 int4 를 넘지 않게 줄인다"""
+    d = 0 if code.isdigit() else 4
+    while d > 0 and (max_price or 0) * 10 ** d > INT4_MAX:
+        d -= 1
+    return d
+
+
+def create_dailybar(apps, schema_editor):
+    model = apps.get_model("core", "DailyBar")
+    conn = schema_editor.connection
+    if conn.vendor != "postgresql" or os.getenv("PRICE_PARTITIONED") != "1":
+        schema_editor.create_model(model)
+        return
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TABLE core_dailybar ("
+            " symbol_id smallint NOT NULL REFERENCES core_symbol (id) DEFERRABLE INITIALLY DEFERRED,"
+            " date date NOT NULL,"
+            " open integer NOT NULL, high integer NOT NULL, low integer NOT NULL, close integer NOT NULL,"
+            " volume bigint NOT NULL,"
+            " PRIMARY KEY (symbol_id, date)"
+            ") PARTITION BY RANGE (date)"
+        )
+        cur.execute("SELECT EXTRACT(YEAR FROM MIN(date)), EXTRACT(YEAR FROM MAX(date)) FROM core_dailyprice")
+        lo, hi = cur.fetchone()
+        for year in range(int(lo or 2000), int(hi or 2000) + 2):
+            cur.execute(
+                f"CREATE TABLE core_dailybar_y{year} PARTITION OF core_dailybar "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            )
+        cur.execute("CREATE TABLE core_dailybar_default PARTITION OF core_dailybar DEFAULT")
+
+
+def drop_dailybar(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model("core", "DailyBar"))
+
+
+def backfill(apps, schema_editor):
+    Symbol = apps.get_model("core", "Symbol")
+    with schema_editor.connection.cursor() as cur:
+        cur.execute("SELECT symbol, MAX(high) FROM core_dailyprice GROUP BY symbol")
+        Symbol.objects.bulk_create(
+            [Symbol(code=code, market="KRX" if code.isdigit() else "", decimals=_decimals(code, hi))
+             for code, hi in cur.fetchall()],
+            ignore_conflicts=True,
+        )
+        for d in Symbol.objects.values_list("decimals", flat=True).distinct():
+            scale = 10 ** d
+            cur.execute(
+                "INSERT INTO core_dailybar (symbol_id, date, open, high, low, close, volume) "
+                f"SELECT s.id, p.date, CAST(ROUND(p.open * {scale}) AS INTEGER), "
+                f"CAST(ROUND(p.high * {scale}) AS INTEGER), CAST(ROUND(p.low * {scale}) AS INTEGER), "
+                f"CAST(ROUND(p.close * {scale}) AS INTEGER), p.volume "
+                "FROM core_dailyprice p JOIN core_symbol s ON s.code = p.symbol "
+                "WHERE s.decimals = %s ON CONFLICT (symbol_id, date) DO NOTHING",
+                [d],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_feature_store'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='dailyprice',
+            name='core_dailyp_symbol_224f83_idx',
+        ),
+        migrations.CreateModel(
+            name='Symbol',
+            fields=[
+                ('id', models.SmallAutoField(primary_key=True, serialize=False)),
+                ('code', models.CharField(max_length=10, unique=True)),
+                ('market', models.CharField(default='', max_length=8)),
+                ('decimals', models.PositiveSmallIntegerField(default=4)),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='DailyBar',
+                    fields=[
+                        ('pk', models.CompositePrimaryKey('symbol', 'date', blank=True, editable=False, primary_key=True, serialize=False)),
+                        ('symbol', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, to='core.symbol')),
+                        ('date', models.DateField()),
+                        ('open', models.IntegerField()),
+                        ('high', models.IntegerField()),
+                        ('low', models.IntegerField()),
+                        ('close', models.IntegerField()),
+                        ('volume', models.BigIntegerField()),
+                    ],
+                ),
+            ],
+            database_operations=[],                 # 테이블은 아래 create_dailybar 가 만든다
+        ),
+        migrations.RunPython(create_dailybar, drop_dailybar),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
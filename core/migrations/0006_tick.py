@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-17 23:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_intraday_bar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tick',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=10)),
+                ('ts', models.DateTimeField()),
+                ('price', models.FloatField()),
+                ('volume', models.BigIntegerField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['symbol', 'ts'], name='core_tick_symbol_8a51bf_idx')],
+            },
+        ),
+    ]
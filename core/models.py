@@ -11,11 +11,97 @@ class DailyPrice(models.Model):
     volume = models.BigIntegerField()
 
     class Meta:
-        unique_together = ('symbol', 'date')
-        indexes = [
-            models.Index(fields=['symbol', 'date']),
-        ]
+        unique_together = ('symbol', 'date')        # 이 unique 인덱스가 (symbol, date) 조회도 담당
 
 
+class normalized_DailyPrice(models.Model):
+    """DailyPrice 의 정규화 feature (AI/feature_store.py 가 채움). version = 정규화 설정 해시"""
+    symbol = models.CharField(max_length=10)
+    version = models.CharField(max_length=16, default="")
+    date = models.DateField()
+    open = models.FloatField()
+    high = models.FloatField()
+    low = models.FloatField()
+    close = models.FloatField()
+    volume = models.FloatField()
 
+    class Meta:
+        unique_together = ('symbol', 'version', 'date')   # 이 unique 인덱스가 range scan 도 담당
 
+
+class FeatureState(models.Model):
+    """종목·버전별 feature store 진행 상태 (정규화 통계 + 마지막 반영 날짜)"""
+    symbol = models.CharField(max_length=10)
+    version = models.CharField(max_length=16)
+    config = models.JSONField()
+    seed = models.JSONField()                  # 학습 구간 통계 (모델과 함께 저장되는 scaler)
+    normalizer = models.JSONField()            # 현재 통계 (expanding 모드면 계속 갱신)
+    train_start = models.DateField()
+    train_end = models.DateField()
+    last_date = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('symbol', 'version')
+
+
+class Symbol(models.Model):
+    """종목 차원 테이블. DailyBar 는 code 대신 2바이트 id 로 참조한다.
+
+    가격은 round(price * 10**decimals) 정수로 저장 (int4 범위를 넘지 않도록 종목별로 정함).
+    """
+    id = models.SmallAutoField(primary_key=True)
+    code = models.CharField(max_length=10, unique=True)
+    market = models.CharField(max_length=8, default="")
+    decimals = models.PositiveSmallIntegerField(default=4)
+
+    def __str__(self):
+        return self.code
+
+
+class DailyBar(models.Model):
+    """DailyPrice 의 압축 저장형 (core/price_store.py 로 적재/조회).
+
+    PK (symbol_id, date) 하나가 유일 인덱스 — 별도 id/보조 인덱스 없음.
+    PostgreSQL 에서 PRICE_PARTITIONED=1 로 migrate 하면 date 기준 연 단위 range 파티션.
+    """
+    pk = models.CompositePrimaryKey("symbol", "date")
+    symbol = models.ForeignKey(Symbol, on_delete=models.PROTECT, db_index=False)
+    date = models.DateField()
+    open = models.IntegerField()
+    high = models.IntegerField()
+    low = models.IntegerField()
+    close = models.IntegerField()
+    volume = models.BigIntegerField()
+
+
+class IntradayBar(models.Model):
+    """분봉 (collector/intraday.py 가 틱/분봉 조회로 채움).
+
+    interval = 봉 길이(분: 1, 5, 15, 60), ts = 봉 시작 시각 (aware datetime, KST 기준 정렬).
+    history/intraday_rollup.py 가 1분봉에서 DailyPrice 를 만든다.
+    """
+    symbol = models.CharField(max_length=10)
+    interval = models.PositiveSmallIntegerField()
+    ts = models.DateTimeField()
+    open = models.FloatField()
+    high = models.FloatField()
+    low = models.FloatField()
+    close = models.FloatField()
+    volume = models.BigIntegerField()
+
+    class Meta:
+        unique_together = ('symbol', 'interval', 'ts')   # 구간 조회도 이 인덱스가 담당
+
+
+class Tick(models.Model):
+    """실시간 체결 틱 (collector/tick_store.py 가 배치로 적재, append-only)"""
+    symbol = models.CharField(max_length=10)
+    ts = models.DateTimeField()
+    price = models.FloatField()
+    volume = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['symbol', 'ts']),
+        ]
@@ -0,0 +1,179 @@
+# core/price_store.py
+"""
+압축 일봉 저장소 (Symbol + DailyBar).
+
+DailyBar 는 종목 코드 대신 Symbol.id(smallint), 가격은 round(price * 10**decimals)
+정수(int4), PK (symbol_id, date) 하나만 인덱스로 가진다. DailyPrice 대비 행/인덱스가
+절반 이하라 load_window 같은 range scan 이 읽는 페이지 수가 줄어든다.
+
+- sync()         : DailyPrice → DailyBar 증분 복사 (종목별 마지막 날짜 이후만, 집합 연산)
+                   가격이 커져 int4 를 넘게 되면 그 종목만 decimals 를 줄여 다시 스케일
+- load_range()   : (symbol, start, end) 구간을 float 로 복원한 DataFrame (load_window 와 같은 모양)
+- ensure_partitions() : PostgreSQL 파티션 테이블이면 연 단위 파티션 미리 생성
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from django.db import connection, transaction
+from django.db.models import Max
+
+from core.models import DailyBar, DailyPrice, Symbol
+
+INT4_MAX = 2**31 - 1
+PRICES = ["open", "high", "low", "close"]
+
+
+def choose_decimals(code: str, max_price: float) -> int:
+    """KRX(6자리 숫자 코드)는 원 단위 0, 그 외 4자리에서 시작해 int4 를 넘지 않게 줄인다"""
+    d = 0 if code.isdigit() else 4
+    while d > 0 and (max_price or 0) * 10 ** d > INT4_MAX:
+        d -= 1
+    return d
+
+
+def ensure_symbols(codes=None) -> dict[str, Symbol]:
+    """DailyPrice 에 있는데 Symbol 에 없는 종목을 등록 → {code: Symbol}"""
+    qs = DailyPrice.objects.all() if codes is None else DailyPrice.objects.filter(symbol__in=list(codes))
+    known = set(Symbol.objects.values_list("code", flat=True))
+    new = [
+        Symbol(code=r["symbol"], market="KRX" if r["symbol"].isdigit() else "",
+               decimals=choose_decimals(r["symbol"], r["hi"]))
+        for r in qs.values("symbol").annotate(hi=Max("high"))
+        if r["symbol"] not in known
+    ]
+    Symbol.objects.bulk_create(new, ignore_conflicts=True)
+    sym_qs = Symbol.objects.all() if codes is None else Symbol.objects.filter(code__in=list(codes))
+    return {s.code: s for s in sym_qs}
+
+def fit_decimals(symbols: dict[str, Symbol]) -> list[str]:
+    """Symbol 생성 후 가격이 올라 round(price * 10**decimals) 가 int4 를 넘게 된 종목은
+    decimals 를 줄이고 이미 저장된 DailyBar 도 같은 배율로 줄인다 (트랜잭션 안에서 호출).
+    원 단위(0)로도 넘는 종목 코드를 돌려준다 — sync 는 그 종목만 빼고 진행한다."""
+    rows = (
+        DailyPrice.objects.filter(symbol__in=list(symbols))
+        .values("symbol")
+        .annotate(**{c: Max(c) for c in PRICES})
+    )
+    bar = DailyBar._meta.db_table
+    overflow = []
+    for r in rows:
+        s = symbols[r["symbol"]]
+        hi = max(r[c] or 0 for c in PRICES)
+        d = s.decimals
+        while d > 0 and hi * 10 ** d > INT4_MAX:
+            d -= 1
+        if hi * 10 ** d > INT4_MAX:
+            overflow.append(s.code)
+        elif d != s.decimals:
+            factor = 10 ** (s.decimals - d)
+            with connection.cursor() as cur:
+                cur.execute(
+                    f"UPDATE {bar} SET " + ", ".join(f"{c} = CAST(ROUND({c} / {factor}.0) AS INTEGER)" for c in PRICES)
+                    + " WHERE symbol_id = %s",
+                    [s.id],
+                )
+            s.decimals = d
+            s.save(update_fields=["decimals"])
+    return overflow
+
+# ── 파티션 (PostgreSQL, PRICE_PARTITIONED=1 로 migrate 한 경우) ──────
+def is_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cur:
+        cur.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s", [DailyBar._meta.db_table]
+        )
+        return cur.fetchone() is not None
+
+
+def ensure_partitions(year_from: int, year_to: int):
+    """[year_from, year_to] 연 단위 파티션 생성 (이미 있으면 건너뜀).
+
+    DEFAULT 파티션에 해당 연도 행이 이미 있으면 PostgreSQL 이 생성을 거부하므로
+    새 해가 시작되기 전에 (sync 가 자동으로 다음 해까지) 만들어 둔다.
+    """
+    if not is_partitioned():
+        return
+    table = DailyBar._meta.db_table
+    with connection.cursor() as cur:
+        for year in range(year_from, year_to + 1):
+            cur.execute(
+                f"CREATE TABLE IF NOT EXISTS {table}_y{year} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            )
+
+# ── DailyPrice → DailyBar ───────────────────────────────────────
+def sync(codes=None, full: bool = False) -> int:
+    """DailyPrice 의 새 행을 DailyBar 로 옮긴다 → 반영 행 수.
+
+    기본은 종목별 DailyBar 마지막 날짜 이후만 (PK 역순 조회 1회씩, 상관 서브쿼리).
+    full=True 면 전 구간을 다시 대조해 값이 바뀐 행도 덮어쓴다 (수정주가 upsert 이후).
+    """
+    symbols = ensure_symbols(codes)
+    if not symbols:
+        return 0
+    this_year = date.today().year
+    ensure_partitions(this_year, this_year + 1)
+
+    bar, price = DailyBar._meta.db_table, DailyPrice._meta.db_table
+    sym_table = Symbol._meta.db_table
+    newer = "" if full else (
+        f" AND p.date > COALESCE((SELECT MAX(b.date) FROM {bar} b WHERE b.symbol_id = s.id), '0001-01-01')"
+    )
+    on_conflict = (
+        "DO UPDATE SET " + ", ".join(f"{c} = excluded.{c}" for c in [*PRICES, "volume"])
+        if full else "DO NOTHING"
+    )
+
+    total = 0
+    with transaction.atomic(), connection.cursor() as cur:
+        overflow = fit_decimals(symbols)
+        if overflow:
+            print(f"[WARN] 가격이 int4 범위를 넘어 DailyBar 에 저장할 수 없는 종목 (건너뜀): {', '.join(overflow)}")
+        by_decimals: dict[int, list[int]] = {}
+        for s in symbols.values():
+            if s.code not in overflow:
+                by_decimals.setdefault(s.decimals, []).append(s.id)
+
+        for d, ids in by_decimals.items():
+            scale = 10 ** d
+            encoded = ", ".join(f"CAST(ROUND(p.{c} * {scale}) AS INTEGER)" for c in PRICES)
+            cur.execute(
+                f"INSERT INTO {bar} (symbol_id, date, {', '.join(PRICES)}, volume) "
+                f"SELECT s.id, p.date, {encoded}, p.volume "
+                f"FROM {price} p JOIN {sym_table} s ON s.code = p.symbol "
+                f"WHERE s.id IN ({', '.join(['%s'] * len(ids))}){newer} "
+                f"ON CONFLICT (symbol_id, date) {on_conflict}",
+                ids,
+            )
+            total += max(cur.rowcount, 0)
+    return total
+
+# ── 조회 ────────────────────────────────────────────────────────
+def load_range(code: str, start=None, end=None) -> pd.DataFrame:
+    """DailyBar 구간 → date 인덱스 float DataFrame (open, high, low, close, volume)"""
+    sym = Symbol.objects.filter(code=code).values_list("id", "decimals").first()
+    if sym is None:
+        raise ValueError(f"{code} 종목이 Symbol 에 없습니다. price_store.sync 를 먼저 실행하세요.")
+    sym_id, decimals = sym
+
+    qs = DailyBar.objects.filter(symbol_id=sym_id)
+    if start is not None:
+        qs = qs.filter(date__gte=start)
+    if end is not None:
+        qs = qs.filter(date__lte=end)
+    rows = list(qs.order_by("date").values_list("date", *PRICES, "volume"))
+    if not rows:
+        return pd.DataFrame(columns=[*PRICES, "volume"], index=pd.Index([], name="date"))
+
+    dates, *cols = zip(*rows)
+    scale = 10.0 ** decimals
+    df = pd.DataFrame(
+        {c: np.asarray(v, dtype=np.float64) / scale for c, v in zip(PRICES, cols[:4])},
+        index=pd.Index(dates, name="date"),
+    )
+    df["volume"] = np.asarray(cols[4], dtype=np.int64)
+    return df
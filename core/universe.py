@@ -0,0 +1,11 @@
+# core/universe.py
+"""
+종목 목록 파일 (history/data_fetch.py, AI/batch_train.py 의 --universe).
+"""
+
+
+def read_universe(path: str) -> list[str]:
+    """한 줄에 종목 하나, '#' 이후는 주석"""
+    with open(path, encoding="utf-8") as f:
+        lines = (ln.split("#", 1)[0].strip() for ln in f)
+        return [ln for ln in lines if ln]
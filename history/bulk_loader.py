@@ -0,0 +1,181 @@
+"""
+bulk_loader.py
+----------------------
+DailyPrice 대량 적재 (백필용).
+
+save_to_db 는 행마다 DailyPrice 인스턴스를 만들어 bulk_create 한 번에 넘기므로
+수백만 행이면 느리고 메모리도 전부 들고 있어야 한다. 여기서는 batch_size 행씩
+1) 임시 staging 테이블에 밀어 넣고
+   - PostgreSQL : COPY ... FROM STDIN (CSV 스트림)
+   - SQLite     : executemany (로컬 테스트용 대체 경로)
+2) INSERT ... SELECT ... ON CONFLICT (symbol, date) DO NOTHING 으로 본 테이블에 병합
+을 배치마다 한 트랜잭션으로 처리한다. ORM 인스턴스는 만들지 않는다.
+
+upsert 모드 (수정주가 반영): 병합 전에 staging 과 본 테이블을 (symbol, date) 로 조인해
+값이 하나라도 다른 행만 UPDATE (IS DISTINCT FROM, SQLite 는 IS NOT) 한 뒤 새 행을 INSERT.
+배치마다 inserted / updated / unchanged 건수를 집계한다.
+
+    python bulk_loader.py data/prices/*.csv --batch-size 100000
+    python bulk_loader.py data/prices/*.csv --mode upsert
+"""
+import argparse
+import io
+import os, sys, django, pandas as pd
+from pathlib import Path
+
+# ── Django 환경 설정 ───────────────────────────────────────────────
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+django.setup()
+
+from django.db import connections, transaction
+
+from core.models import DailyPrice
+
+COLUMNS = ["symbol", "date", "open", "high", "low", "close", "volume"]
+VALUES = COLUMNS[2:]
+STAGE = "dailyprice_stage"
+MODES = ("ignore", "upsert")
+
+# ── 배치 준비 ───────────────────────────────────────────────────
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """컬럼 순서/타입 정리: date → 'YYYY-MM-DD', volume → int, 결측 행 제거
+
+    같은 (symbol, date) 가 여러 번 오면 마지막 값만 남긴다 (UPDATE ... FROM 결과가 모호해지지 않게).
+    """
+    out = df[COLUMNS].dropna()
+    out = out.assign(
+        date=pd.to_datetime(out["date"]).dt.strftime("%Y-%m-%d"),
+        volume=out["volume"].astype("int64"),
+    )
+    return out.drop_duplicates(["symbol", "date"], keep="last")
+
+
+def _batches(df: pd.DataFrame, batch_size: int):
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start : start + batch_size]
+
+# ── staging ─────────────────────────────────────────────────────
+def _create_stage(cur, vendor: str):
+    if vendor == "postgresql":
+        cur.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGE} ("
+            "symbol varchar(10), date date, open double precision, high double precision, "
+            "low double precision, close double precision, volume bigint)"
+        )
+    else:
+        cur.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGE} ("
+            "symbol text, date date, open real, high real, low real, close real, volume integer)"
+        )
+    cur.execute(f"TRUNCATE {STAGE}" if vendor == "postgresql" else f"DELETE FROM {STAGE}")
+
+
+def _copy_rows(cur, batch: pd.DataFrame):
+    """PostgreSQL COPY FROM STDIN (psycopg2 copy_expert / psycopg3 copy 모두 지원)"""
+    buf = io.StringIO()
+    batch.to_csv(buf, header=False, index=False)
+    sql = f"COPY {STAGE} ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    raw = cur.cursor
+    if hasattr(raw, "copy_expert"):
+        buf.seek(0)
+        raw.copy_expert(sql, buf)
+    else:
+        with raw.copy(sql) as copy:
+            copy.write(buf.getvalue())
+
+
+def _insert_rows(cur, batch: pd.DataFrame):
+    cur.executemany(
+        f"INSERT INTO {STAGE} ({', '.join(COLUMNS)}) VALUES ({', '.join(['%s'] * len(COLUMNS))})",
+        batch.itertuples(index=False, name=None),
+    )
+
+# ── 병합 ────────────────────────────────────────────────────────
+def _merge(cur, table: str) -> int:
+    cols = ", ".join(COLUMNS)
+    # SQLite 는 INSERT ... SELECT 뒤 ON CONFLICT 파싱 모호성 때문에 WHERE 절이 필요
+    cur.execute(
+        f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {STAGE} WHERE true "
+        "ON CONFLICT (symbol, date) DO NOTHING"
+    )
+    return max(cur.rowcount, 0)
+
+
+def _update_changed(cur, table: str, vendor: str) -> int:
+    """staging 과 값이 다른 기존 행만 갱신 (집합 연산 1회) → 갱신 행 수"""
+    distinct = "IS DISTINCT FROM" if vendor == "postgresql" else "IS NOT"   # NULL 안전 비교
+    changed = " OR ".join(f"{table}.{c} {distinct} s.{c}" for c in VALUES)
+    cur.execute(
+        f"UPDATE {table} SET {', '.join(f'{c} = s.{c}' for c in VALUES)} "
+        f"FROM {STAGE} s WHERE {table}.symbol = s.symbol AND {table}.date = s.date AND ({changed})"
+    )
+    return max(cur.rowcount, 0)
+
+
+def load(df: pd.DataFrame, batch_size: int = 100_000, using: str = "default",
+         mode: str = "ignore") -> dict:
+    """DataFrame(symbol, date, OHLCV) → DailyPrice. {"inserted", "updated", "unchanged"} 반환
+
+    mode="ignore" : 이미 있는 (symbol, date) 는 건드리지 않음 (updated 는 항상 0)
+    mode="upsert" : 값이 바뀐 행만 UPDATE
+    """
+    if mode not in MODES:
+        raise ValueError(f"알 수 없는 mode: {mode}")
+    conn = connections[using]
+    vendor = conn.vendor
+    table = conn.ops.quote_name(DailyPrice._meta.db_table)
+
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for batch in _batches(_prepare(df), batch_size):
+        with transaction.atomic(using=using), conn.cursor() as cur:
+            _create_stage(cur, vendor)
+            if vendor == "postgresql":
+                _copy_rows(cur, batch)
+            else:
+                _insert_rows(cur, batch)
+            updated = _update_changed(cur, table, vendor) if mode == "upsert" else 0
+            inserted = _merge(cur, table)
+        stats["inserted"] += inserted
+        stats["updated"] += updated
+        stats["unchanged"] += len(batch) - inserted - updated
+    return stats
+
+
+def bulk_load(df: pd.DataFrame, batch_size: int = 100_000, using: str = "default") -> int:
+    """새로 들어간 행 수만 반환 (중복은 무시) — data_fetch 기본 writer"""
+    return load(df, batch_size, using)["inserted"]
+
+
+def upsert(df: pd.DataFrame, batch_size: int = 100_000, using: str = "default") -> dict:
+    """수정주가 등 값이 바뀐 행은 갱신 → {"inserted", "updated", "unchanged"}"""
+    return load(df, batch_size, using, mode="upsert")
+
+
+def load_csv(path, batch_size: int = 100_000, using: str = "default", mode: str = "ignore") -> dict:
+    """CSV 파일을 batch_size 행씩 읽어 적재. symbol 컬럼이 없으면 파일명을 종목으로 사용"""
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for chunk in pd.read_csv(path, chunksize=batch_size):
+        if "symbol" not in chunk.columns:
+            chunk["symbol"] = Path(path).stem
+        for k, v in load(chunk, batch_size, using, mode).items():
+            stats[k] += v
+    return stats
+
+# ── 메인 실행부 ─────────────────────────────────────────────────
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("files", nargs="+", help="CSV files (symbol,date,open,high,low,close,volume)")
+    p.add_argument("--batch-size", type=int, default=100_000)
+    p.add_argument("--mode", choices=MODES, default="ignore", help="upsert: update revised bars")
+    args = p.parse_args()
+
+    total = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for path in args.files:
+        stats = load_csv(path, args.batch_size, mode=args.mode)
+        for k, v in stats.items():
+            total[k] += v
+        print(f"  {path}: {stats}")
+    print(f"[데이터 저장 완료] {total}")
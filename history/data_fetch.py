@@ -1,4 +1,27 @@
-import os, sys, django, pandas as pd, yfinance as yf
+"""
+data_fetch.py
+----------------------
+여러 종목 일봉 수집 → DailyPrice 저장.
+
+1) --symbols / --universe(한 줄에 종목 하나) 로 대상 종목 지정
+   종목별 마지막 저장 날짜를 GROUP BY 한 번으로 조회해, 이미 최신인 종목은 건너뛰고
+   나머지는 그 다음 날부터만 요청 (--full 이면 기존처럼 period 전체)
+2) 다운로드는 스레드 풀(--workers)에서 동시에, 소스별 RateLimiter 로 초당 요청 수 제한
+3) 다 받은 종목부터 메인 스레드가 바로 DB 에 저장 (다운로드와 저장이 겹쳐 진행)
+   기본 저장 경로는 bulk_loader.bulk_load (staging + ON CONFLICT), --loader orm 이면 save_to_db
+   --loader upsert 면 수정주가로 값이 바뀐 기존 행도 갱신 (--full 과 함께 전체 이력 재대조)
+
+데이터 소스는 fetch(symbol, period) → DataFrame 만 있으면 되므로
+yfinance 대신 로컬 CSV 디렉터리(CSVSource)를 넣어 네트워크 없이 돌려볼 수 있다.
+
+    python data_fetch.py --universe universe.txt --workers 8 --rate 2
+    python data_fetch.py --symbols QQQ SPY --source csv --csv-dir ./sample
+"""
+import argparse
+import os, sys, django, threading, time, pandas as pd
+from datetime import date, timedelta
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
 
 # ── Django 환경 설정 ───────────────────────────────────────────────
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -7,13 +30,80 @@ if str(BASE_DIR) not in sys.path:
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
 django.setup()
 
+from django.db.models import Max
+
 from core.models import DailyPrice
+from core.universe import read_universe
+
+COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+
+# ── 요청 속도 제한 ───────────────────────────────────────────────
+class RateLimiter:
+    """초당 rate 회 (burst 만큼 몰아서 허용) — 여러 스레드가 공유하는 token bucket"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:                      # 0 이하 = 제한 없음
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_s = (1 - self._tokens) / self.rate
+            time.sleep(wait_s)
+
+# ── 데이터 소스 ──────────────────────────────────────────────────
+class YFinanceSource:
+    name = "yfinance"
+
+    def fetch(self, symbol: str, period="10y", interval="1d", start=None) -> pd.DataFrame:
+        return fetch_data(symbol, period, interval, start)
+
+
+class CSVSource:
+    """<directory>/<symbol>.csv (date, open, high, low, close, volume) 를 읽는 로컬 대체 소스"""
+    name = "csv"
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def fetch(self, symbol: str, period="10y", interval="1d", start=None) -> pd.DataFrame:
+        df = pd.read_csv(self.directory / f"{symbol}.csv", parse_dates=["date"])
+        if start is not None:
+            df = df[df["date"] >= pd.Timestamp(start)]
+        df = df[COLUMNS].copy()
+        df['symbol'] = symbol
+        return df
 
 # ── Yahoo Finance 데이터 가져오기 ────────────────────────────────
-def fetch_data(symbol: str, period="10y", interval="1d") -> pd.DataFrame:
+def fetch_data(symbol: str, period="10y", interval="1d", start=None) -> pd.DataFrame:
+    """start 가 있으면 그 날짜부터만 (증분), 없으면 period 전체.
+
+    마감된 영업일(latest_session)까지만 돌려준다 — 장중 봉이 저장되면 다음 증분 수집이
+    그 날짜를 최신으로 보고 건너뛰어 미완성 값이 남는다. 휴장일 등으로 받은 행이 없으면 빈 프레임.
+    """
+    import yfinance as yf
+
+    last = latest_session()
     ticker = yf.Ticker(symbol)
-    df = ticker.history(period=period, interval=interval)
+    if start is not None:
+        df = ticker.history(start=start, end=last + timedelta(days=1), interval=interval)
+    else:
+        df = ticker.history(period=period, interval=interval)
+    if df.empty:
+        return pd.DataFrame(columns=COLUMNS + ["symbol"])
     df.reset_index(inplace=True)
+    df = df[df["Date"].dt.date <= last]
     df = df[['Date', 'Close', 'Open', 'High', 'Low', 'Volume']]
     df = df.rename(columns={
         "Date": "date",
@@ -41,12 +131,128 @@ def save_to_db(df: pd.DataFrame):
         for row in df.itertuples()
     ]
     DailyPrice.objects.bulk_create(records, ignore_conflicts=True)
+    return len(records)
+
+# ── 증분 수집 계획 ──────────────────────────────────────────────
+def last_dates(symbols) -> dict:
+    """종목별 마지막 저장 날짜 (GROUP BY 1회). 데이터가 없는 종목은 빠진다"""
+    rows = (
+        DailyPrice.objects.filter(symbol__in=list(symbols))
+        .values("symbol")
+        .annotate(last=Max("date"))
+    )
+    return {r["symbol"]: r["last"] for r in rows}
+
+
+def latest_session(today: date | None = None) -> date:
+    """이미 마감된 가장 최근 영업일 (오늘 봉은 장 마감 전이라 제외, 공휴일은 무시)"""
+    return (pd.Timestamp(today or date.today()) - pd.tseries.offsets.BDay(1)).date()
+
+
+def plan_fetch(symbols, full: bool = False, today: date | None = None):
+    """→ ({symbol: start date | None(전체)}, 이미 최신이라 건너뛸 종목 리스트)"""
+    symbols = list(dict.fromkeys(symbols))
+    if full:
+        return {s: None for s in symbols}, []
+    lasts = last_dates(symbols)
+    current = latest_session(today)
+    plan, skipped = {}, []
+    for s in symbols:
+        last = lasts.get(s)
+        if last is not None and last >= current:
+            skipped.append(s)
+        else:
+            plan[s] = None if last is None else last + timedelta(days=1)
+    return plan, skipped
+
+# ── 여러 종목 동시 수집 ──────────────────────────────────────────
+def _download(source, limiter: RateLimiter, symbol: str, period: str, start) -> pd.DataFrame:
+    limiter.acquire()
+    df = source.fetch(symbol, period, start=start)
+    if start is not None and not df.empty:
+        # 소스가 start 이전 행(시간대 경계 등)을 섞어 보내도 새 날짜만 남긴다
+        df = df[pd.to_datetime(df["date"]).dt.date >= start]
+    return df
+
+
+def ingest(symbols, source=None, workers: int = 8, rate: float = 2.0, period="10y",
+           writer=save_to_db, full: bool = False) -> dict:
+    """종목들을 동시에 받아 완료 순서대로 writer 로 저장 → {symbol: writer 반환값 | 오류 문자열}
+
+    기본은 증분 수집: 마지막 저장일 다음 날부터만 요청하고 이미 최신인 종목은 0 으로 건너뛴다.
+    진행 중인 다운로드는 workers * 2 개로 제한해 받은 DataFrame 이 메모리에 쌓이지 않게 한다.
+    DB 쓰기는 호출한(메인) 스레드에서만 한다.
+    """
+    source = source or YFinanceSource()
+    limiter = RateLimiter(rate)
+    plan, skipped = plan_fetch(symbols, full)
+    result = dict.fromkeys(skipped, 0)
+    if skipped:
+        print(f"[INFO] 이미 최신 {len(skipped)} 종목 건너뜀")
+    todo = iter(plan.items())
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+
+        def submit_next():
+            sym, start = next(todo, (None, None))
+            if sym is not None:
+                pending[pool.submit(_download, source, limiter, sym, period, start)] = sym
+
+        for _ in range(workers * 2):
+            submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                sym = pending.pop(fut)
+                submit_next()
+                try:
+                    df = fut.result()
+                    result[sym] = writer(df) if not df.empty else 0
+                except Exception as e:          # 한 종목 실패가 전체 수집을 멈추지 않게
+                    result[sym] = f"error: {e!r}"
+                print(f"[{len(result)}] {sym:<10} {result[sym]}")
+    return result
 
 # ── 메인 실행부 ─────────────────────────────────────────────────
 if __name__ == "__main__":
-    symbol = "QQQ"
-    df = fetch_data(symbol)
-    print("[원본 5행]")
-    print(df.head())
-    save_to_db(df)
-    print("[데이터 저장 완료]")
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="*", default=[])
+    p.add_argument("--universe", help="symbol list file (one per line)")
+    p.add_argument("--source", choices=["yfinance", "csv"], default="yfinance")
+    p.add_argument("--csv-dir", default="data/prices", help="CSVSource directory")
+    p.add_argument("--workers", type=int, default=8)
+    p.add_argument("--rate", type=float, default=2.0, help="requests/sec per source (0 = unlimited)")
+    p.add_argument("--period", default="10y", help="history length for symbols not yet stored / --full")
+    p.add_argument("--full", action="store_true", help="ignore stored dates and fetch the whole period")
+    p.add_argument("--loader", choices=["bulk", "upsert", "orm"], default="bulk",
+                   help="bulk: COPY/staging merge, upsert: also update revised bars")
+    p.add_argument("--sync-compact", action="store_true", help="copy new rows into DailyBar afterwards")
+    args = p.parse_args()
+
+    symbols = args.symbols + (read_universe(args.universe) if args.universe else [])
+    symbols = symbols or ["QQQ"]
+    source = CSVSource(args.csv_dir) if args.source == "csv" else YFinanceSource()
+
+    if args.loader == "bulk":
+        from bulk_loader import bulk_load
+        writer = bulk_load
+    elif args.loader == "upsert":
+        from bulk_loader import upsert
+        writer = upsert
+    else:
+        writer = save_to_db
+
+    result = ingest(symbols, source, args.workers, args.rate, args.period, writer=writer, full=args.full)
+    failed = [s for s, r in result.items() if isinstance(r, str)]
+    print(f"[데이터 저장 완료] {len(result) - len(failed)}/{len(result)} 종목")
+    if args.loader == "upsert":
+        stats = [r for r in result.values() if isinstance(r, dict)]
+        print({k: sum(r[k] for r in stats) for k in ("inserted", "updated", "unchanged")})
+    if args.sync_compact:
+        from core import price_store
+        n = price_store.sync(symbols, full=args.loader == "upsert")
+        print(f"[DailyBar 동기화] {n} rows")
+    if failed:
+        print("실패:", ", ".join(failed))
@@ -0,0 +1,88 @@
+"""
+intraday_rollup.py
+----------------------
+IntradayBar(1분봉) → DailyPrice 일봉 다운샘플링.
+
+종목·날짜(KST)별로 첫 open / 최대 high / 최소 low / 마지막 close / volume 합을 구해
+bulk_loader.load 로 적재한다 (staging + ON CONFLICT, 기본 upsert — 장중에 돌린 당일
+봉은 다음 실행에서 값이 바뀐 행만 갱신). 기본은 정규장(09:00~15:30 봉)만 집계하고
+--session all 이면 시간외 분봉까지 포함한다.
+
+    python intraday_rollup.py --symbols 005930 --start 2025-05-01
+    python intraday_rollup.py --mode ignore          # 이미 있는 일봉은 건드리지 않음
+"""
+import argparse
+import os, sys, django, pandas as pd
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+# ── Django 환경 설정 ───────────────────────────────────────────────
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+django.setup()
+
+from bulk_loader import MODES, load
+from core.models import IntradayBar
+
+KST = ZoneInfo("Asia/Seoul")
+SESSION = (time(9, 0), time(15, 30))         # 정규장 봉 시작 시각 범위 (15:30 = 종가 단일가)
+VALUES = ["open", "high", "low", "close", "volume"]
+
+
+def load_minutes(symbols=None, start: date | None = None, end: date | None = None) -> pd.DataFrame:
+    """1분봉 → (symbol, ts[KST], OHLCV) DataFrame, 종목·시각 순"""
+    qs = IntradayBar.objects.filter(interval=1)
+    if symbols:
+        qs = qs.filter(symbol__in=list(symbols))
+    if start is not None:
+        qs = qs.filter(ts__gte=datetime.combine(start, time.min, tzinfo=KST))
+    if end is not None:
+        qs = qs.filter(ts__lt=datetime.combine(end + timedelta(days=1), time.min, tzinfo=KST))
+    df = pd.DataFrame.from_records(
+        qs.order_by("symbol", "ts").values_list("symbol", "ts", *VALUES),
+        columns=["symbol", "ts", *VALUES],
+    )
+    df["ts"] = pd.to_datetime(df["ts"], utc=True).dt.tz_convert(KST)
+    return df
+
+
+def to_daily(df: pd.DataFrame, session=SESSION) -> pd.DataFrame:
+    """1분봉 → 일봉 (symbol, date, open, high, low, close, volume)"""
+    if session is not None and not df.empty:
+        t = df["ts"].dt.time
+        df = df[(t >= session[0]) & (t <= session[1])]
+    if df.empty:
+        return pd.DataFrame(columns=["symbol", "date", *VALUES])
+    daily = (
+        df.assign(date=df["ts"].dt.date)
+        .groupby(["symbol", "date"], sort=True)
+        .agg(open=("open", "first"), high=("high", "max"), low=("low", "min"),
+             close=("close", "last"), volume=("volume", "sum"))
+        .reset_index()
+    )
+    return daily
+
+
+def rollup_daily(symbols=None, start=None, end=None, session=SESSION,
+                 mode: str = "upsert", batch_size: int = 100_000) -> dict:
+    """IntradayBar → DailyPrice → {"days", "inserted", "updated", "unchanged"}"""
+    daily = to_daily(load_minutes(symbols, start, end), session)
+    stats = load(daily, batch_size, mode=mode) if not daily.empty else {
+        "inserted": 0, "updated": 0, "unchanged": 0}
+    return {"days": len(daily), **stats}
+
+# ── 메인 실행부 ─────────────────────────────────────────────────
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--symbols", nargs="*", default=[])
+    p.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD (KST)")
+    p.add_argument("--end", type=date.fromisoformat, help="YYYY-MM-DD (KST, inclusive)")
+    p.add_argument("--session", choices=["regular", "all"], default="regular")
+    p.add_argument("--mode", choices=MODES, default="upsert")
+    args = p.parse_args()
+
+    stats = rollup_daily(args.symbols, args.start, args.end,
+                         SESSION if args.session == "regular" else None, args.mode)
+    print(f"[일봉 집계 완료] {stats}")